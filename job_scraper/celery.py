@@ -26,6 +26,14 @@ app.conf.beat_schedule = {
         'task': 'scraper.tasks.cleanup_old_jobs',
         'schedule': crontab(day_of_week=0, hour=1, minute=0),  # Sunday at 1 AM
     },
+    'send-job-notifications': {
+        'task': 'scraper.tasks.send_job_notifications',
+        'schedule': crontab(minute='*/5'),  # Catch up on any events that were not queued
+    },
+    'refresh-statistics-daily': {
+        'task': 'scraper.tasks.refresh_statistics',
+        'schedule': crontab(hour=2, minute=0),  # Run daily at 2 AM
+    },
 }
 
 @app.task(bind=True)
@@ -31,6 +31,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     
     # Third party apps
     'rest_framework',
@@ -129,4 +130,59 @@ REST_FRAMEWORK = {
         'rest_framework.renderers.JSONRenderer',
         'rest_framework.renderers.BrowsableAPIRenderer',
     ],
-}
\ No newline at end of file
+}
+
+# Scraper Configuration
+SCRAPER_ASYNC_FETCH = config('SCRAPER_ASYNC_FETCH', default=True, cast=bool)
+SCRAPER_MAX_CONCURRENCY = config('SCRAPER_MAX_CONCURRENCY', default=16, cast=int)
+SCRAPER_PER_HOST_CONCURRENCY = config('SCRAPER_PER_HOST_CONCURRENCY', default=4, cast=int)
+
+# Politeness: requests per second and burst size per domain (matched by suffix)
+SCRAPER_DEFAULT_RATE = config('SCRAPER_DEFAULT_RATE', default=1.0, cast=float)
+SCRAPER_DEFAULT_BURST = config('SCRAPER_DEFAULT_BURST', default=5, cast=int)
+SCRAPER_DEFAULT_BACKOFF = config('SCRAPER_DEFAULT_BACKOFF', default=30, cast=int)
+SCRAPER_MAX_BACKOFF = config('SCRAPER_MAX_BACKOFF', default=300, cast=int)
+SCRAPER_RATE_LIMITS = {
+    'data.usajobs.gov': {'rate': 0.5, 'burst': 2},
+}
+
+# Shared HTTP client: per-host keep-alive pools, retries and timeouts (seconds) per source
+SCRAPER_HTTP_TIMEOUT = config('SCRAPER_HTTP_TIMEOUT', default=15, cast=int)
+SCRAPER_HTTP_MAX_RETRIES = config('SCRAPER_HTTP_MAX_RETRIES', default=3, cast=int)
+SCRAPER_HTTP_BACKOFF_BASE = config('SCRAPER_HTTP_BACKOFF_BASE', default=0.5, cast=float)
+SCRAPER_HTTP_POOL_SIZE = config('SCRAPER_HTTP_POOL_SIZE', default=10, cast=int)
+SCRAPER_HTTP_TIMEOUTS = {
+    'data.usajobs.gov': 30,
+}
+
+# On-disk conditional-GET cache for listing and detail pages
+SCRAPER_HTTP_CACHE_ENABLED = config('SCRAPER_HTTP_CACHE_ENABLED', default=True, cast=bool)
+SCRAPER_HTTP_CACHE_DIR = config('SCRAPER_HTTP_CACHE_DIR', default=str(BASE_DIR / '.http_cache'))
+SCRAPER_HTTP_CACHE_MAX_MB = config('SCRAPER_HTTP_CACHE_MAX_MB', default=200, cast=int)
+
+# HTML parser backend: 'lxml', 'soup' (BeautifulSoup html.parser) or 'auto'
+SCRAPER_HTML_PARSER = config('SCRAPER_HTML_PARSER', default='auto')
+
+# Jobs per bulk INSERT ... ON CONFLICT / bulk UPDATE batch
+SCRAPER_INGEST_BATCH_SIZE = config('SCRAPER_INGEST_BATCH_SIZE', default=500, cast=int)
+
+# Outbox events claimed per notification batch (one SMTP connection per batch)
+SCRAPER_NOTIFICATION_BATCH_SIZE = config('SCRAPER_NOTIFICATION_BATCH_SIZE', default=500, cast=int)
+# Seconds before a claimed but unfinished event (crashed worker) can be claimed again
+SCRAPER_NOTIFICATION_CLAIM_SECONDS = config('SCRAPER_NOTIFICATION_CLAIM_SECONDS', default=600, cast=int)
+# Failed runs before an event is given up on, so one bad address cannot keep re-sending
+SCRAPER_NOTIFICATION_MAX_ATTEMPTS = config('SCRAPER_NOTIFICATION_MAX_ATTEMPTS', default=5, cast=int)
+
+# Local search over in-memory NumPy arrays of every job location (False: SQL haversine on one point per job)
+SCRAPER_DISTANCE_ENGINE = config('SCRAPER_DISTANCE_ENGINE', default=True, cast=bool)
+SCRAPER_DISTANCE_REFRESH_SECONDS = config('SCRAPER_DISTANCE_REFRESH_SECONDS', default=60, cast=int)
+
+# Paginated job lists count exactly up to this many rows, then report the planner's estimate
+SCRAPER_EXACT_COUNT_LIMIT = config('SCRAPER_EXACT_COUNT_LIMIT', default=10000, cast=int)
+
+# USAJobs incremental sync: only postings since each keyword's watermark, plus a periodic full ID check
+SCRAPER_USAJOBS_INCREMENTAL = config('SCRAPER_USAJOBS_INCREMENTAL', default=True, cast=bool)
+SCRAPER_USAJOBS_RECONCILE_HOURS = config('SCRAPER_USAJOBS_RECONCILE_HOURS', default=24, cast=int)
+
+# Worker processes for skill/sector/job-type extraction (0 or 1: extract inline on the scraping thread)
+SCRAPER_EXTRACTION_WORKERS = config('SCRAPER_EXTRACTION_WORKERS', default=min(4, os.cpu_count() or 1), cast=int)
@@ -0,0 +1,47 @@
+import asyncio
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+
+class AsyncFetcher:
+    """Run blocking fetch calls concurrently with a global and per-host limit"""
+
+    def __init__(self, fetch, max_concurrency=16, per_host_concurrency=4):
+        self.fetch = fetch
+        self.max_concurrency = max(1, max_concurrency)
+        self.per_host_concurrency = max(1, per_host_concurrency)
+
+    async def _fetch_one(self, loop, executor, url, global_limit, host_limits):
+        host = urlparse(url).netloc
+
+        # Take the host slot first so a busy host never holds global slots idle
+        async with host_limits[host]:
+            async with global_limit:
+                try:
+                    result = await loop.run_in_executor(executor, self.fetch, url)
+                except Exception as e:
+                    print(f"  Fetch failed for {url}: {e}")
+                    result = None
+
+        return url, result
+
+    async def _fetch_all(self, urls):
+        loop = asyncio.get_running_loop()
+        global_limit = asyncio.Semaphore(self.max_concurrency)
+        host_limits = defaultdict(lambda: asyncio.Semaphore(self.per_host_concurrency))
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            results = await asyncio.gather(*[
+                self._fetch_one(loop, executor, url, global_limit, host_limits)
+                for url in urls
+            ])
+
+        return dict(results)
+
+    def fetch_all(self, urls):
+        """Fetch every unique URL and return a {url: result} dict."""
+        unique_urls = list(dict.fromkeys(url for url in urls if url))
+        if not unique_urls:
+            return {}
+        return asyncio.run(self._fetch_all(unique_urls))
@@ -0,0 +1,202 @@
+import threading
+import time
+import numpy as np
+from django.conf import settings
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+from .geo import EARTH_RADIUS_MILES
+
+
+def nearest_distances(origin_lats, origin_lons, point_lats, point_lons):
+    """For each origin, the distance in miles to the nearest of the given points."""
+    origin_lats = np.radians(np.asarray(origin_lats, dtype=np.float64))[:, None]
+    origin_lons = np.radians(np.asarray(origin_lons, dtype=np.float64))[:, None]
+    point_lats = np.radians(np.asarray(point_lats, dtype=np.float64))[None, :]
+    point_lons = np.radians(np.asarray(point_lons, dtype=np.float64))[None, :]
+
+    a = (
+        np.sin((point_lats - origin_lats) / 2) ** 2
+        + np.cos(origin_lats) * np.cos(point_lats) * np.sin((point_lons - origin_lons) / 2) ** 2
+    )
+    return (2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.minimum(a, 1.0)))).min(axis=1)
+
+
+def job_points(job):
+    """Every [lat, lon] of a job, falling back to its representative point."""
+    points = getattr(job, 'location_points', None) or []
+    if not points and job.latitude is not None and job.longitude is not None:
+        points = [[job.latitude, job.longitude]]
+    return points
+
+
+class DistanceEngine:
+    """Every open job's location points in contiguous arrays, grouped by job"""
+
+    def __init__(self):
+        self.job_ids = np.empty(0, dtype=np.int64)
+        self.lats = np.empty(0, dtype=np.float64)
+        self.lons = np.empty(0, dtype=np.float64)
+        self.group_starts = np.empty(0, dtype=np.int64)
+        self.group_ids = np.empty(0, dtype=np.int64)
+        self.lat_radians = self.lon_radians = self.cos_lats = np.empty(0, dtype=np.float64)
+        self.synced_at = None
+        self.checked_at = 0.0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.lats)
+
+    def load(self, job_ids, lats, lons):
+        """Replace every point; the arrays are sorted so each job's points are contiguous."""
+        job_ids = np.asarray(job_ids, dtype=np.int64)
+        order = np.argsort(job_ids, kind='stable')
+
+        with self.lock:
+            self.job_ids = job_ids[order]
+            self.lats = np.asarray(lats, dtype=np.float64)[order]
+            self.lons = np.asarray(lons, dtype=np.float64)[order]
+            self._index_groups()
+
+    def replace_jobs(self, changed_ids, job_ids, lats, lons):
+        """Drop the points of `changed_ids` and merge in new points for them."""
+        with self.lock:
+            keep = ~np.isin(self.job_ids, np.asarray(list(changed_ids), dtype=np.int64))
+            merged_ids = np.concatenate([self.job_ids[keep], np.asarray(job_ids, dtype=np.int64)])
+            order = np.argsort(merged_ids, kind='stable')
+            self.job_ids = merged_ids[order]
+            self.lats = np.concatenate([self.lats[keep], np.asarray(lats, dtype=np.float64)])[order]
+            self.lons = np.concatenate([self.lons[keep], np.asarray(lons, dtype=np.float64)])[order]
+            self._index_groups()
+
+    def _index_groups(self):
+        # Radians and cosines depend only on the points, so queries reuse them
+        self.lat_radians = np.radians(self.lats)
+        self.lon_radians = np.radians(self.lons)
+        self.cos_lats = np.cos(self.lat_radians)
+
+        if len(self.job_ids):
+            self.group_starts = np.flatnonzero(np.r_[True, self.job_ids[1:] != self.job_ids[:-1]])
+        else:
+            self.group_starts = np.empty(0, dtype=np.int64)
+        self.group_ids = self.job_ids[self.group_starts]
+
+    def nearest(self, lat, lon, max_miles=None):
+        """Return (job_ids, distances) to each job's nearest location, nearest first."""
+        with self.lock:
+            if not len(self.lats):
+                return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+            lat, lon = np.radians(lat), np.radians(lon)
+            a = (
+                np.sin((self.lat_radians - lat) / 2) ** 2
+                + np.cos(lat) * self.cos_lats * np.sin((self.lon_radians - lon) / 2) ** 2
+            )
+            distances = 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+            per_job = np.minimum.reduceat(distances, self.group_starts)
+            job_ids = self.group_ids
+
+        if max_miles is not None:
+            within = per_job <= max_miles
+            job_ids, per_job = job_ids[within], per_job[within]
+
+        order = np.argsort(per_job, kind='stable')
+        return job_ids[order], per_job[order]
+
+    def refresh(self):
+        """Load points for jobs saved since the last refresh."""
+        from .models import JobListing
+
+        started = timezone.now()
+        jobs = JobListing.objects.filter(closed=False)
+        if self.synced_at is not None:
+            # Closed jobs are dropped too, so look at every changed row
+            jobs = JobListing.objects.filter(date_updated__gte=self.synced_at)
+
+        ids, lats, lons, changed = [], [], [], []
+        for job_id, closed, latitude, longitude, points in jobs.values_list(
+            'id', 'closed', 'latitude', 'longitude', 'location_points'
+        ).iterator():
+            changed.append(job_id)
+            if closed:
+                continue
+            if not points and latitude is not None and longitude is not None:
+                points = [[latitude, longitude]]
+            for point_lat, point_lon in points:
+                ids.append(job_id)
+                lats.append(point_lat)
+                lons.append(point_lon)
+
+        if self.synced_at is None:
+            self.load(ids, lats, lons)
+        elif changed:
+            self.replace_jobs(changed, ids, lats, lons)
+
+        self.synced_at = started
+        self.checked_at = time.monotonic()
+        return self
+
+    def refresh_if_stale(self, max_age=None):
+        """Refresh at most once every `max_age` seconds."""
+        if max_age is None:
+            max_age = getattr(settings, 'SCRAPER_DISTANCE_REFRESH_SECONDS', 60)
+        if self.synced_at is None or time.monotonic() - self.checked_at >= max_age:
+            self.refresh()
+        return self
+
+
+class NearestJobs:
+    """Jobs ordered by distance to their nearest location, fetched one page at a time"""
+
+    def __init__(self, queryset, job_ids, distances):
+        # One array parameter instead of an IN list with thousands of placeholders
+        self.queryset = queryset.filter(id__in=RawSQL('SELECT unnest(%s::bigint[])', (job_ids.tolist(),)))
+
+        # Drop ids the queryset excludes (closed, filtered out or deleted since the last refresh)
+        live = set(self.queryset.values_list('id', flat=True))
+        self.ids = [job_id for job_id in job_ids.tolist() if job_id in live]
+        self.distances = dict(zip(job_ids.tolist(), distances.tolist()))
+
+    def count(self):
+        return len(self.ids)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        ids = self.ids[index] if isinstance(index, slice) else [self.ids[index]]
+        rows = self.queryset.in_bulk(ids)
+
+        jobs = []
+        for job_id in ids:
+            job = rows.get(job_id)
+            if job is not None:
+                job.distance = round(self.distances[job_id], 1)
+                jobs.append(job)
+        return jobs if isinstance(index, slice) else jobs[0]
+
+
+def filter_nearest(queryset, lat, lon, max_miles):
+    """Jobs from `queryset` with any location within `max_miles`, nearest first."""
+    job_ids, distances = get_distance_engine().nearest(lat, lon, max_miles)
+    return NearestJobs(queryset, job_ids, distances)
+
+
+_distance_engine = None
+_distance_engine_lock = threading.Lock()
+
+
+def get_distance_engine():
+    """Return the process-wide distance engine, loading it on first use."""
+    global _distance_engine
+
+    with _distance_engine_lock:
+        if _distance_engine is None:
+            _distance_engine = DistanceEngine()
+    return _distance_engine.refresh_if_stale()
+
+
+def refresh_distance_engine():
+    """Pick up a scrape's changes right away if this process serves distance queries."""
+    engine = _distance_engine
+    if engine is not None and engine.synced_at is not None:
+        engine.refresh()
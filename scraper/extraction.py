@@ -0,0 +1,106 @@
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from django.conf import settings
+
+
+# Columns a re-extraction rewrites from the stored description
+REEXTRACT_FIELDS = ['technical_skills', 'soft_skills', 'sectors']
+
+
+def init_worker():
+    """Set Django up in pool workers, which start from a fresh interpreter."""
+    import django
+    django.setup()
+
+
+_extraction_pool = None
+_extraction_pool_disabled = False
+_extraction_pool_lock = threading.Lock()
+
+
+def get_extraction_pool():
+    """Return the process-wide extraction pool, or None when extraction runs inline."""
+    global _extraction_pool
+
+    workers = getattr(settings, 'SCRAPER_EXTRACTION_WORKERS', 4)
+    if workers <= 1:
+        return None
+
+    with _extraction_pool_lock:
+        if _extraction_pool is None and not _extraction_pool_disabled:
+            # Callers run fetch threads, and forking a threaded process can deadlock the child on a held lock
+            start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _extraction_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context(start_method),
+                initializer=init_worker,
+            )
+        return _extraction_pool
+
+
+def disable_extraction_pool(error):
+    """Fall back to inline extraction for the rest of this process."""
+    global _extraction_pool, _extraction_pool_disabled
+
+    print(f"  Extraction pool unavailable ({error}), extracting inline")
+    with _extraction_pool_lock:
+        pool, _extraction_pool = _extraction_pool, None
+        _extraction_pool_disabled = True
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def extract_batches(extract, batches, max_pending=None):
+    """Run extract(tasks) for each (batch, tasks) pair and yield (batch, results) in order.
+    
+    `extract` must be a module-level function so it can be sent to the pool. Up to `max_pending`
+    batches are extracted in worker processes while the caller produces the next ones; each is
+    yielded as soon as it and every batch before it are done.
+    """
+    pool = get_extraction_pool()
+    if max_pending is None:
+        max_pending = 2 * getattr(settings, 'SCRAPER_EXTRACTION_WORKERS', 4)
+    pending = deque()
+
+    def finish(batch, tasks, future):
+        if future is not None:
+            try:
+                return batch, future.result()
+            except Exception as e:
+                # A broken pool, or a daemonic process (Celery prefork) that may not start children
+                disable_extraction_pool(e)
+        return batch, extract(tasks)
+
+    for batch, tasks in batches:
+        future = None
+        if pool is not None and not _extraction_pool_disabled:
+            try:
+                future = pool.submit(extract, tasks)
+            except Exception as e:
+                disable_extraction_pool(e)
+                pool = None
+        pending.append((batch, tasks, future))
+
+        # Hand back every finished batch at once; only wait on a worker when the pipeline is full
+        while pending and (len(pending) >= max_pending or pending[0][2] is None or pending[0][2].done()):
+            yield finish(*pending.popleft())
+
+    while pending:
+        yield finish(*pending.popleft())
+
+
+def reextract_jobs(tasks):
+    """Skills and sectors for stored (source_domain, title, organization, description) rows; runs in extraction workers."""
+    from .scraper_engine import extract_listings
+    from .usajobs_scraper import USAJOBS_SOURCE, extract_postings
+
+    results = []
+    for source_domain, title, organization, description in tasks:
+        if source_domain == USAJOBS_SOURCE:
+            extracted = extract_postings([(title, organization, description)])[0]
+        else:
+            extracted = extract_listings([(title, description)])[0]
+        results.append({field: extracted[field] for field in REEXTRACT_FIELDS} if extracted else None)
+    return results
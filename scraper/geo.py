@@ -0,0 +1,75 @@
+import math
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import ASin, Cos, Least, Power, Radians, Sin, Sqrt
+from .zip_centroids import get_zip_centroids
+
+
+EARTH_RADIUS_MILES = 3958.7613
+
+
+def postal_code_coords(zip_codes):
+    """Look up many ZIP codes at once; returns {zip_code: (lat, lon)} for the ones found."""
+    table = get_zip_centroids()
+
+    coords = {}
+    for zip_code in set(zip_codes):
+        point = table.lookup(zip_code)
+        if point is not None:
+            coords[zip_code] = point
+    return coords
+
+
+def haversine_miles(lat1, lon1, lat2, lon2):
+    """Great-circle distance in miles between two points."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(a))
+
+
+def bounding_box(lat, lon, miles):
+    """Return (min_lat, max_lat, min_lon, max_lon) enclosing every point within `miles` of a point."""
+    angle = miles / EARTH_RADIUS_MILES
+    dlat = math.degrees(angle)
+    min_lat, max_lat = lat - dlat, lat + dlat
+
+    # Near a pole or across the antimeridian the box spans every longitude
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90.0), min(max_lat, 90.0), -180.0, 180.0
+
+    dlon = math.degrees(math.asin(min(1.0, math.sin(angle) / math.cos(math.radians(lat)))))
+    min_lon, max_lon = lon - dlon, lon + dlon
+    if min_lon < -180 or max_lon > 180:
+        return min_lat, max_lat, -180.0, 180.0
+
+    return min_lat, max_lat, min_lon, max_lon
+
+
+def haversine_expression(lat, lon, lat_field='latitude', lon_field='longitude'):
+    """Database expression for the great-circle distance in miles from a point to each row."""
+    lat_rad = Radians(F(lat_field))
+    lon_rad = Radians(F(lon_field))
+    origin_lat = math.radians(lat)
+    origin_lon = math.radians(lon)
+
+    a = (
+        Power(Sin((lat_rad - Value(origin_lat)) / 2), 2)
+        + Value(math.cos(origin_lat)) * Cos(lat_rad) * Power(Sin((lon_rad - Value(origin_lon)) / 2), 2)
+    )
+    # Rounding can push `a` a hair above 1 for antipodal points
+    return Value(2 * EARTH_RADIUS_MILES) * ASin(Sqrt(Least(a, Value(1.0))), output_field=FloatField())
+
+
+def filter_within_radius(queryset, lat, lon, miles):
+    """Narrow a queryset to rows within `miles`, annotated with `distance` and nearest first."""
+    min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, miles)
+
+    return (
+        queryset
+        .filter(latitude__range=(min_lat, max_lat), longitude__range=(min_lon, max_lon))
+        .annotate(distance=haversine_expression(lat, lon))
+        .filter(distance__lte=miles)
+        .order_by('distance')
+    )
@@ -0,0 +1,234 @@
+import re
+import threading
+from django.db import DatabaseError
+from .geo import haversine_miles
+from .zip_centroids import get_zip_centroids, pgeocode_data_path, read_geonames
+
+
+STATE_CODES = {
+    'alabama': 'AL', 'alaska': 'AK', 'arizona': 'AZ', 'arkansas': 'AR', 'california': 'CA',
+    'colorado': 'CO', 'connecticut': 'CT', 'delaware': 'DE', 'district of columbia': 'DC',
+    'florida': 'FL', 'georgia': 'GA', 'hawaii': 'HI', 'idaho': 'ID', 'illinois': 'IL',
+    'indiana': 'IN', 'iowa': 'IA', 'kansas': 'KS', 'kentucky': 'KY', 'louisiana': 'LA',
+    'maine': 'ME', 'maryland': 'MD', 'massachusetts': 'MA', 'michigan': 'MI', 'minnesota': 'MN',
+    'mississippi': 'MS', 'missouri': 'MO', 'montana': 'MT', 'nebraska': 'NE', 'nevada': 'NV',
+    'new hampshire': 'NH', 'new jersey': 'NJ', 'new mexico': 'NM', 'new york': 'NY',
+    'north carolina': 'NC', 'north dakota': 'ND', 'ohio': 'OH', 'oklahoma': 'OK', 'oregon': 'OR',
+    'pennsylvania': 'PA', 'rhode island': 'RI', 'south carolina': 'SC', 'south dakota': 'SD',
+    'tennessee': 'TN', 'texas': 'TX', 'utah': 'UT', 'vermont': 'VT', 'virginia': 'VA',
+    'washington': 'WA', 'west virginia': 'WV', 'wisconsin': 'WI', 'wyoming': 'WY',
+    'puerto rico': 'PR', 'guam': 'GU', 'virgin islands': 'VI', 'american samoa': 'AS',
+    'northern mariana islands': 'MP',
+}
+STATE_ABBREVIATIONS = set(STATE_CODES.values())
+
+ZIP_RE = re.compile(r'\b(\d{5})(?:-\d{4})?\b')
+
+# GeoNames spells these prefixes out
+CITY_PREFIXES = [
+    (re.compile(r'^st\.?\s+'), 'saint '),
+    (re.compile(r'^ft\.?\s+'), 'fort '),
+    (re.compile(r'^mt\.?\s+'), 'mount '),
+]
+
+
+def normalize_state(value):
+    """Return the two-letter code for a state name or abbreviation, or None."""
+    value = ' '.join(str(value or '').replace('.', '').split())
+    if value.upper() in STATE_ABBREVIATIONS:
+        return value.upper()
+    return STATE_CODES.get(value.lower())
+
+
+def location_states(locations):
+    """Two-letter state codes of "City, ST" / "City, State 12345" style locations."""
+    states = set()
+    for location in locations:
+        if ',' in location:
+            state = normalize_state(ZIP_RE.sub('', location.rsplit(',', 1)[1]))
+            if state:
+                states.add(state)
+    return states
+
+
+def city_key(city):
+    city = ' '.join(city.lower().split())
+    for pattern, replacement in CITY_PREFIXES:
+        city = pattern.sub(replacement, city)
+    return city
+
+
+def location_key(location):
+    """Normalize a location string to a geocode cache key ('zip:20001' or 'washington|DC'), or None."""
+    match = ZIP_RE.search(location)
+    if match:
+        return f"zip:{match.group(1)}"
+
+    if ',' not in location:
+        return None
+
+    city, state = location.rsplit(',', 1)
+    state = normalize_state(state)
+    city = city_key(city)
+    if not city or not state:
+        return None
+    return f"{city}|{state}"
+
+
+class Gazetteer:
+    """Offline (city, state) -> centroid lookup, averaged from ZIP code centroids"""
+
+    def __init__(self, points=None):
+        self.points = points or {}
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build from (city, state, latitude, longitude) rows."""
+        sums = {}
+        for city, state, latitude, longitude in rows:
+            state = normalize_state(state)
+            if not city or not state:
+                continue
+            total = sums.setdefault(f"{city_key(city)}|{state}", [0.0, 0.0, 0])
+            total[0] += latitude
+            total[1] += longitude
+            total[2] += 1
+
+        return cls({key: (lat / n, lon / n) for key, (lat, lon, n) in sums.items()})
+
+    @classmethod
+    def from_database(cls):
+        from .models import ZipCentroid
+        return cls.from_rows(ZipCentroid.objects.values_list('city', 'state', 'latitude', 'longitude').iterator())
+
+    @classmethod
+    def from_geonames(cls, path):
+        return cls.from_rows(
+            (row['city'], row['state'], row['latitude'], row['longitude']) for row in read_geonames(path)
+        )
+
+    def lookup(self, key):
+        """Return (lat, lon) for a location key, or None."""
+        if key.startswith('zip:'):
+            return get_zip_centroids().lookup(key[4:])
+        return self.points.get(key)
+
+
+def load_gazetteer():
+    """Build the gazetteer from the ZipCentroid table if filled, otherwise pgeocode's dataset."""
+    try:
+        gazetteer = Gazetteer.from_database()
+    except DatabaseError as e:
+        print(f"Could not read ZIP centroids from the database: {e}")
+        gazetteer = Gazetteer()
+
+    if not gazetteer.points:
+        gazetteer = Gazetteer.from_geonames(pgeocode_data_path())
+    return gazetteer
+
+
+_gazetteer = None
+_gazetteer_lock = threading.Lock()
+
+
+def get_gazetteer():
+    """Return the process-wide gazetteer, loading it on first use."""
+    global _gazetteer
+
+    with _gazetteer_lock:
+        if _gazetteer is None:
+            _gazetteer = load_gazetteer()
+        return _gazetteer
+
+
+def geocode_locations(locations):
+    """Resolve location strings to (lat, lon) through the persistent cache; returns {location: point}."""
+    from .models import GeocodeCache
+
+    keys = {location: location_key(location) for location in set(locations)}
+    needed = {key for key in keys.values() if key}
+    if not needed:
+        return {}
+
+    resolved = {
+        key: (lat, lon) if lat is not None else None
+        for key, lat, lon in GeocodeCache.objects.filter(key__in=needed).values_list('key', 'latitude', 'longitude')
+    }
+
+    misses = needed - set(resolved)
+    if misses:
+        gazetteer = get_gazetteer()
+        new_entries = []
+        for key in misses:
+            point = gazetteer.lookup(key)
+            resolved[key] = point
+            # Misses are cached too, so unknown places are not looked up again
+            new_entries.append(GeocodeCache(
+                key=key,
+                latitude=point[0] if point else None,
+                longitude=point[1] if point else None,
+            ))
+        GeocodeCache.objects.bulk_create(new_entries, ignore_conflicts=True)
+
+    return {location: resolved[key] for location, key in keys.items() if key and resolved[key]}
+
+
+# A geocoded centroid this close to a stored point is taken to be the same location
+SAME_PLACE_MILES = 10
+
+
+def merge_points(kept, geocoded):
+    """`kept` points plus each geocoded point that is not within SAME_PLACE_MILES of one of them."""
+    merged = [list(point) for point in kept]
+    for point in geocoded:
+        if not any(haversine_miles(point[0], point[1], lat, lon) <= SAME_PLACE_MILES for lat, lon in kept):
+            merged.append(list(point))
+    return merged
+
+
+def known_points(job_data):
+    """A job's location_points padded to one entry per location; None marks a location to geocode."""
+    locations = job_data.get('locations') or []
+    known = list(job_data.get('location_points') or [])
+    return known + [None] * (len(locations) - len(known))
+
+
+def geocode_jobs(jobs):
+    """Fill location_points, latitude/longitude (first point), zip_codes and states on scraped job dicts.
+    
+    Given location_points are kept; a missing or None entry is geocoded from the location at the same index.
+    """
+    points = geocode_locations(
+        location
+        for job_data in jobs
+        for location, point in zip(job_data.get('locations') or [], known_points(job_data))
+        if point is None
+    )
+
+    for job_data in jobs:
+        locations = job_data.get('locations') or []
+
+        job_points = []
+        for index, point in enumerate(known_points(job_data)):
+            if point is None and index < len(locations):
+                point = points.get(locations[index])
+            if point and list(point) not in job_points:
+                job_points.append(list(point))
+        job_data['location_points'] = job_points
+
+        if job_data['location_points']:
+            job_data['latitude'], job_data['longitude'] = job_data['location_points'][0]
+        else:
+            job_data['latitude'] = job_data['longitude'] = None
+
+        if not job_data.get('zip_codes'):
+            zip_codes = []
+            for location in locations:
+                for zip_code in ZIP_RE.findall(location):
+                    if zip_code not in zip_codes:
+                        zip_codes.append(zip_code)
+            job_data['zip_codes'] = zip_codes
+
+        job_data['states'] = sorted(location_states(locations))
+
+    return jobs
@@ -0,0 +1,243 @@
+import hashlib
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import closing
+from pathlib import Path
+import requests
+from django.conf import settings
+
+
+class CachedResponse:
+    """Response body plus whether it changed since the previous fetch"""
+
+    def __init__(self, url, status_code, text, changed=True, not_modified=False, pending=None):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+        self.changed = changed
+        self.not_modified = not_modified
+        self.pending = pending
+
+    def commit(self):
+        """Write a deferred cache entry, once the caller has finished with the page."""
+        if self.pending:
+            self.pending()
+            self.pending = None
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error for url: {self.url}")
+
+
+class HttpCache:
+    """On-disk store of response bodies, validators and digests with LRU eviction"""
+
+    def __init__(self, path, max_bytes):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.path / 'index.sqlite3'
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    digest TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)")
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        return _Transaction(conn)
+
+    def get(self, url):
+        """Return the cached entry for `url` as a dict, or None."""
+        with self.lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT etag, last_modified, digest, body FROM entries WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE entries SET accessed_at = ? WHERE url = ?", (time.time(), url))
+
+        etag, last_modified, digest, body = row
+        return {
+            'etag': etag,
+            'last_modified': last_modified,
+            'digest': digest,
+            'text': zlib.decompress(body).decode('utf-8'),
+        }
+
+    def conditional_headers(self, entry):
+        """Build If-None-Match / If-Modified-Since headers for a cached entry."""
+        headers = {}
+        if entry and entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def is_changed(self, text, previous):
+        """Return True if `text` differs from the previously cached copy."""
+        return previous is None or previous['digest'] != hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def store(self, url, response, previous=None):
+        """Cache a 200 response. Returns True if the body differs from the previous copy."""
+        text = response.text
+        digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        changed = previous is None or previous['digest'] != digest
+
+        body = zlib.compress(text.encode('utf-8'))
+        now = time.time()
+
+        with self.lock, self._connect() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO entries
+                    (url, etag, last_modified, digest, body, size, fetched_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    url,
+                    response.headers.get('ETag'),
+                    response.headers.get('Last-Modified'),
+                    digest,
+                    body,
+                    len(body),
+                    now,
+                    now,
+                ),
+            )
+            self._evict(conn, self.max_bytes)
+
+        return changed
+
+    def _evict(self, conn, max_bytes):
+        """Delete least recently used entries until the cache fits in `max_bytes`."""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= max_bytes:
+            return 0
+
+        removed = 0
+        rows = conn.execute("SELECT url, size FROM entries ORDER BY accessed_at").fetchall()
+        for url, size in rows:
+            if total <= max_bytes:
+                break
+            conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+            total -= size
+            removed += 1
+        return removed
+
+    def prune(self, max_bytes=None, older_than=None):
+        """Evict entries not accessed within `older_than` seconds and shrink to `max_bytes`."""
+        removed = 0
+        with self.lock, self._connect() as conn:
+            if older_than is not None:
+                removed += conn.execute(
+                    "DELETE FROM entries WHERE accessed_at < ?", (time.time() - older_than,)
+                ).rowcount
+            removed += self._evict(conn, self.max_bytes if max_bytes is None else max_bytes)
+
+        with closing(sqlite3.connect(self.db_path)) as conn:
+            conn.execute("VACUUM")
+        return removed
+
+    def clear(self):
+        with self.lock, self._connect() as conn:
+            removed = conn.execute("DELETE FROM entries").rowcount
+
+        with closing(sqlite3.connect(self.db_path)) as conn:
+            conn.execute("VACUUM")
+        return removed
+
+    def stats(self):
+        with self.lock, self._connect() as conn:
+            entries, total, oldest, newest = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), MIN(accessed_at), MAX(accessed_at) FROM entries"
+            ).fetchone()
+
+        return {
+            'entries': entries,
+            'bytes': total,
+            'max_bytes': self.max_bytes,
+            'oldest_access': oldest,
+            'newest_access': newest,
+        }
+
+    def fetch(self, client, url, headers=None, defer=False, **kwargs):
+        """GET `url` through `client`, revalidating any cached copy.
+
+        With `defer`, a new body is only cached when the returned response's commit() is called,
+        so a page whose contents were never processed is not reported unchanged next time.
+        """
+        previous = self.get(url)
+        request_headers = dict(headers or {})
+        request_headers.update(self.conditional_headers(previous))
+
+        response = client.get(url, headers=request_headers, **kwargs)
+
+        if response.status_code == 304 and previous:
+            return CachedResponse(url, 200, previous['text'], changed=False, not_modified=True)
+
+        if response.status_code != 200:
+            return CachedResponse(url, response.status_code, response.text)
+
+        if defer:
+            return CachedResponse(
+                url, 200, response.text, changed=self.is_changed(response.text, previous),
+                pending=lambda: self.store(url, response, previous),
+            )
+
+        changed = self.store(url, response, previous)
+        return CachedResponse(url, 200, response.text, changed=changed)
+
+
+class _Transaction:
+    """Context manager that commits (or rolls back) and always closes the connection"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.conn.commit()
+            else:
+                self.conn.rollback()
+        finally:
+            self.conn.close()
+
+
+_http_cache = None
+_http_cache_lock = threading.Lock()
+
+
+def get_http_cache():
+    """Return the process-wide response cache, or None when caching is disabled."""
+    global _http_cache
+
+    if not getattr(settings, 'SCRAPER_HTTP_CACHE_ENABLED', True):
+        return None
+
+    with _http_cache_lock:
+        if _http_cache is None:
+            _http_cache = HttpCache(
+                settings.SCRAPER_HTTP_CACHE_DIR,
+                max_bytes=getattr(settings, 'SCRAPER_HTTP_CACHE_MAX_MB', 200) * 1024 * 1024,
+            )
+        return _http_cache
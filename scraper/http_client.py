@@ -0,0 +1,181 @@
+import random
+import threading
+import time
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.request import ACCEPT_ENCODING
+from django.conf import settings
+from .rate_limiter import get_rate_limiter
+
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class ConnectionStats:
+    """Thread-safe counters for requests sent and TCP/TLS connections opened"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.connections_opened = 0
+        self.retries = 0
+
+    def record_request(self):
+        with self.lock:
+            self.requests += 1
+
+    def record_connection(self):
+        with self.lock:
+            self.connections_opened += 1
+
+    def record_retry(self):
+        with self.lock:
+            self.retries += 1
+
+    @property
+    def connections_reused(self):
+        return max(0, self.requests - self.connections_opened)
+
+    def as_dict(self):
+        with self.lock:
+            return {
+                'requests': self.requests,
+                'connections_opened': self.connections_opened,
+                'connections_reused': max(0, self.requests - self.connections_opened),
+                'retries': self.retries,
+            }
+
+
+def _counting_pool(base, stats):
+    """Return a connection pool class that records every new connection."""
+    class CountingConnectionPool(base):
+        def _new_conn(self):
+            stats.record_connection()
+            return super()._new_conn()
+
+    return CountingConnectionPool
+
+
+class CountingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools report opened connections to a ConnectionStats"""
+
+    def __init__(self, stats, **kwargs):
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _counting_pool(HTTPConnectionPool, self.stats),
+            'https': _counting_pool(HTTPSConnectionPool, self.stats),
+        }
+
+
+class HttpClient:
+    """Pooled keep-alive HTTP client with rate limiting and jittered retries"""
+
+    def __init__(self, timeouts=None, default_timeout=15, max_retries=3,
+                 backoff_base=0.5, backoff_max=30, pool_maxsize=10, rate_limiter=None):
+        self.timeouts = timeouts or {}
+        self.default_timeout = default_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.pool_maxsize = pool_maxsize
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.stats = ConnectionStats()
+        self.sessions = {}
+        self.lock = threading.Lock()
+
+    def session_for(self, url):
+        """Return the keep-alive session for the host of `url`."""
+        host = urlparse(url).netloc.lower()
+
+        with self.lock:
+            session = self.sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+                adapter = CountingHTTPAdapter(
+                    self.stats,
+                    pool_connections=1,
+                    pool_maxsize=self.pool_maxsize,
+                )
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self.sessions[host] = session
+            return session
+
+    def timeout_for(self, url):
+        """Return the configured timeout for a host, matching domains by suffix."""
+        host = (urlparse(url).hostname or '').lower()
+        for domain, timeout in self.timeouts.items():
+            if host == domain or host.endswith('.' + domain):
+                return timeout
+        return self.default_timeout
+
+    def backoff_delay(self, attempt):
+        """Exponential backoff with full jitter."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def request(self, method, url, timeout=None, **kwargs):
+        """Send a request, retrying connection errors and transient statuses."""
+        session = self.session_for(url)
+        timeout = timeout or self.timeout_for(url)
+
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.wait(url)
+            self.stats.record_request()
+
+            try:
+                response = session.request(method, url, timeout=timeout, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self.backoff_delay(attempt)
+                print(f"  Retrying {url} in {delay:.1f}s after error: {e}")
+                self.stats.record_retry()
+                time.sleep(delay)
+                continue
+
+            # 429/503 pause the whole host; the next wait() sleeps through it
+            paused = self.rate_limiter.backoff(url, response)
+
+            if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                return response
+
+            response.close()
+            self.stats.record_retry()
+            if not paused:
+                time.sleep(self.backoff_delay(attempt))
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def close(self):
+        with self.lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions = {}
+
+
+_http_client = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """Return the process-wide HTTP client configured from settings."""
+    global _http_client
+
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = HttpClient(
+                timeouts=getattr(settings, 'SCRAPER_HTTP_TIMEOUTS', {}),
+                default_timeout=getattr(settings, 'SCRAPER_HTTP_TIMEOUT', 15),
+                max_retries=getattr(settings, 'SCRAPER_HTTP_MAX_RETRIES', 3),
+                backoff_base=getattr(settings, 'SCRAPER_HTTP_BACKOFF_BASE', 0.5),
+                pool_maxsize=getattr(settings, 'SCRAPER_HTTP_POOL_SIZE', 10),
+            )
+        return _http_client
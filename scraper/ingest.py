@@ -0,0 +1,202 @@
+from django.conf import settings
+from django.contrib.postgres.fields import ArrayField
+from django.core.exceptions import ValidationError
+from django.core.validators import URLValidator
+from django.db import connections, models, router, transaction
+from django.utils import timezone
+from .geocoder import geocode_jobs
+from .models import JobListing, JobNotification
+from .notifications import queue_job_notifications
+from .statistics import SNAPSHOT_COLUMNS, mark_snapshots_dirty
+
+
+# Columns refreshed when a scraped job already exists (date_scraped is never touched)
+UPSERT_FIELDS = [
+    'title', 'job_type', 'organization', 'company_link', 'company_logo',
+    'locations', 'work_format', 'technical_skills', 'soft_skills', 'sectors',
+    'source_domain', 'closed', 'sponsorship_required', 'posting_date',
+    'zip_codes', 'states', 'latitude', 'longitude', 'location_points', 'description',
+]
+
+
+JOB_TYPES = {choice for choice, _ in JobListing.JOB_TYPE_CHOICES}
+REQUIRED_FIELDS = ['title', 'organization', 'apply_link']
+URL_FIELDS = [field.name for field in JobListing._meta.fields if isinstance(field, models.URLField)]
+MAX_LENGTHS = {
+    field.name: field.max_length
+    for field in JobListing._meta.fields
+    if isinstance(field, models.CharField) and field.max_length
+}
+ITEM_MAX_LENGTHS = {
+    field.name: field.base_field.max_length
+    for field in JobListing._meta.fields
+    if isinstance(field, ArrayField) and getattr(field.base_field, 'max_length', None)
+}
+
+_validate_url = URLValidator()
+
+
+def validate_job_data(job_data):
+    """Check a scraped job dict against the model's constraints without DRF; returns error messages."""
+    errors = []
+    
+    for field in REQUIRED_FIELDS:
+        if not job_data.get(field):
+            errors.append(f"{field}: required")
+    
+    for field, max_length in MAX_LENGTHS.items():
+        value = job_data.get(field)
+        if isinstance(value, str) and len(value) > max_length:
+            errors.append(f"{field}: longer than {max_length} characters")
+    
+    for field, max_length in ITEM_MAX_LENGTHS.items():
+        for item in job_data.get(field) or []:
+            if not isinstance(item, str) or len(item) > max_length:
+                errors.append(f"{field}: invalid item {item!r}")
+    
+    if job_data.get('job_type', 'job') not in JOB_TYPES:
+        errors.append(f"job_type: invalid choice {job_data['job_type']!r}")
+    
+    for field in URL_FIELDS:
+        if job_data.get(field):
+            try:
+                _validate_url(job_data[field])
+            except ValidationError:
+                errors.append(f"{field}: invalid URL")
+    
+    return errors
+
+
+def chunked(items, size):
+    """Yield lists of at most `size` items."""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def upsert_jobs(jobs, batch_size=None, notify=True):
+    """Insert or update scraped job dicts in batches keyed on apply_link; returns counts and created ids."""
+    batch_size = batch_size or getattr(settings, 'SCRAPER_INGEST_BATCH_SIZE', 500)
+    stats = {'created': 0, 'updated': 0, 'unchanged': 0, 'errors': 0, 'created_ids': []}
+    
+    for chunk in chunked(jobs, batch_size):
+        try:
+            upsert_chunk(chunk, stats, notify=notify)
+        except Exception as e:
+            print(f"  ❌ Error saving batch of {len(chunk)} jobs: {e}")
+            stats['errors'] += len(chunk)
+    
+    if notify and stats['created_ids']:
+        transaction.on_commit(queue_job_notifications)
+    
+    return stats
+
+
+def insert_jobs(jobs, update_fields):
+    """INSERT ... ON CONFLICT (apply_link) DO UPDATE; returns (id, closed, inserted) for every job.
+    
+    xmax is 0 only for rows this statement inserted, so a link another scraper inserted since the
+    SELECT comes back as an update and is not counted or notified twice.
+    """
+    meta = JobListing._meta
+    # search_vector is written by the database trigger
+    fields = [field for field in meta.concrete_fields if not field.primary_key and field.name != 'search_vector']
+    connection = connections[router.db_for_write(JobListing)]
+    quote = connection.ops.quote_name
+    
+    values = []
+    params = []
+    for job in jobs:
+        values.append(f"({', '.join(['%s'] * len(fields))})")
+        params.extend(field.get_db_prep_save(field.pre_save(job, True), connection) for field in fields)
+    
+    updates = ', '.join(
+        f"{quote(column)} = EXCLUDED.{quote(column)}"
+        for column in (meta.get_field(name).column for name in update_fields)
+    )
+    sql = (
+        f"INSERT INTO {quote(meta.db_table)} ({', '.join(quote(field.column) for field in fields)}) "
+        f"VALUES {', '.join(values)} "
+        f"ON CONFLICT ({quote('apply_link')}) DO UPDATE SET {updates} "
+        f"RETURNING {quote('id')}, {quote('closed')}, (xmax = 0)"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def upsert_chunk(chunk, stats, notify=True):
+    """Upsert one batch: one SELECT, one INSERT ... ON CONFLICT and one bulk UPDATE."""
+    # The last copy of a link wins, as it would with one save per job
+    by_link = {}
+    for job_data in chunk:
+        errors = validate_job_data(job_data)
+        if errors:
+            print(f"Validation error: {errors}")
+            stats['errors'] += 1
+            continue
+        by_link[job_data['apply_link']] = dict(job_data)
+    
+    if not by_link:
+        return
+    
+    # Resolve coordinates once per batch, through the persistent geocode cache
+    geocode_jobs(list(by_link.values()))
+    
+    # Only refresh columns every job in the batch provides, so missing keys never reset data
+    fields = [field for field in UPSERT_FIELDS if all(field in job_data for job_data in by_link.values())]
+    
+    existing = {
+        row['apply_link']: row
+        for row in JobListing.objects.filter(apply_link__in=list(by_link)).values(
+            'id', 'apply_link', *dict.fromkeys(fields + list(SNAPSHOT_COLUMNS))
+        )
+    }
+    
+    new_jobs = []
+    changed_jobs = []
+    now = timezone.now()
+    
+    for link, job_data in by_link.items():
+        row = existing.get(link)
+        if row is None:
+            new_jobs.append(JobListing(**job_data))
+        elif any(job_data[field] != row[field] for field in fields):
+            job = JobListing(id=row['id'], **job_data)
+            job.date_updated = now
+            changed_jobs.append(job)
+        else:
+            stats['unchanged'] += 1
+    
+    created = []
+    with transaction.atomic():
+        if new_jobs:
+            # ON CONFLICT (apply_link) DO UPDATE covers rows inserted since the SELECT
+            rows = insert_jobs(new_jobs, fields + ['date_updated'])
+            created = [(job_id, closed) for job_id, closed, inserted in rows if inserted]
+            stats['updated'] += len(rows) - len(created)
+        if changed_jobs:
+            JobListing.objects.bulk_update(changed_jobs, fields + ['date_updated'])
+            # The refresh only sees the new values, so flag the snapshots these jobs may have left
+            mark_snapshots_dirty(
+                [tuple(existing[job.apply_link][column] for column in SNAPSHOT_COLUMNS) for job in changed_jobs]
+            )
+        
+        if created:
+            stats['created_ids'].extend(job_id for job_id, _ in created)
+            
+            # The raw insert skips post_save, so write the outbox events in the same transaction
+            if notify:
+                JobNotification.objects.bulk_create(
+                    [JobNotification(job_id=job_id) for job_id, closed in created if not closed],
+                    ignore_conflicts=True,
+                )
+    
+    stats['created'] += len(created)
+    stats['updated'] += len(changed_jobs)
+
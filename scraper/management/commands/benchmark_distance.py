@@ -0,0 +1,66 @@
+import time
+import numpy as np
+from django.core.management.base import BaseCommand
+from scraper.distance_engine import DistanceEngine
+from scraper.geo import haversine_miles
+
+
+def sample_points(count, points_per_job, seed=42):
+    """Random points over the contiguous US, `points_per_job` per synthetic job id."""
+    rng = np.random.default_rng(seed)
+    job_ids = np.arange(count) // points_per_job
+    lats = rng.uniform(25.0, 49.0, count)
+    lons = rng.uniform(-124.0, -67.0, count)
+    return job_ids, lats, lons
+
+
+def python_nearest(lat, lon, job_ids, lats, lons, max_miles):
+    """Per-point geo.haversine_miles loop, keeping each job's nearest location (the previous approach)."""
+    nearest = {}
+    for job_id, point_lat, point_lon in zip(job_ids, lats, lons):
+        distance = haversine_miles(lat, lon, point_lat, point_lon)
+        if distance < nearest.get(job_id, float('inf')):
+            nearest[job_id] = distance
+    return sorted((d, j) for j, d in nearest.items() if d <= max_miles)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark nearest-location search: NumPy distance engine vs a per-point Python loop'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--points', type=int, nargs='+', default=[100000, 1000000],
+                            help='Location point counts to benchmark')
+        parser.add_argument('--points-per-job', type=int, default=3, help='Locations per synthetic job')
+        parser.add_argument('--queries', type=int, default=20, help='Engine queries per size')
+        parser.add_argument('--radius', type=float, default=50.0, help='Search radius in miles')
+    
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'points':>10}{'jobs':>10}{'build':>11}{'engine':>12}{'python':>12}{'speedup':>10}{'matches':>9}"
+        )
+        
+        for count in options['points']:
+            job_ids, lats, lons = sample_points(count, options['points_per_job'])
+            
+            engine = DistanceEngine()
+            start = time.perf_counter()
+            engine.load(job_ids, lats, lons)
+            build_ms = (time.perf_counter() - start) * 1000
+            
+            origin = (38.9, -77.0)
+            start = time.perf_counter()
+            for _ in range(options['queries']):
+                ids, distances = engine.nearest(*origin, max_miles=options['radius'])
+            engine_ms = (time.perf_counter() - start) * 1000 / options['queries']
+            
+            start = time.perf_counter()
+            expected = python_nearest(*origin, job_ids.tolist(), lats.tolist(), lons.tolist(), options['radius'])
+            python_ms = (time.perf_counter() - start) * 1000
+            
+            if len(expected) != len(ids) or not np.allclose([d for d, _ in expected], distances):
+                self.stderr.write(f"Engine and Python loop disagree at {count} points")
+            
+            self.stdout.write(
+                f"{count:>10}{len(engine.group_ids):>10}{build_ms:>8.1f} ms{engine_ms:>9.1f} ms"
+                f"{python_ms:>9.1f} ms{python_ms / engine_ms:>9.1f}x{len(ids):>9}"
+            )
@@ -0,0 +1,138 @@
+import io
+import re
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+from bs4 import BeautifulSoup
+from django.core.management.base import BaseCommand, CommandError
+from scraper.http_client import get_http_client
+from scraper.scraper_engine import UniversalJobScraper
+
+
+FIXTURES_DIR = Path(__file__).resolve().parents[2] / 'benchmark_fixtures' / 'html'
+BASE_URL = 'https://careers.example.gov/'
+
+
+def legacy_process(scraper, html):
+    """The pre-backend pipeline: html.parser tree plus one find_all pass per pattern."""
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    cards = []
+    for pattern in scraper.job_listing_patterns:
+        cards = soup.find_all(pattern['tag'], class_=re.compile(pattern['class_pattern'], re.I))
+        if cards:
+            break
+    if not cards:
+        job_links = soup.find_all('a', href=re.compile(r'(job|career|position)', re.I))
+        cards = [link for link in job_links if len(link.get_text(strip=True)) > 10]
+    
+    results = []
+    for card in cards[:100]:
+        title_elem = (
+            card.find('a', class_=re.compile(r'job[-_]?title', re.I)) or
+            card.find(['h2', 'h3', 'h4']) or
+            card.find('a')
+        )
+        if title_elem:
+            card.get_text(separator=' ', strip=True)
+            card.find(text=re.compile(r'\d{1,2}/\d{1,2}/\d{2,4}'))
+            results.append(title_elem.get_text(strip=True))
+    
+    if not cards:
+        for tag in ('div', 'section'):
+            desc_elem = soup.find(tag, class_=re.compile(r'(description|details|content)', re.I))
+            if desc_elem:
+                desc_elem.get_text(separator=' ', strip=True)
+                break
+    
+    return results
+
+
+def backend_process(scraper, html):
+    """The current pipeline for whichever backend the scraper was built with."""
+    doc = scraper.parser.parse(html)
+    cards = scraper.find_job_listings(doc, BASE_URL)
+    
+    results = []
+    for card in cards[:100]:
+        card_info = scraper.parse_card(card, BASE_URL)
+        if card_info:
+            results.append(card_info['title'])
+    
+    if not cards:
+        scraper.extract_description(doc)
+    
+    return results
+
+
+class Command(BaseCommand):
+    help = 'Benchmark HTML parser backends over saved listing and detail pages'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fixtures',
+            type=str,
+            default=str(FIXTURES_DIR),
+            help='Directory of saved .html pages'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Runs per fixture and backend (best time is reported)'
+        )
+        parser.add_argument(
+            '--save',
+            nargs=2,
+            metavar=('URL', 'NAME'),
+            help='Download URL into the fixtures directory as NAME.html and exit'
+        )
+    
+    def handle(self, *args, **options):
+        fixtures_dir = Path(options['fixtures'])
+        
+        if options['save']:
+            url, name = options['save']
+            response = get_http_client().get(url, headers={"User-Agent": "Mozilla/5.0"})
+            response.raise_for_status()
+            fixtures_dir.mkdir(parents=True, exist_ok=True)
+            (fixtures_dir / f"{name}.html").write_text(response.text, encoding='utf-8')
+            self.stdout.write(self.style.SUCCESS(f"Saved {url} to {fixtures_dir / name}.html"))
+            return
+        
+        fixtures = sorted(fixtures_dir.glob('*.html'))
+        if not fixtures:
+            raise CommandError(f"No .html fixtures found in {fixtures_dir}")
+        
+        runners = [('legacy', UniversalJobScraper(parser='soup', use_cache=False), legacy_process)]
+        for name in ('soup', 'lxml'):
+            try:
+                runners.append((name, UniversalJobScraper(parser=name, use_cache=False), backend_process))
+            except ImportError as e:
+                self.stdout.write(self.style.WARNING(f"Skipping {name}: {e}"))
+        
+        header = f"{'fixture':<28}" + ''.join(f"{name:>12}" for name, _, _ in runners) + f"{'speedup':>10}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        
+        for path in fixtures:
+            html = path.read_text(encoding='utf-8')
+            timings = []
+            outputs = []
+            
+            for name, scraper, process in runners:
+                best = float('inf')
+                with redirect_stdout(io.StringIO()):
+                    for _ in range(options['repeat']):
+                        start = time.perf_counter()
+                        result = process(scraper, html)
+                        best = min(best, time.perf_counter() - start)
+                timings.append(best)
+                outputs.append(result)
+            
+            row = f"{path.stem:<28}" + ''.join(f"{t * 1000:>10.2f}ms" for t in timings)
+            row += f"{timings[0] / timings[-1]:>9.1f}x"
+            self.stdout.write(row)
+            
+            if any(output != outputs[0] for output in outputs[1:]):
+                self.stdout.write(self.style.WARNING(f"  Backends disagree on {path.name}"))
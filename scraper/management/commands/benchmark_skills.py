@@ -0,0 +1,101 @@
+import random
+import re
+import time
+from django.core.management.base import BaseCommand
+from scraper import scraper_engine, usajobs_scraper
+from scraper.scraper_engine import UniversalJobScraper
+from scraper.usajobs_scraper import USAJobsScraper
+
+
+FILLER = (
+    "The selected candidate will support the office with day to day operations, "
+    "coordinate with partners across the agency, and prepare briefings for leadership. "
+    "Duties include reviewing documents, tracking deliverables and maintaining records. "
+)
+
+
+def legacy_universal(text):
+    """UniversalJobScraper's extraction before the shared matcher: one regex per keyword."""
+    text_lower = text.lower()
+    technical = {}
+    for category, skills in scraper_engine.TECHNICAL_SKILLS.items():
+        found = [skill.title() for skill in skills if re.search(r'\b' + re.escape(skill) + r'\b', text_lower)]
+        if found:
+            technical[category] = found
+    soft = [skill.title() for skill in scraper_engine.SOFT_SKILLS
+            if re.search(r'\b' + re.escape(skill) + r'\b', text_lower)]
+    sectors = [sector for sector, keywords in scraper_engine.SECTORS.items()
+               if any(keyword in text_lower for keyword in keywords)]
+    formats = [fmt for fmt, keywords in scraper_engine.WORK_FORMATS.items()
+               if any(keyword in text_lower for keyword in keywords)]
+    job_type = next((jt for jt, keywords in scraper_engine.JOB_TYPE_KEYWORDS.items()
+                     if any(keyword in text_lower for keyword in keywords)), "job")
+    return technical, soft, sectors, formats, job_type
+
+
+def legacy_usajobs(org_name, text):
+    """USAJobsScraper's extraction before the shared matcher: one substring scan per keyword."""
+    text_lower = text.lower()
+    technical = {}
+    for category, skills in usajobs_scraper.TECHNICAL_SKILLS.items():
+        found = [usajobs_scraper.skill_display_name(category, skill) for skill in skills if skill in text_lower]
+        if found:
+            technical[category] = list(set(found))
+    soft = list(set(skill.title() for skill in usajobs_scraper.SOFT_SKILLS if skill in text_lower))
+    combined = (org_name + " " + text).lower()
+    sectors = [sector for sector, keywords in usajobs_scraper.SECTOR_KEYWORDS.items()
+               if any(keyword in combined for keyword in keywords)]
+    return technical, soft, sectors
+
+
+def sample_documents(count, words, seed=42):
+    """Synthetic descriptions of roughly 3 KB mixing filler with taxonomy keywords."""
+    rng = random.Random(seed)
+    docs = []
+    for _ in range(count):
+        parts = []
+        for _ in range(12):
+            parts.append(FILLER[:rng.randint(80, len(FILLER))])
+            parts.append(' '.join(rng.sample(words, 4)) + '.')
+        docs.append(' '.join(parts))
+    return docs
+
+
+class Command(BaseCommand):
+    help = 'Micro-benchmark skill/sector extraction: shared keyword matcher vs the previous code'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--docs', type=int, default=500, help='Number of synthetic descriptions')
+    
+    def time_per_doc(self, func, docs):
+        start = time.perf_counter()
+        for doc in docs:
+            func(doc)
+        return (time.perf_counter() - start) / len(docs) * 1e6
+    
+    def handle(self, *args, **options):
+        universal = UniversalJobScraper(use_cache=False)
+        usajobs = USAJobsScraper(api_key='', user_email='')
+        
+        words = [skill for skills in usajobs_scraper.TECHNICAL_SKILLS.values() for skill in skills]
+        words += usajobs_scraper.SOFT_SKILLS
+        docs = sample_documents(options['docs'], words)
+        avg_len = sum(len(doc) for doc in docs) // len(docs)
+        
+        rows = [
+            ('UniversalJobScraper',
+             lambda doc: legacy_universal(doc),
+             lambda doc: universal.analyze_text(doc)),
+            ('USAJobsScraper',
+             lambda doc: legacy_usajobs('Department of Energy', doc),
+             lambda doc: (usajobs.analyze_text(doc), usajobs.analyze_text('Department of Energy'))),
+        ]
+        
+        self.stdout.write(f"{options['docs']} documents, {avg_len} characters on average\n")
+        self.stdout.write(f"{'scraper':<22}{'previous':>14}{'matcher':>14}{'speedup':>10}")
+        for name, legacy, current in rows:
+            legacy_us = self.time_per_doc(legacy, docs)
+            current_us = self.time_per_doc(current, docs)
+            self.stdout.write(
+                f"{name:<22}{legacy_us:>11.1f} us{current_us:>11.1f} us{legacy_us / current_us:>9.1f}x"
+            )
@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from scraper.geocoder import geocode_jobs, merge_points
+from scraper.models import JobListing
+from scraper.usajobs_scraper import USAJOBS_SOURCE
+
+
+class Command(BaseCommand):
+    help = 'Geocode stored jobs whose locations have no coordinates yet'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Re-geocode every job, not only jobs without location points (USAJobs API coordinates are kept)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Jobs per geocode and UPDATE batch'
+        )
+    
+    def handle(self, *args, **options):
+        jobs = JobListing.objects.order_by('id')
+        if not options['all']:
+            jobs = jobs.filter(location_points=[])
+        
+        fields = ['latitude', 'longitude', 'location_points', 'zip_codes', 'states']
+        last_id = 0
+        updated = located = 0
+        
+        while True:
+            batch = list(
+                jobs.filter(id__gt=last_id)
+                .values('id', 'locations', 'zip_codes', 'source_domain', 'location_points')[:options['batch_size']]
+            )
+            if not batch:
+                break
+            last_id = batch[-1]['id']
+            
+            # USAJobs points come from the API and are kept; everything else is geocoded afresh
+            kept = [
+                job_data['location_points'] if job_data['source_domain'] == USAJOBS_SOURCE else []
+                for job_data in batch
+            ]
+            for job_data in batch:
+                job_data['location_points'] = []
+            geocode_jobs(batch)
+            
+            for job_data, points in zip(batch, kept):
+                if points:
+                    # Stored points no longer line up with locations, so missing ones are found by distance
+                    job_data['location_points'] = merge_points(points, job_data['location_points'])
+                    job_data['latitude'], job_data['longitude'] = job_data['location_points'][0]
+            
+            now = timezone.now()
+            JobListing.objects.bulk_update(
+                [JobListing(id=job_data['id'], date_updated=now, **{f: job_data[f] for f in fields}) for job_data in batch],
+                fields + ['date_updated'],
+            )
+            updated += len(batch)
+            located += sum(1 for job_data in batch if job_data['location_points'])
+            self.stdout.write(f"  Geocoded {updated} jobs...")
+        
+        self.stdout.write(self.style.SUCCESS(f"✅ {located} of {updated} jobs now have coordinates"))
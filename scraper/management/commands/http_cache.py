@@ -0,0 +1,59 @@
+from datetime import datetime
+from django.core.management.base import BaseCommand, CommandError
+from django.conf import settings
+from scraper.http_cache import HttpCache
+
+
+class Command(BaseCommand):
+    help = 'Inspect and prune the on-disk HTTP response cache'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--prune',
+            action='store_true',
+            help='Evict least recently used entries down to the size cap'
+        )
+        parser.add_argument(
+            '--max-size-mb',
+            type=int,
+            help='Size cap to prune to (defaults to SCRAPER_HTTP_CACHE_MAX_MB)'
+        )
+        parser.add_argument(
+            '--older-than-days',
+            type=int,
+            help='With --prune, also evict entries not used for this many days'
+        )
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Remove every cached response'
+        )
+    
+    def handle(self, *args, **options):
+        if options['prune'] and options['clear']:
+            raise CommandError('Use either --prune or --clear, not both')
+        
+        cache = HttpCache(
+            settings.SCRAPER_HTTP_CACHE_DIR,
+            max_bytes=settings.SCRAPER_HTTP_CACHE_MAX_MB * 1024 * 1024,
+        )
+        
+        if options['clear']:
+            removed = cache.clear()
+            self.stdout.write(self.style.SUCCESS(f"Removed {removed} cached responses"))
+        elif options['prune']:
+            max_bytes = options['max_size_mb'] * 1024 * 1024 if options['max_size_mb'] is not None else None
+            older_than = options['older_than_days'] * 86400 if options['older_than_days'] is not None else None
+            removed = cache.prune(max_bytes=max_bytes, older_than=older_than)
+            self.stdout.write(self.style.SUCCESS(f"Pruned {removed} cached responses"))
+        
+        stats = cache.stats()
+        self.stdout.write(
+            f"\nCache directory: {cache.path}\n"
+            f"Entries: {stats['entries']}\n"
+            f"Size: {stats['bytes'] / (1024 * 1024):.1f} MB of {stats['max_bytes'] / (1024 * 1024):.0f} MB"
+        )
+        if stats['entries']:
+            oldest = datetime.fromtimestamp(stats['oldest_access']).strftime('%Y-%m-%d %H:%M')
+            newest = datetime.fromtimestamp(stats['newest_access']).strftime('%Y-%m-%d %H:%M')
+            self.stdout.write(f"Last used: {oldest} (oldest) to {newest} (newest)")
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+from scraper.ingest import chunked
+from scraper.models import ZipCentroid
+from scraper.zip_centroids import pgeocode_data_path, read_geonames, zip_slot
+
+
+class Command(BaseCommand):
+    help = 'Load US ZIP code centroids into the ZipCentroid table'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--file',
+            type=str,
+            help='GeoNames US.txt dump (defaults to the copy pgeocode downloads)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Rows per INSERT batch'
+        )
+    
+    def handle(self, *args, **options):
+        path = options['file'] or pgeocode_data_path()
+        
+        try:
+            rows = {}
+            for row in read_geonames(path):
+                if zip_slot(row['zip_code']) is not None:
+                    rows.setdefault(row['zip_code'], row)
+        except OSError as e:
+            raise CommandError(f"Could not read {path}: {e}")
+        
+        if not rows:
+            raise CommandError(f"No ZIP codes found in {path}")
+        
+        self.stdout.write(f"Loading {len(rows)} ZIP codes from {path}...")
+        
+        for chunk in chunked(list(rows.values()), options['batch_size']):
+            ZipCentroid.objects.bulk_create(
+                [ZipCentroid(**row) for row in chunk],
+                update_conflicts=True,
+                unique_fields=['zip_code'],
+                update_fields=['latitude', 'longitude', 'city', 'state'],
+            )
+        
+        self.stdout.write(self.style.SUCCESS(f"✅ {ZipCentroid.objects.count()} ZIP centroids stored"))
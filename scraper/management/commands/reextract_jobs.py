@@ -0,0 +1,89 @@
+import time
+from pathlib import Path
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from scraper.extraction import REEXTRACT_FIELDS, extract_batches, reextract_jobs
+from scraper.models import JobListing
+from scraper.statistics import refresh_statistics_snapshots
+
+
+class Command(BaseCommand):
+    help = 'Recompute skills and sectors of stored jobs from their saved descriptions'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Jobs per primary-key range; each range is extracted in a worker and written with one bulk_update'
+        )
+        parser.add_argument(
+            '--source',
+            default='',
+            help='Only re-extract jobs from this source_domain'
+        )
+        parser.add_argument(
+            '--checkpoint',
+            default=str(Path(settings.BASE_DIR) / '.reextract_checkpoint'),
+            help='File recording the last finished id, so an interrupted run resumes where it stopped'
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Ignore the checkpoint and start from the first job'
+        )
+    
+    def handle(self, *args, **options):
+        checkpoint = Path(options['checkpoint'])
+        last_id = 0
+        if checkpoint.exists() and not options['restart']:
+            last_id = int(checkpoint.read_text().strip() or 0)
+            self.stdout.write(f"  Resuming after id {last_id}")
+        
+        jobs = JobListing.objects.order_by('id')
+        if options['source']:
+            jobs = jobs.filter(source_domain=options['source'])
+        missing = jobs.filter(description='').count()
+        jobs = jobs.exclude(description='')
+        
+        def ranges():
+            start = last_id
+            while True:
+                rows = list(
+                    jobs.filter(id__gt=start)
+                    .values_list('id', 'source_domain', 'title', 'organization', 'description')[:options['batch_size']]
+                )
+                if not rows:
+                    return
+                start = rows[-1][0]
+                yield [row[0] for row in rows], [row[1:] for row in rows]
+        
+        started = time.monotonic()
+        updated = 0
+        rate = 0.0
+        
+        for ids, results in extract_batches(reextract_jobs, ranges()):
+            now = timezone.now()
+            JobListing.objects.bulk_update(
+                [
+                    JobListing(id=job_id, date_updated=now, **extracted)
+                    for job_id, extracted in zip(ids, results) if extracted
+                ],
+                REEXTRACT_FIELDS + ['date_updated'],
+            )
+            # Ranges come back in order, so everything up to this id is done
+            checkpoint.write_text(str(ids[-1]))
+            
+            updated += len(ids)
+            rate = updated / max(time.monotonic() - started, 1e-6)
+            self.stdout.write(f"  Re-extracted {updated} jobs (through id {ids[-1]}), {rate:.0f} rows/sec")
+        
+        checkpoint.unlink(missing_ok=True)
+        if updated:
+            # Sector counts may have moved between snapshots, so rebuild them all
+            refresh_statistics_snapshots(full=True)
+        
+        if missing:
+            self.stdout.write(f"  {missing} jobs have no stored description; re-scrape them to fill it")
+        self.stdout.write(self.style.SUCCESS(f"✅ Re-extracted {updated} jobs at {rate:.0f} rows/sec"))
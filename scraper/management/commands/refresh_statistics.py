@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from scraper.statistics import refresh_statistics_snapshots
+
+
+class Command(BaseCommand):
+    help = 'Refresh the precomputed job_list statistics snapshots'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Recompute every snapshot instead of only those touched by changed jobs'
+        )
+    
+    def handle(self, *args, **options):
+        refreshed = refresh_statistics_snapshots(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(f"✅ Refreshed {refreshed} statistics snapshots"))
@@ -12,6 +12,11 @@ class Command(BaseCommand):
             type=str,
             help='URLs to scrape (space-separated)'
         )
+        parser.add_argument(
+            '--no-cache',
+            action='store_true',
+            help='Ignore the HTTP cache and re-process every page'
+        )
     
     def handle(self, *args, **options):
         urls = options.get('urls') or [
@@ -21,7 +26,7 @@ class Command(BaseCommand):
         
         self.stdout.write(f"Starting scrape of {len(urls)} sites...")
         
-        scraper = UniversalJobScraper()
+        scraper = UniversalJobScraper(use_cache=not options['no_cache'])
         stats = scraper.scrape_multiple_sites(urls)
         
         self.stdout.write(
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:41
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remove_duplicate_apply_links(apps, schema_editor):
+    """Keep the first scraped row for each apply_link so the unique index can be built."""
+    JobListing = apps.get_model('scraper', 'JobListing')
+    duplicates = (
+        JobListing.objects.values('apply_link')
+        .annotate(keep_id=Min('id'), copies=Count('id'))
+        .filter(copies__gt=1)
+    )
+    for duplicate in duplicates.iterator():
+        JobListing.objects.filter(
+            apply_link=duplicate['apply_link']
+        ).exclude(id=duplicate['keep_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_apply_links, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='joblisting',
+            name='apply_link',
+            field=models.URLField(max_length=500, unique=True),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0007_joblisting_date_updated_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatisticsSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(blank=True, help_text='job_type, sector, work_format, state or blank for all jobs', max_length=20)),
+                ('value', models.CharField(blank=True, max_length=100)),
+                ('stats', models.JSONField(blank=True, null=True)),
+                ('computed_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='statisticssnapshot',
+            constraint=models.UniqueConstraint(fields=('dimension', 'value'), name='unique_statistics_snapshot'),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:55
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+SEARCH_VECTOR_TRIGGER = """
+CREATE OR REPLACE FUNCTION scraper_joblisting_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(NEW.organization, '')), 'B')
+        || setweight(to_tsvector('english', coalesce(array_to_string(NEW.locations, ' '), '')), 'C')
+        || setweight(to_tsvector('english',
+            coalesce(array_to_string(NEW.soft_skills, ' '), '') || ' ' || coalesce((
+                SELECT string_agg(skill, ' ')
+                FROM jsonb_each(
+                    CASE WHEN jsonb_typeof(NEW.technical_skills) = 'object' THEN NEW.technical_skills ELSE '{}'::jsonb END
+                ) AS category,
+                jsonb_array_elements_text(
+                    CASE WHEN jsonb_typeof(category.value) = 'array' THEN category.value ELSE '[]'::jsonb END
+                ) AS skill
+            ), '')
+        ), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER scraper_joblisting_search_vector
+BEFORE INSERT OR UPDATE OF title, organization, locations, soft_skills, technical_skills
+ON scraper_joblisting
+FOR EACH ROW EXECUTE FUNCTION scraper_joblisting_search_vector_update();
+
+-- Fill the column for existing rows through the trigger
+UPDATE scraper_joblisting SET title = title;
+"""
+
+DROP_SEARCH_VECTOR_TRIGGER = """
+DROP TRIGGER IF EXISTS scraper_joblisting_search_vector ON scraper_joblisting;
+DROP FUNCTION IF EXISTS scraper_joblisting_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0008_statistics_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joblisting',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='scraper_job_search_gin'),
+        ),
+        migrations.RunSQL(SEARCH_VECTOR_TRIGGER, DROP_SEARCH_VECTOR_TRIGGER),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:57
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+import scraper.models
+from scraper.geocoder import location_states
+
+
+# array_to_string() is only STABLE, so an expression index needs this IMMUTABLE wrapper
+LOCATIONS_TEXT_FUNCTION = """
+CREATE OR REPLACE FUNCTION scraper_locations_text(text[]) RETURNS text AS $$
+    SELECT lower(array_to_string($1, ' '))
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+"""
+
+DROP_LOCATIONS_TEXT_FUNCTION = "DROP FUNCTION IF EXISTS scraper_locations_text(text[]);"
+
+
+def fill_states(apps, schema_editor):
+    JobListing = apps.get_model('scraper', 'JobListing')
+    batch = []
+    for job in JobListing.objects.only('id', 'locations').iterator(chunk_size=2000):
+        job.states = sorted(location_states(job.locations))
+        if job.states:
+            batch.append(job)
+        if len(batch) >= 2000:
+            JobListing.objects.bulk_update(batch, ['states'])
+            batch = []
+    JobListing.objects.bulk_update(batch, ['states'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0009_job_search_vector'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunSQL(LOCATIONS_TEXT_FUNCTION, DROP_LOCATIONS_TEXT_FUNCTION),
+        migrations.AddField(
+            model_name='joblisting',
+            name='states',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=2), blank=True, default=list, help_text='State codes of the locations', size=None),
+        ),
+        migrations.RunPython(fill_states, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['sectors'], name='scraper_job_sectors_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['work_format'], name='scraper_job_format_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['soft_skills'], name='scraper_job_soft_skills_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['states'], name='scraper_job_states_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['technical_skills'], name='scraper_job_tech_skills_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(scraper.models.LocationsText('locations'), name='gin_trgm_ops'), name='scraper_job_locations_trgm'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0010_job_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='joblisting',
+            name='scraper_job_date_sc_5541c9_idx',
+        ),
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=models.Index(fields=['date_scraped', 'id'], name='scraper_job_date_sc_0d14ef_idx'),
+        ),
+    ]
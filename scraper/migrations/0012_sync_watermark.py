@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0011_joblisting_keyset_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=50)),
+                ('keyword', models.CharField(max_length=200)),
+                ('synced_at', models.DateTimeField(blank=True, help_text='Start of the last successful sync', null=True)),
+                ('reconciled_at', models.DateTimeField(blank=True, help_text='Last full ID comparison', null=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='syncwatermark',
+            constraint=models.UniqueConstraint(fields=('source', 'keyword'), name='unique_sync_watermark'),
+        ),
+    ]
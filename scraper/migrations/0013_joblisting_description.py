@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0012_sync_watermark'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joblisting',
+            name='description',
+            field=models.TextField(blank=True, help_text='Text the skills and sectors were extracted from'),
+        ),
+    ]
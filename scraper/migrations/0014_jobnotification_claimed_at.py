@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0013_joblisting_description'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobnotification',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, help_text='When a worker took the event to send', null=True),
+        ),
+    ]
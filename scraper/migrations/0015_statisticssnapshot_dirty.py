@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0014_jobnotification_claimed_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='statisticssnapshot',
+            name='dirty',
+            field=models.BooleanField(default=False, help_text="A job left this snapshot's value since it was computed"),
+        ),
+    ]
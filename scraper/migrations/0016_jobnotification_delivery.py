@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:24
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0015_statisticssnapshot_dirty'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobnotification',
+            name='attempts',
+            field=models.IntegerField(default=0, help_text='Runs in which a digest for this job failed'),
+        ),
+        migrations.AddField(
+            model_name='jobnotification',
+            name='delivered_to',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=254), blank=True, default=list, help_text='Subscribers already emailed about this job', size=None),
+        ),
+        migrations.AddField(
+            model_name='jobnotification',
+            name='failed_at',
+            field=models.DateTimeField(blank=True, help_text='Set when retries ran out; the event is not sent again', null=True),
+        ),
+        migrations.AddField(
+            model_name='jobnotification',
+            name='last_error',
+            field=models.TextField(blank=True),
+        ),
+    ]
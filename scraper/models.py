@@ -1,9 +1,16 @@
 from django.db import models
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
 from django.db.models.signals import post_save
 from django.dispatch import receiver
-from django.core.mail import send_mail
-from django.conf import settings
+from django.db import transaction
+
+
+class LocationsText(models.Func):
+    """Lower-cased locations as one string (an immutable SQL function, so it can be indexed)"""
+    function = 'scraper_locations_text'
+    output_field = models.TextField()
 
 
 class JobListing(models.Model):
@@ -40,16 +47,19 @@ class JobListing(models.Model):
     
     # Geographic coordinates for distance calculation
     zip_codes = ArrayField(models.CharField(max_length=10), blank=True, default=list)
+    states = ArrayField(models.CharField(max_length=2), blank=True, default=list, help_text="State codes of the locations")
     latitude = models.FloatField(null=True, blank=True)
     longitude = models.FloatField(null=True, blank=True)
+    location_points = models.JSONField(default=list, blank=True, help_text="[latitude, longitude] of every location")
     
     # Skills & Sectors
     technical_skills = models.JSONField(default=dict, blank=True)
     soft_skills = ArrayField(models.CharField(max_length=100), blank=True, default=list)
     sectors = ArrayField(models.CharField(max_length=100), blank=True, default=list)
+    description = models.TextField(blank=True, help_text="Text the skills and sectors were extracted from")
     
     # Links & Status
-    apply_link = models.URLField(max_length=500)
+    apply_link = models.URLField(max_length=500, unique=True)
     source_domain = models.CharField(max_length=200, blank=True)
     closed = models.BooleanField(default=False)
     sponsorship_required = models.BooleanField(default=False)
@@ -59,15 +69,32 @@ class JobListing(models.Model):
     date_scraped = models.DateTimeField(auto_now_add=True)
     date_updated = models.DateTimeField(auto_now=True)
     
+    # Full-text search document, maintained by a database trigger on every write
+    search_vector = SearchVectorField(null=True, editable=False)
+    
     class Meta:
         ordering = ['-date_scraped']
         indexes = [
             models.Index(fields=['job_type', 'closed']),
             models.Index(fields=['organization']),
-            models.Index(fields=['date_scraped']),
+            models.Index(fields=['date_scraped', 'id']),
+            models.Index(fields=['date_updated']),
             models.Index(fields=['latitude', 'longitude']),
+            GinIndex(fields=['search_vector'], name='scraper_job_search_gin'),
+            GinIndex(fields=['sectors'], name='scraper_job_sectors_gin'),
+            GinIndex(fields=['work_format'], name='scraper_job_format_gin'),
+            GinIndex(fields=['soft_skills'], name='scraper_job_soft_skills_gin'),
+            GinIndex(fields=['states'], name='scraper_job_states_gin'),
+            GinIndex(fields=['technical_skills'], name='scraper_job_tech_skills_gin'),
+            GinIndex(OpClass(LocationsText('locations'), name='gin_trgm_ops'), name='scraper_job_locations_trgm'),
         ]
     
+    def save(self, *args, **kwargs):
+        # Bulk ingest fills states in geocode_jobs; this covers single saves (admin, API)
+        from .geocoder import location_states
+        self.states = sorted(location_states(self.locations))
+        super().save(*args, **kwargs)
+    
     def __str__(self):
         return f"{self.organization} - {self.title}"
 
@@ -76,6 +103,7 @@ class EmailSubscriber(models.Model):
     """Email subscribers for job alerts"""
     email = models.EmailField(unique=True)
     subscribed_date = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
     
     # Preferences
@@ -118,63 +146,89 @@ class ScrapingLog(models.Model):
         return f"Scrape {self.started_at.strftime('%Y-%m-%d %H:%M')} - {self.status}"
 
 
+class SyncWatermark(models.Model):
+    """How far an incremental sync has read one search keyword of a source"""
+    source = models.CharField(max_length=50)
+    keyword = models.CharField(max_length=200)
+    synced_at = models.DateTimeField(null=True, blank=True, help_text="Start of the last successful sync")
+    reconciled_at = models.DateTimeField(null=True, blank=True, help_text="Last full ID comparison")
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['source', 'keyword'], name='unique_sync_watermark'),
+        ]
+    
+    def __str__(self):
+        return f"{self.source}: {self.keyword}"
+
+
+class StatisticsSnapshot(models.Model):
+    """Precomputed job_list statistics for open jobs, overall or filtered on one dimension"""
+    dimension = models.CharField(max_length=20, blank=True, help_text="job_type, sector, work_format, state or blank for all jobs")
+    value = models.CharField(max_length=100, blank=True)
+    stats = models.JSONField(null=True, blank=True)
+    computed_at = models.DateTimeField()
+    dirty = models.BooleanField(default=False, help_text="A job left this snapshot's value since it was computed")
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['dimension', 'value'], name='unique_statistics_snapshot'),
+        ]
+    
+    def __str__(self):
+        return f"{self.dimension}={self.value}" if self.dimension else "all jobs"
+
+
+class ZipCentroid(models.Model):
+    """Latitude/longitude centroid of a five-digit US ZIP code"""
+    zip_code = models.CharField(max_length=5, primary_key=True)
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    city = models.CharField(max_length=200, blank=True)
+    state = models.CharField(max_length=2, blank=True)
+    
+    def __str__(self):
+        return self.zip_code
+
+
+class GeocodeCache(models.Model):
+    """Resolved coordinates for a normalized location key; null coordinates record a miss"""
+    key = models.CharField(max_length=300, primary_key=True)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return self.key
+
+
+class JobNotification(models.Model):
+    """Outbox of new-job events waiting to be matched and emailed to subscribers"""
+    job = models.OneToOneField(JobListing, on_delete=models.CASCADE, related_name='notification')
+    created_at = models.DateTimeField(auto_now_add=True)
+    claimed_at = models.DateTimeField(null=True, blank=True, help_text="When a worker took the event to send")
+    processed_at = models.DateTimeField(null=True, blank=True)
+    delivered_to = ArrayField(models.CharField(max_length=254), blank=True, default=list,
+                              help_text="Subscribers already emailed about this job")
+    attempts = models.IntegerField(default=0, help_text="Runs in which a digest for this job failed")
+    last_error = models.TextField(blank=True)
+    failed_at = models.DateTimeField(null=True, blank=True, help_text="Set when retries ran out; the event is not sent again")
+    
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['processed_at']),
+        ]
+    
+    def __str__(self):
+        return f"Notification for job {self.job_id}"
+
+
 @receiver(post_save, sender=JobListing)
 def send_email_on_new_job(sender, instance, created, **kwargs):
-    """Send email notifications when new jobs are posted"""
+    """Record new jobs in the notification outbox; emails go out from a Celery task"""
     if created and not instance.closed:
-        from geopy.distance import geodesic
-        import pgeocode
-        
-        subscribers = EmailSubscriber.objects.filter(is_active=True)
+        from .notifications import queue_job_notifications
         
-        for subscriber in subscribers:
-            # Check preferences
-            if subscriber.job_types and instance.job_type not in subscriber.job_types:
-                continue
-            if subscriber.sectors and not any(s in instance.sectors for s in subscriber.sectors):
-                continue
-            
-            # Check distance if subscriber has location preferences
-            if subscriber.zip_code and subscriber.max_distance_miles and instance.latitude and instance.longitude:
-                try:
-                    nomi = pgeocode.Nominatim('us')
-                    user_location = nomi.query_postal_code(subscriber.zip_code)
-                    if user_location is not None:
-                        user_coords = (user_location.latitude, user_location.longitude)
-                        job_coords = (instance.latitude, instance.longitude)
-                        distance = geodesic(user_coords, job_coords).miles
-                        
-                        if distance > subscriber.max_distance_miles:
-                            continue  # Too far away
-                except:
-                    pass  # If distance calc fails, still send email
-            
-            # Send email
-            subject = f"New {instance.job_type.title()}: {instance.organization} - {instance.title}"
-            
-            message = f"""
-New Job Alert!
-
-Title: {instance.title}
-Organization: {instance.organization}
-Job Type: {instance.job_type.title()}
-Locations: {', '.join(instance.locations)}
-Work Format: {', '.join(instance.work_format)}
-Sectors: {', '.join(instance.sectors)}
-
-Apply: {instance.apply_link}
-
----
-This is an automated notification from Job Scraper.
-            """
-            
-            try:
-                send_mail(
-                    subject=subject,
-                    message=message,
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[subscriber.email],
-                    fail_silently=True,
-                )
-            except Exception as e:
-                print(f"Failed to send email: {e}")
\ No newline at end of file
+        JobNotification.objects.get_or_create(job=instance)
+        transaction.on_commit(queue_job_notifications)
@@ -0,0 +1,167 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import get_connection, send_mass_mail
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from .models import JobNotification
+from .subscriber_index import get_subscriber_index
+
+
+def match_jobs(jobs, index):
+    """Group jobs by the subscriber email they should be sent to."""
+    matches = {}
+    for job in jobs:
+        for profile in index.match(job):
+            matches.setdefault(profile.email, []).append(job)
+    return matches
+
+
+def format_job(job):
+    return f"""Title: {job.title}
+Organization: {job.organization}
+Job Type: {job.job_type.title()}
+Locations: {', '.join(job.locations)}
+Work Format: {', '.join(job.work_format)}
+Sectors: {', '.join(job.sectors)}
+
+Apply: {job.apply_link}
+"""
+
+
+def build_digest(email, jobs):
+    """Return a send_mass_mail tuple covering every matched job for one subscriber."""
+    if len(jobs) == 1:
+        job = jobs[0]
+        subject = f"New {job.job_type.title()}: {job.organization} - {job.title}"
+        heading = "New Job Alert!"
+    else:
+        subject = f"{len(jobs)} new job alerts"
+        heading = f"{len(jobs)} New Job Alerts!"
+
+    body = "\n\n".join(format_job(job) for job in jobs)
+    message = f"""
+{heading}
+
+{body}
+---
+This is an automated notification from Job Scraper.
+        """
+    return (subject, message, settings.DEFAULT_FROM_EMAIL, [email])
+
+
+def claim_events(batch_size):
+    """Lease a batch of pending events to this worker and commit, so no row lock is held while sending."""
+    stale = timezone.now() - timedelta(seconds=getattr(settings, 'SCRAPER_NOTIFICATION_CLAIM_SECONDS', 600))
+    with transaction.atomic():
+        events = list(
+            JobNotification.objects
+            .select_for_update(skip_locked=True)
+            .filter(processed_at__isnull=True, failed_at__isnull=True)
+            .filter(Q(claimed_at__isnull=True) | Q(claimed_at__lt=stale))
+            .select_related('job')[:batch_size]
+        )
+        if events:
+            JobNotification.objects.filter(id__in=[event.id for event in events]).update(claimed_at=timezone.now())
+    return events
+
+
+def send_digests(matches):
+    """Email one digest per subscriber; return {email: error} for the digests that could not be sent."""
+    errors = {}
+    # One SMTP connection for the whole batch
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+        for email, jobs in matches.items():
+            try:
+                send_mass_mail([build_digest(email, jobs)], connection=connection)
+            except Exception as e:
+                print(f"  Could not email {email}: {e}")
+                errors[email] = str(e)
+    except Exception as e:
+        print(f"  Could not connect to the mail server: {e}")
+        errors.update({email: str(e) for email in matches if email not in errors})
+    finally:
+        connection.close()
+    return errors
+
+
+def process_job_notifications(batch_size=None):
+    """Drain the outbox: claim pending events, email per-subscriber digests and record who received each job.
+    
+    An event is processed once every matched subscriber has it. Subscribers a failed event already
+    reached are not emailed again on retry, and after SCRAPER_NOTIFICATION_MAX_ATTEMPTS failed runs
+    the event is marked failed_at and left alone.
+    """
+    batch_size = batch_size or getattr(settings, 'SCRAPER_NOTIFICATION_BATCH_SIZE', 500)
+    max_attempts = getattr(settings, 'SCRAPER_NOTIFICATION_MAX_ATTEMPTS', 5)
+    stats = {'jobs': 0, 'emails': 0, 'failed': 0}
+    index = None
+    retry_ids = []
+
+    while True:
+        events = claim_events(batch_size)
+        if not events:
+            break
+
+        by_job = {event.job_id: event for event in events}
+        jobs = [event.job for event in events if not event.job.closed]
+        digests = {}
+        if jobs:
+            if index is None:
+                index = get_subscriber_index().refresh()
+
+            for email, matched in match_jobs(jobs, index).items():
+                remaining = [job for job in matched if email not in by_job[job.id].delivered_to]
+                if remaining:
+                    digests[email] = remaining
+
+        errors = send_digests(digests) if digests else {}
+        stats['emails'] += len(digests) - len(errors)
+
+        event_errors = {}
+        for email, matched in digests.items():
+            for job in matched:
+                event = by_job[job.id]
+                if email in errors:
+                    event_errors[event.id] = f"{email}: {errors[email]}"
+                else:
+                    event.delivered_to.append(email)
+
+        now = timezone.now()
+        for event in events:
+            if event.id not in event_errors:
+                event.processed_at = now
+                stats['jobs'] += not event.job.closed
+                continue
+
+            event.attempts += 1
+            event.last_error = event_errors[event.id]
+            stats['failed'] += 1
+            if event.attempts >= max_attempts:
+                print(f"  Giving up on {event} after {event.attempts} attempts: {event.last_error}")
+                event.failed_at = now
+            else:
+                # Keeps its claim for the rest of this run so the loop moves on
+                retry_ids.append(event.id)
+
+        JobNotification.objects.bulk_update(
+            events, ['processed_at', 'delivered_to', 'attempts', 'last_error', 'failed_at']
+        )
+
+    if retry_ids:
+        # Release them for the next run
+        JobNotification.objects.filter(id__in=retry_ids).update(claimed_at=None)
+
+    return stats
+
+
+def queue_job_notifications():
+    """Ask a worker to drain the outbox; the periodic task picks events up if the broker is down."""
+    from .tasks import send_job_notifications
+
+    try:
+        send_job_notifications.delay()
+    except Exception as e:
+        print(f"  Could not queue notifications ({e}), they will go out on the next scheduled run")
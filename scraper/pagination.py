@@ -0,0 +1,73 @@
+import json
+from collections import OrderedDict
+from django.conf import settings
+from django.db import connections
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+
+def estimated_count(queryset):
+    """The planner's row estimate for a queryset; EXPLAIN reads no rows."""
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def approximate_count(queryset, exact_limit=None):
+    """Return (count, is_approximate): exact up to `exact_limit` rows, the planner estimate beyond that."""
+    if exact_limit is None:
+        exact_limit = getattr(settings, 'SCRAPER_EXACT_COUNT_LIMIT', 10000)
+
+    # COUNT over a LIMITed subquery stops after exact_limit + 1 rows, however large the table
+    counted = queryset.order_by()[:exact_limit + 1].count()
+    if counted <= exact_limit:
+        return counted, False
+    return max(estimated_count(queryset), counted), True
+
+
+class JobCursorPagination(CursorPagination):
+    """Keyset pages over (-date_scraped, -id)"""
+    ordering = ('-date_scraped', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count, self.count_is_approximate = approximate_count(queryset)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('count', self.count),
+            ('count_is_approximate', self.count_is_approximate),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+
+class JobSearchPagination(PageNumberPagination):
+    """Offset pages for ranked search results, whose float rank is no unique, exact cursor position"""
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('count', self.page.paginator.count),
+            ('count_is_approximate', False),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+
+def paginate_by_cursor(queryset, request, page_size):
+    """Keyset-paginate a queryset for a template view; returns (page of jobs, paginator)."""
+    paginator = JobCursorPagination()
+    paginator.page_size = page_size
+    jobs = paginator.paginate_queryset(queryset, Request(request))
+    return jobs, paginator
@@ -0,0 +1,124 @@
+from bs4 import BeautifulSoup
+from django.conf import settings
+
+try:
+    import lxml.html
+except ImportError:  # pragma: no cover - lxml is optional
+    lxml = None
+
+
+# Text inside these elements is never visible, matching BeautifulSoup's get_text()
+SKIPPED_TEXT_TAGS = {'script', 'style', 'template'}
+
+
+class SoupBackend:
+    """BeautifulSoup backend using the pure-Python html.parser (the original path)"""
+    name = 'soup'
+
+    def __init__(self, features='html.parser'):
+        self.features = features
+
+    def parse(self, html):
+        return BeautifulSoup(html, self.features)
+
+    def iter_elements(self, node):
+        return node.find_all(True)
+
+    def iter_descendants(self, node, tags=None):
+        return node.find_all(list(tags) if tags else True)
+
+    def tag_name(self, el):
+        return el.name
+
+    def class_string(self, el):
+        classes = el.get('class') or []
+        return ' '.join(classes) if isinstance(classes, list) else classes
+
+    def get_attr(self, el, name):
+        return el.get(name, '') or ''
+
+    def get_text(self, el, separator=''):
+        return el.get_text(separator=separator, strip=True)
+
+    def find_text(self, el, regex):
+        found = el.find(string=regex)
+        return str(found) if found else None
+
+
+class LxmlBackend:
+    """lxml.html backend: C parser and tree walks, same results as SoupBackend"""
+    name = 'lxml'
+
+    def __init__(self):
+        if lxml is None:
+            raise ImportError("lxml is not installed")
+        self.html_parser = lxml.html.HTMLParser(encoding='utf-8')
+
+    def parse(self, html):
+        if not html or not html.strip():
+            html = '<html></html>'
+        # Parse bytes so pages that carry an XML encoding declaration are accepted
+        return lxml.html.document_fromstring(html.encode('utf-8'), parser=self.html_parser)
+
+    def iter_elements(self, node):
+        for el in node.iter():
+            if isinstance(el.tag, str):
+                yield el
+
+    def iter_descendants(self, node, tags=None):
+        for el in node.iterdescendants(*(tags or ())):
+            if isinstance(el.tag, str):
+                yield el
+
+    def tag_name(self, el):
+        return el.tag
+
+    def class_string(self, el):
+        return el.get('class', '')
+
+    def get_attr(self, el, name):
+        return el.get(name, '') or ''
+
+    def _iter_strings(self, el):
+        if el.tag in SKIPPED_TEXT_TAGS:
+            return
+        if el.text:
+            yield el.text
+        for child in el:
+            if isinstance(child.tag, str):
+                yield from self._iter_strings(child)
+            if child.tail:
+                yield child.tail
+
+    def get_text(self, el, separator=''):
+        return separator.join(
+            text for text in (s.strip() for s in self._iter_strings(el)) if text
+        )
+
+    def find_text(self, el, regex):
+        for text in self._iter_strings(el):
+            if regex.search(text):
+                return text
+        return None
+
+
+def first_match(backend, node, tags, class_regex=None):
+    """Return the first descendant of `node` with one of `tags` (and a class matching `class_regex`)."""
+    for el in backend.iter_descendants(node, tags):
+        if class_regex is None or class_regex.search(backend.class_string(el)):
+            return el
+    return None
+
+
+def get_parser_backend(name=None):
+    """Return the configured backend: 'lxml', 'soup', or 'auto' (lxml when installed)."""
+    name = name or getattr(settings, 'SCRAPER_HTML_PARSER', 'auto')
+
+    if name == 'soup':
+        return SoupBackend()
+    if name == 'lxml':
+        return LxmlBackend()
+    if name == 'auto':
+        return LxmlBackend() if lxml is not None else SoupBackend()
+
+    raise ValueError(f"Unknown HTML parser backend: {name}")
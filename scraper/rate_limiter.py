@@ -0,0 +1,136 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+from django.conf import settings
+from django.utils import timezone
+
+
+RETRY_AFTER_STATUSES = (429, 503)
+
+
+def parse_retry_after(value):
+    """Parse a Retry-After header (seconds or HTTP date) into seconds to wait."""
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(0.0, (retry_at - timezone.now()).total_seconds())
+
+
+class TokenBucket:
+    """Allow `rate` requests per second on average with bursts of up to `burst`"""
+
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.burst = max(1.0, float(burst))
+        self.tokens = self.burst
+        # Tokens are accounted from this instant; it lies in the future while paused
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token and return how many seconds the caller must wait before using it."""
+        if self.rate <= 0:
+            return 0.0
+
+        with self.lock:
+            now = time.monotonic()
+            if now > self.updated:
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+            self.tokens -= 1
+
+            wait = self.updated - now
+            if self.tokens < 0:
+                wait += -self.tokens / self.rate
+            return wait
+
+    def acquire(self):
+        """Block until a request is allowed."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def pause(self, seconds):
+        """Stop handing out tokens for the next `seconds` seconds."""
+        with self.lock:
+            self.tokens = min(self.tokens, 0.0)
+            self.updated = max(self.updated, time.monotonic() + seconds)
+
+
+class RateLimiter:
+    """Per-domain token buckets shared by every scraper in the process"""
+
+    def __init__(self, limits=None, default_rate=1.0, default_burst=5, default_backoff=30, max_backoff=300):
+        self.limits = limits or {}
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.default_backoff = default_backoff
+        self.max_backoff = max_backoff
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def limits_for(self, host):
+        """Return (rate, burst) for a host, matching configured domains by suffix."""
+        for domain, limit in self.limits.items():
+            if host == domain or host.endswith('.' + domain):
+                return limit.get('rate', self.default_rate), limit.get('burst', self.default_burst)
+        return self.default_rate, self.default_burst
+
+    def bucket_for(self, url):
+        host = (urlparse(url).hostname or url).lower()
+
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(*self.limits_for(host))
+                self.buckets[host] = bucket
+            return bucket
+
+    def wait(self, url):
+        """Block until the host of `url` may be requested again."""
+        return self.bucket_for(url).acquire()
+
+    def backoff(self, url, response):
+        """Pause the host after a 429/503, honouring Retry-After. Returns the delay applied."""
+        if response.status_code not in RETRY_AFTER_STATUSES:
+            return 0.0
+
+        delay = parse_retry_after(response.headers.get('Retry-After'))
+        if delay is None:
+            delay = self.default_backoff
+        delay = min(delay, self.max_backoff)
+
+        print(f"  Rate limited by {urlparse(url).netloc} ({response.status_code}), pausing {delay:.0f}s")
+        self.bucket_for(url).pause(delay)
+        return delay
+
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """Return the process-wide rate limiter configured from settings."""
+    global _rate_limiter
+
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter(
+                limits=getattr(settings, 'SCRAPER_RATE_LIMITS', {}),
+                default_rate=getattr(settings, 'SCRAPER_DEFAULT_RATE', 1.0),
+                default_burst=getattr(settings, 'SCRAPER_DEFAULT_BURST', 5),
+                default_backoff=getattr(settings, 'SCRAPER_DEFAULT_BACKOFF', 30),
+                max_backoff=getattr(settings, 'SCRAPER_MAX_BACKOFF', 300),
+            )
+        return _rate_limiter
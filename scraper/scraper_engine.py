@@ -1,77 +1,136 @@
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
-import time
 import re
 from urllib.parse import urljoin, urlparse
+from django.conf import settings
+from .async_fetcher import AsyncFetcher
+from .distance_engine import refresh_distance_engine
+from .extraction import extract_batches
+from .http_cache import CachedResponse, get_http_cache
+from .http_client import get_http_client
+from .ingest import upsert_jobs
 from .models import JobListing, ScrapingLog
-from .serializers import JobListingCreateSerializer
+from .parsers import first_match, get_parser_backend
+from .skill_matcher import KeywordMatcher, group_hits
+from .statistics import refresh_statistics_snapshots
+
+
+JOB_TITLE_CLASS = re.compile(r'job[-_]?title', re.I)
+JOB_LINK_HREF = re.compile(r'(job|career|position)', re.I)
+DESCRIPTION_CLASS = re.compile(r'(description|details|content)', re.I)
+DATE_TEXT = re.compile(r'\d{1,2}/\d{1,2}/\d{2,4}')
+
+JOB_TYPE_KEYWORDS = {
+    "internship": ["intern", "interns", "internship", "internships", "summer program", "co-op"],
+    "job": ["full-time", "full time", "permanent", "career", "position"],
+    "fellowship": ["fellowship", "fellowships", "fellow", "fellows", "postdoc", "post-doctoral"]
+}
+
+TECHNICAL_SKILLS = {
+    "Programming Languages": [
+        "python", "java", "javascript", "typescript", "c++", "c#", "ruby", 
+        "go", "rust", "swift", "kotlin", "php", "r", "matlab", "scala"
+    ],
+    "Web Development": [
+        "react", "angular", "vue", "node.js", "django", "flask", "spring",
+        "html", "css", "rest api", "graphql", "webpack"
+    ],
+    "Data Science": [
+        "machine learning", "deep learning", "neural networks", "nlp",
+        "computer vision", "data analysis", "statistics", "sql", "nosql",
+        "pandas", "numpy", "scikit-learn", "tensorflow", "pytorch"
+    ],
+    "Cloud & DevOps": [
+        "aws", "azure", "gcp", "docker", "kubernetes", "ci/cd", "jenkins",
+        "terraform", "ansible", "linux", "unix", "bash"
+    ],
+    "Security": [
+        "cybersecurity", "penetration testing", "encryption", "authentication",
+        "security clearance", "firewall", "vulnerability"
+    ],
+    "Design": [
+        "ui/ux", "figma", "sketch", "adobe", "photoshop", "illustrator"
+    ]
+}
+
+SOFT_SKILLS = [
+    "communication", "teamwork", "leadership", "problem solving",
+    "analytical", "critical thinking", "collaboration", "presentation",
+    "writing", "research", "project management", "agile", "scrum"
+]
+
+SECTORS = {
+    "Technology": ["software", "it", "tech", "technology", "digital", "computing"],
+    "Healthcare": ["health", "healthcare", "medical", "clinical", "hospital", "patient"],
+    "Finance": ["finance", "financial", "banking", "investment", "trading", "fintech"],
+    "Government": ["government", "federal", "state", "public sector", "policy"],
+    "Education": ["education", "academic", "teaching", "research", "university"],
+    "Energy": ["energy", "renewable", "utilities", "power", "environmental"],
+    "Defense": ["defense", "military", "national security", "intelligence"],
+    "Science": ["research", "laboratory", "scientific", "engineering"]
+}
+
+WORK_FORMATS = {
+    "remote": ["remote", "work from home", "wfh", "virtual", "telecommute"],
+    "hybrid": ["hybrid", "flexible", "mix of remote"],
+    "onsite": ["on-site", "onsite", "in-person", "office-based"]
+}
+
+
+# Every taxonomy keyword in one automaton so a description is scanned once
+TEXT_MATCHER = KeywordMatcher(
+    [(skill, ('technical', category, skill.title()))
+     for category, skills in TECHNICAL_SKILLS.items() for skill in skills] +
+    [(skill, ('soft', None, skill.title())) for skill in SOFT_SKILLS] +
+    [(keyword, ('sector', sector, None))
+     for sector, keywords in SECTORS.items() for keyword in keywords] +
+    [(keyword, ('work_format', work_format, None))
+     for work_format, keywords in WORK_FORMATS.items() for keyword in keywords] +
+    [(keyword, ('job_type', job_type, None))
+     for job_type, keywords in JOB_TYPE_KEYWORDS.items() for keyword in keywords]
+)
+
+
+def analyze_text(text):
+    """Find every skill, sector, work format and job type keyword in one pass."""
+    return group_hits(TEXT_MATCHER.find(text))
+
+
+def pick_job_type(job_types, job_type_keywords=JOB_TYPE_KEYWORDS):
+    """Return the first configured job type among the matched ones."""
+    for job_type in job_type_keywords:
+        if job_type in job_types:
+            return job_type
+    return "job"
 
 
 class UniversalJobScraper:
     """Advanced scraper that integrates with Django models"""
     
-    def __init__(self):
+    job_type_keywords = JOB_TYPE_KEYWORDS
+    technical_skills = TECHNICAL_SKILLS
+    soft_skills = SOFT_SKILLS
+    sectors = SECTORS
+    work_formats = WORK_FORMATS
+    
+    def __init__(self, async_fetch=None, max_concurrency=None, per_host_concurrency=None, use_cache=True,
+                 parser=None, batch_size=None):
+        if async_fetch is None:
+            async_fetch = getattr(settings, 'SCRAPER_ASYNC_FETCH', True)
+        self.async_fetch = async_fetch
+        self.batch_size = batch_size or getattr(settings, 'SCRAPER_INGEST_BATCH_SIZE', 500)
+        self.http = get_http_client()
+        self.cache = get_http_cache() if use_cache else None
+        self.parser = get_parser_backend(parser)
+        self.fetcher = AsyncFetcher(
+            self.fetch_detail_page,
+            max_concurrency=max_concurrency or getattr(settings, 'SCRAPER_MAX_CONCURRENCY', 16),
+            per_host_concurrency=per_host_concurrency or getattr(settings, 'SCRAPER_PER_HOST_CONCURRENCY', 4),
+        )
+        
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
         }
         
-        self.job_type_keywords = {
-            "internship": ["intern", "internship", "summer program", "co-op"],
-            "job": ["full-time", "full time", "permanent", "career", "position"],
-            "fellowship": ["fellowship", "fellow", "postdoc", "post-doctoral"]
-        }
-        
-        self.technical_skills = {
-            "Programming Languages": [
-                "python", "java", "javascript", "typescript", "c++", "c#", "ruby", 
-                "go", "rust", "swift", "kotlin", "php", "r", "matlab", "scala"
-            ],
-            "Web Development": [
-                "react", "angular", "vue", "node.js", "django", "flask", "spring",
-                "html", "css", "rest api", "graphql", "webpack"
-            ],
-            "Data Science": [
-                "machine learning", "deep learning", "neural networks", "nlp",
-                "computer vision", "data analysis", "statistics", "sql", "nosql",
-                "pandas", "numpy", "scikit-learn", "tensorflow", "pytorch"
-            ],
-            "Cloud & DevOps": [
-                "aws", "azure", "gcp", "docker", "kubernetes", "ci/cd", "jenkins",
-                "terraform", "ansible", "linux", "unix", "bash"
-            ],
-            "Security": [
-                "cybersecurity", "penetration testing", "encryption", "authentication",
-                "security clearance", "firewall", "vulnerability"
-            ],
-            "Design": [
-                "ui/ux", "figma", "sketch", "adobe", "photoshop", "illustrator"
-            ]
-        }
-        
-        self.soft_skills = [
-            "communication", "teamwork", "leadership", "problem solving",
-            "analytical", "critical thinking", "collaboration", "presentation",
-            "writing", "research", "project management", "agile", "scrum"
-        ]
-        
-        self.sectors = {
-            "Technology": ["software", "it", "tech", "digital", "computing"],
-            "Healthcare": ["health", "medical", "clinical", "hospital", "patient"],
-            "Finance": ["finance", "banking", "investment", "trading", "fintech"],
-            "Government": ["government", "federal", "state", "public sector", "policy"],
-            "Education": ["education", "academic", "teaching", "research", "university"],
-            "Energy": ["energy", "renewable", "utilities", "power", "environmental"],
-            "Defense": ["defense", "military", "national security", "intelligence"],
-            "Science": ["research", "laboratory", "scientific", "engineering"]
-        }
-        
-        self.work_formats = {
-            "remote": ["remote", "work from home", "wfh", "virtual", "telecommute"],
-            "hybrid": ["hybrid", "flexible", "mix of remote"],
-            "onsite": ["on-site", "onsite", "in-person", "office-based"]
-        }
-        
         self.job_listing_patterns = [
             {'tag': 'div', 'class_pattern': r'job[-_]?(listing|card|item|post)'},
             {'tag': 'li', 'class_pattern': r'job[-_]?(listing|card|item|post)'},
@@ -80,6 +139,13 @@ class UniversalJobScraper:
             {'tag': 'li', 'class_pattern': r'usajobs'},
             {'tag': 'div', 'class_pattern': r'(career|position)[-_]?posting'},
         ]
+        
+        # Compiled once and grouped by tag so find_job_listings is a single tree walk
+        self.listing_matchers = {}
+        for index, pattern in enumerate(self.job_listing_patterns):
+            self.listing_matchers.setdefault(pattern['tag'], []).append(
+                (index, re.compile(pattern['class_pattern'], re.I))
+            )
     
     def extract_locations(self, text):
         """Extract location information from text."""
@@ -96,61 +162,33 @@ class UniversalJobScraper:
         
         return list(set(locations)) if locations else ["Location Not Specified"]
     
+    def analyze_text(self, text):
+        """Find every skill, sector, work format and job type keyword in one pass."""
+        return analyze_text(text)
+    
     def determine_work_format(self, text):
         """Determine work format."""
-        text_lower = text.lower()
-        formats = []
-        
-        for format_type, keywords in self.work_formats.items():
-            if any(keyword in text_lower for keyword in keywords):
-                formats.append(format_type)
-        
-        return formats if formats else ["onsite"]
+        return self.analyze_text(text).get('work_format') or ["onsite"]
     
     def extract_skills(self, text):
         """Extract skills from text."""
-        text_lower = text.lower()
-        found_skills = {
-            "technical": {},
-            "soft": []
+        hits = self.analyze_text(text)
+        return {
+            "technical": hits['technical'],
+            "soft": hits['soft']
         }
-        
-        for category, skills in self.technical_skills.items():
-            category_skills = []
-            for skill in skills:
-                pattern = r'\b' + re.escape(skill) + r'\b'
-                if re.search(pattern, text_lower):
-                    category_skills.append(skill.title())
-            if category_skills:
-                found_skills["technical"][category] = category_skills
-        
-        for skill in self.soft_skills:
-            pattern = r'\b' + re.escape(skill) + r'\b'
-            if re.search(pattern, text_lower):
-                found_skills["soft"].append(skill.title())
-        
-        return found_skills
     
     def identify_sectors(self, text):
         """Identify sectors."""
-        text_lower = text.lower()
-        identified_sectors = []
-        
-        for sector, keywords in self.sectors.items():
-            if any(keyword in text_lower for keyword in keywords):
-                identified_sectors.append(sector)
-        
-        return identified_sectors if identified_sectors else ["General"]
+        return self.analyze_text(text).get('sector') or ["General"]
+    
+    def pick_job_type(self, job_types):
+        """Return the first configured job type among the matched ones."""
+        return pick_job_type(job_types, self.job_type_keywords)
     
     def determine_job_type(self, title, description):
         """Determine job type."""
-        combined_text = (title + " " + description).lower()
-        
-        for job_type, keywords in self.job_type_keywords.items():
-            if any(keyword in combined_text for keyword in keywords):
-                return job_type
-        
-        return "job"
+        return self.pick_job_type(self.analyze_text(title + " " + description).get('job_type', []))
     
     def extract_organization(self, url):
         """Extract organization name from URL."""
@@ -158,103 +196,219 @@ class UniversalJobScraper:
         org = domain.replace('www.', '').split('.')[0]
         return org.title()
     
-    def fetch_job_description(self, url, timeout=5):
-        """Fetch full job description."""
+    def fetch_page(self, url, timeout=None, defer=False):
+        """Fetch a page, revalidating against the HTTP cache when enabled (see HttpCache.fetch for `defer`)."""
+        if self.cache:
+            return self.cache.fetch(self.http, url, headers=self.headers, timeout=timeout, defer=defer)
+        
+        response = self.http.get(url, headers=self.headers, timeout=timeout)
+        return CachedResponse(url, response.status_code, response.text)
+    
+    def fetch_detail_page(self, url, timeout=None):
+        """Fetch a job detail page, returning None on failure."""
         try:
-            response = requests.get(url, headers=self.headers, timeout=timeout)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            desc_patterns = [
-                {'tag': 'div', 'class_pattern': r'(description|details|content)'},
-                {'tag': 'section', 'class_pattern': r'(description|details|content)'},
-            ]
-            
-            for pattern in desc_patterns:
-                desc_elem = soup.find(pattern['tag'], class_=re.compile(pattern['class_pattern'], re.I))
-                if desc_elem:
-                    return desc_elem.get_text(separator=' ', strip=True)
-            
-            main = soup.find('main') or soup.find('body')
-            if main:
-                return main.get_text(separator=' ', strip=True)[:5000]
-            
+            page = self.fetch_page(url, timeout=timeout)
+            page.raise_for_status()
+            return page
         except Exception as e:
             print(f"Could not fetch description: {e}")
+            return None
+    
+    def parse_job_description(self, html):
+        """Extract the description text from a job detail page."""
+        return self.extract_description(self.parser.parse(html))
+    
+    def extract_description(self, doc):
+        """Extract the description text from a parsed job detail page."""
+        parser = self.parser
+        
+        # First div, else first section, whose class looks like a description
+        desc_elem = None
+        for el in parser.iter_descendants(doc, ('div', 'section')):
+            if DESCRIPTION_CLASS.search(parser.class_string(el)):
+                if parser.tag_name(el) == 'div':
+                    desc_elem = el
+                    break
+                desc_elem = desc_elem if desc_elem is not None else el
+        
+        if desc_elem is not None:
+            return parser.get_text(desc_elem, separator=' ')
+        
+        main = first_match(parser, doc, ('main',))
+        if main is None:
+            main = first_match(parser, doc, ('body',))
+        if main is not None:
+            return parser.get_text(main, separator=' ')[:5000]
         
         return ""
     
+    def fetch_job_description(self, url, timeout=None):
+        """Fetch full job description."""
+        page = self.fetch_detail_page(url, timeout=timeout)
+        if page is None:
+            return ""
+        
+        try:
+            return self.parse_job_description(page.text)
+        except Exception as e:
+            print(f"Could not parse description: {e}")
+            return ""
+    
+    def parse_card(self, card, base_url):
+        """Extract title, link and card text from a listing card."""
+        parser = self.parser
+        title_elem = first_match(parser, card, ('a',), JOB_TITLE_CLASS)
+        if title_elem is None:
+            title_elem = first_match(parser, card, ('h2', 'h3', 'h4'))
+        if title_elem is None:
+            title_elem = first_match(parser, card, ('a',))
+        
+        if title_elem is None:
+            return None
+        
+        title = parser.get_text(title_elem)
+        
+        if parser.tag_name(title_elem) == 'a':
+            link = parser.get_attr(title_elem, 'href')
+        else:
+            link_elem = first_match(parser, card, ('a',))
+            link = parser.get_attr(link_elem, 'href') if link_elem is not None else ''
+        
+        if link and not link.startswith('http'):
+            link = urljoin(base_url, link)
+        
+        if not link:
+            return None
+        
+        date_text = parser.find_text(card, DATE_TEXT)
+        
+        return {
+            "title": title,
+            "link": link,
+            "card_text": parser.get_text(card, separator=' '),
+            "posting_date": date_text.strip() if date_text else "",
+        }
+    
+    def build_job_data(self, card_info, description, base_url):
+        """Build the job data dict from parsed card info and its description."""
+        job_data, task = self.build_listing(card_info, description, base_url)
+        return {**job_data, **extract_listings([task])[0]}
+    
+    def build_listing(self, card_info, description, base_url):
+        """Fields read from the card; returns (job data, (title, description)) for extract_listings."""
+        title = card_info['title']
+        card_text = card_info['card_text']
+        if not description:
+            description = card_text
+        
+        job_data = {
+            "title": title,
+            "organization": self.extract_organization(base_url),
+            "apply_link": card_info['link'],
+            "locations": self.extract_locations(card_text),
+            "posting_date": card_info['posting_date'],
+            "source_domain": urlparse(base_url).netloc,
+            "description": description,
+        }
+        return job_data, (title, description)
+    
     def extract_job_details(self, card, base_url):
         """Extract job details and return data dict."""
         try:
-            title_elem = (
-                card.find('a', class_=re.compile(r'job[-_]?title', re.I)) or
-                card.find(['h2', 'h3', 'h4']) or
-                card.find('a')
-            )
-            
-            if not title_elem:
-                return None
-            
-            title = title_elem.get_text(strip=True)
-            
-            if title_elem.name == 'a':
-                link = title_elem.get('href', '')
-            else:
-                link_elem = card.find('a')
-                link = link_elem.get('href', '') if link_elem else ''
-            
-            if link and not link.startswith('http'):
-                link = urljoin(base_url, link)
-            
-            if not link:
+            card_info = self.parse_card(card, base_url)
+            if not card_info:
                 return None
             
-            card_text = card.get_text(separator=' ', strip=True)
-            description = self.fetch_job_description(link)
-            if not description:
-                description = card_text
-            
-            locations = self.extract_locations(card_text)
-            work_format = self.determine_work_format(description)
-            skills = self.extract_skills(description)
-            sectors = self.identify_sectors(description)
-            job_type = self.determine_job_type(title, description)
-            
-            date_elem = card.find(text=re.compile(r'\d{1,2}/\d{1,2}/\d{2,4}'))
-            posting_date = date_elem.strip() if date_elem else ""
-            
-            return {
-                "title": title,
-                "job_type": job_type,
-                "organization": self.extract_organization(base_url),
-                "apply_link": link,
-                "locations": locations,
-                "work_format": work_format,
-                "sectors": sectors,
-                "technical_skills": skills["technical"],
-                "soft_skills": skills["soft"],
-                "posting_date": posting_date,
-                "source_domain": urlparse(base_url).netloc,
-            }
+            description = self.fetch_job_description(card_info['link'])
+            return self.build_job_data(card_info, description, base_url)
             
         except Exception as e:
             print(f"Error parsing job: {e}")
             return None
     
-    def find_job_listings(self, soup, base_url):
-        """Find job listing elements."""
-        for pattern in self.job_listing_patterns:
-            cards = soup.find_all(
-                pattern['tag'],
-                class_=re.compile(pattern['class_pattern'], re.I)
+    def iter_job_details(self, cards, base_url):
+        """Yield job data dicts for listing cards, fetching detail pages concurrently in async mode."""
+        card_infos = []
+        for card in cards:
+            try:
+                card_info = self.parse_card(card, base_url)
+            except Exception as e:
+                print(f"Error parsing job: {e}")
+                continue
+            if card_info:
+                card_infos.append(card_info)
+        
+        links = [info['link'] for info in card_infos]
+        if self.async_fetch:
+            pages = self.fetcher.fetch_all(links)
+        else:
+            pages = {link: self.fetch_detail_page(link) for link in dict.fromkeys(links)}
+        
+        # Detail pages unchanged since the last run (304 or same digest) are only
+        # skipped once we know the job is already stored and open; a closed job listed again is re-saved
+        unchanged_links = [link for link, page in pages.items() if page and not page.changed]
+        stored_links = set()
+        if unchanged_links:
+            stored_links = set(
+                JobListing.objects.filter(apply_link__in=unchanged_links, closed=False)
+                .values_list('apply_link', flat=True)
             )
+            print(f"  Skipping {len(stored_links)} unchanged detail pages")
+        
+        def batches():
+            jobs, tasks = [], []
+            for card_info in card_infos:
+                link = card_info['link']
+                if link in stored_links:
+                    continue
+                
+                try:
+                    page = pages.get(link)
+                    description = self.parse_job_description(page.text) if page else ""
+                    job_data, task = self.build_listing(card_info, description, base_url)
+                except Exception as e:
+                    print(f"Error parsing job: {e}")
+                    continue
+                jobs.append(job_data)
+                tasks.append(task)
+                if len(jobs) >= self.batch_size:
+                    yield jobs, tasks
+                    jobs, tasks = [], []
+            if jobs:
+                yield jobs, tasks
+        
+        # Skill, sector and job type matching runs in the extraction pool, one batch at a time
+        for jobs, results in extract_batches(extract_listings, batches()):
+            for job_data, extracted in zip(jobs, results):
+                yield {**job_data, **extracted}
+    
+    def find_job_listings(self, doc, base_url):
+        """Find job listing elements."""
+        parser = self.parser
+        matches = [[] for _ in self.job_listing_patterns]
+        job_links = []
+        
+        for el in parser.iter_elements(doc):
+            tag = parser.tag_name(el)
+            
+            matchers = self.listing_matchers.get(tag)
+            if matchers:
+                classes = parser.class_string(el)
+                if classes:
+                    for index, regex in matchers:
+                        if regex.search(classes):
+                            matches[index].append(el)
+            
+            if tag == 'a' and JOB_LINK_HREF.search(parser.get_attr(el, 'href')):
+                job_links.append(el)
+        
+        # Earlier patterns win, exactly as if each had been searched in turn
+        for cards in matches:
             if cards:
                 print(f"  Found {len(cards)} listings")
                 return cards
         
-        job_links = soup.find_all('a', href=re.compile(r'(job|career|position)', re.I))
-        filtered = [link for link in job_links if len(link.get_text(strip=True)) > 10]
+        filtered = [link for link in job_links if len(parser.get_text(link)) > 10]
         
         if filtered:
             print(f"  Found {len(filtered)} job links")
@@ -262,58 +416,65 @@ class UniversalJobScraper:
         
         return []
     
+    def save_jobs(self, jobs):
+        """Upsert a batch of scraped jobs; a job seen again on a listing is re-opened."""
+        return upsert_jobs(
+            [dict(job_data, closed=job_data.get('closed', False)) for job_data in jobs],
+            batch_size=self.batch_size,
+        )
+    
     def save_or_update_job(self, job_data):
         """Save new job or update existing one."""
-        existing_job = JobListing.objects.filter(apply_link=job_data['apply_link']).first()
+        result = self.save_jobs([job_data])
         
-        if existing_job:
-            updated = False
-            if existing_job.closed != job_data.get('closed', False):
-                existing_job.closed = job_data.get('closed', False)
-                updated = True
-            
-            if updated:
-                existing_job.save()
-                return 'updated'
+        if result['created']:
+            return 'created'
+        if result['updated']:
+            return 'updated'
+        if result['unchanged']:
             return 'unchanged'
-        else:
-            serializer = JobListingCreateSerializer(data=job_data)
-            if serializer.is_valid():
-                serializer.save()
-                return 'created'
-            else:
-                print(f"Validation error: {serializer.errors}")
-                return 'error'
+        return 'error'
     
     def scrape_site(self, url, log=None):
         """Scrape a single site."""
         print(f"\nScraping: {url}")
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=15)
+            # The listing is only cached once its jobs are saved, so a failed run is retried in full
+            response = self.fetch_page(url, defer=True)
             response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
             
-            cards = self.find_job_listings(soup, url)
+            if not response.changed:
+                print("  Listing page unchanged since last run, skipping")
+                return {'found': 0, 'created': 0, 'updated': 0, 'unchanged': True}
+            
+            doc = self.parser.parse(response.text)
+            
+            cards = self.find_job_listings(doc, url)
             
             if not cards:
                 print("  No listings found")
+                response.commit()
                 return {'found': 0, 'created': 0, 'updated': 0}
             
             stats = {'found': 0, 'created': 0, 'updated': 0}
+            pending = []
             
-            for i, card in enumerate(cards[:100]):
-                job_data = self.extract_job_details(card, url)
-                if job_data:
-                    stats['found'] += 1
-                    result = self.save_or_update_job(job_data)
-                    if result == 'created':
-                        stats['created'] += 1
-                    elif result == 'updated':
-                        stats['updated'] += 1
-                
-                if i > 0 and i % 10 == 0:
-                    time.sleep(1)
+            def flush():
+                result = self.save_jobs(pending)
+                stats['created'] += result['created']
+                stats['updated'] += result['updated']
+                pending.clear()
+            
+            for job_data in self.iter_job_details(cards[:100], url):
+                stats['found'] += 1
+                pending.append(job_data)
+                if len(pending) >= self.batch_size:
+                    flush()
+            
+            if pending:
+                flush()
+            response.commit()
             
             print(f"  ✅ Found: {stats['found']}, Created: {stats['created']}, Updated: {stats['updated']}")
             return stats
@@ -337,7 +498,6 @@ class UniversalJobScraper:
                 total_stats['found'] += stats.get('found', 0)
                 total_stats['created'] += stats.get('created', 0)
                 total_stats['updated'] += stats.get('updated', 0)
-                time.sleep(2)
             
             log.status = 'completed'
             log.jobs_found = total_stats['found']
@@ -346,6 +506,16 @@ class UniversalJobScraper:
             log.completed_at = datetime.now()
             log.save()
             
+            refresh_distance_engine()
+            refresh_statistics_snapshots()
+            
+            http_stats = self.http.stats.as_dict()
+            print(
+                f"\nHTTP: {http_stats['requests']} requests, "
+                f"{http_stats['connections_opened']} connections opened, "
+                f"{http_stats['connections_reused']} reused, {http_stats['retries']} retries"
+            )
+            
             return total_stats
             
         except Exception as e:
@@ -353,4 +523,21 @@ class UniversalJobScraper:
             log.error_message = str(e)
             log.completed_at = datetime.now()
             log.save()
-            raise
\ No newline at end of file
+            raise
+
+
+def extract_listings(tasks):
+    """Job type, work format, sectors and skills for (title, description) tasks; runs in extraction workers."""
+    results = []
+    for title, description in tasks:
+        hits = analyze_text(description)
+        matched_job_types = analyze_text(title).get('job_type', []) + hits.get('job_type', [])
+        
+        results.append({
+            "job_type": pick_job_type(matched_job_types),
+            "work_format": hits.get('work_format') or ["onsite"],
+            "sectors": hits.get('sector') or ["General"],
+            "technical_skills": hits["technical"],
+            "soft_skills": hits["soft"],
+        })
+    return results
@@ -0,0 +1,16 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F
+
+
+SEARCH_CONFIG = 'english'
+
+
+def search_jobs(queryset, text):
+    """Full-text match against the stored search_vector, best ranked first (id breaks ties for stable pages)."""
+    query = SearchQuery(text, search_type='websearch', config=SEARCH_CONFIG)
+    return (
+        queryset
+        .filter(search_vector=query)
+        .annotate(rank=SearchRank(F('search_vector'), query))
+        .order_by('-rank', '-date_scraped', '-id')
+    )
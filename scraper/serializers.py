@@ -2,10 +2,33 @@ from rest_framework import serializers
 from .models import JobListing, EmailSubscriber, ScrapingLog
 
 
+# Columns /api/jobs/ lists by default; ?fields= can pick any of JOB_FIELDS instead
+JOB_LIST_FIELDS = [
+    'id', 'title', 'job_type', 'organization', 'locations', 'work_format',
+    'sectors', 'apply_link', 'closed', 'date_scraped',
+]
+JOB_FIELDS = [field.name for field in JobListing._meta.concrete_fields if field.name != 'search_vector']
+
+
+def job_list_fields(fields_param):
+    """Parse a ?fields= value; returns (fields, unknown names)."""
+    if not fields_param:
+        return list(JOB_LIST_FIELDS), []
+    
+    requested = list(dict.fromkeys(name.strip() for name in fields_param.split(',') if name.strip()))
+    unknown = [name for name in requested if name not in JOB_FIELDS]
+    return requested, unknown
+
+
+def serialize_job_rows(rows, fields):
+    """Read-only list fast path: values() rows trimmed to `fields`; the JSON renderer encodes dates."""
+    return [{field: row[field] for field in fields} for row in rows]
+
+
 class JobListingSerializer(serializers.ModelSerializer):
     class Meta:
         model = JobListing
-        fields = '__all__'
+        exclude = ['search_vector']
         read_only_fields = ['date_scraped', 'date_updated']
 
 
@@ -18,7 +41,7 @@ class JobListingCreateSerializer(serializers.ModelSerializer):
             'locations', 'work_format', 'technical_skills', 'soft_skills',
             'sectors', 'apply_link', 'source_domain', 'closed',
             'sponsorship_required', 'posting_date', 'zip_codes',
-            'latitude', 'longitude'
+            'latitude', 'longitude', 'location_points', 'description'
         ]
 
 
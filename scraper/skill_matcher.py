@@ -0,0 +1,123 @@
+import re
+from collections import deque
+
+
+# Words, with + and # kept so "c++" and "c#" stay whole; any other symbol is its own token
+TOKEN_RE = re.compile(r"[A-Za-z0-9+#]+|[^\sA-Za-z0-9+#]")
+
+# Short keywords that are ordinary English words in lower case only match in this casing
+CASE_SENSITIVE_KEYWORDS = {
+    "it": "IT",
+    "ai": "AI",
+    "r": "R",
+    "go": "Go",
+}
+
+_EXACT = "\x00"
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text)
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over word tokens: whole-word hits for every keyword in one pass"""
+
+    def __init__(self, entries=()):
+        self._goto = [{}]
+        self._fail = [0]
+        self._outputs = [[]]
+        self._payloads = []
+        self._exact_tokens = set()
+        self._built = False
+
+        for keyword, payload in entries:
+            self.add(keyword, payload)
+        self.build()
+
+    def add(self, keyword, payload):
+        """Register `keyword`; `payload` is reported when it matches."""
+        exact = CASE_SENSITIVE_KEYWORDS.get(keyword.lower())
+        if exact:
+            self._exact_tokens.add(exact)
+            tokens = [_EXACT + exact]
+        else:
+            tokens = [token.lower() for token in tokenize(keyword)]
+
+        if not tokens:
+            return
+
+        state = 0
+        for token in tokens:
+            next_state = self._goto[state].get(token)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+                self._goto[state][token] = next_state
+            state = next_state
+
+        self._outputs[state].append(len(self._payloads))
+        self._payloads.append(payload)
+        self._built = False
+
+    def build(self):
+        """Compute failure links so matching never backtracks over the text."""
+        queue = deque(self._goto[0].values())
+        for state in queue:
+            self._fail[state] = 0
+
+        while queue:
+            state = queue.popleft()
+            for token, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(token, 0)
+                self._outputs[next_state].extend(self._outputs[self._fail[next_state]])
+
+        self._built = True
+
+    def find(self, text):
+        """Return the payloads of every keyword in `text`, once each, in registration order."""
+        if not self._built:
+            self.build()
+
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        exact_tokens = self._exact_tokens
+
+        hits = set()
+        state = 0
+        for token in TOKEN_RE.findall(text):
+            token = _EXACT + token if token in exact_tokens else token.lower()
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            if outputs[state]:
+                hits.update(outputs[state])
+
+        return [self._payloads[index] for index in sorted(hits)]
+
+
+def group_hits(hits):
+    """Fold (kind, label, display) payloads into technical/soft skill lists and per-kind labels."""
+    grouped = {'technical': {}, 'soft': []}
+
+    for kind, label, display in hits:
+        if kind == 'technical':
+            skills = grouped['technical'].setdefault(label, [])
+            if display not in skills:
+                skills.append(display)
+        elif kind == 'soft':
+            if display not in grouped['soft']:
+                grouped['soft'].append(display)
+        else:
+            labels = grouped.setdefault(kind, [])
+            if label not in labels:
+                labels.append(label)
+
+    return grouped
@@ -0,0 +1,226 @@
+import json
+from django.db import connections
+from django.db.models import BooleanField, Q
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+from .geocoder import normalize_state
+
+
+# Technical skill categories map to lists; anything else is skipped instead of breaking jsonb_each
+# (braces are doubled because the queries go through str.format)
+SKILLS_OBJECT = "CASE WHEN jsonb_typeof(jobs.technical_skills) = 'object' THEN jobs.technical_skills ELSE '{{}}'::jsonb END"
+
+JOB_TYPE_SQL = """
+WITH jobs AS ({jobs})
+SELECT
+    jobs.job_type,
+    COUNT(*),
+    SUM(
+        COALESCE(cardinality(jobs.soft_skills), 0)
+        + (
+            SELECT COALESCE(SUM(jsonb_array_length(skills.value)), 0)
+            FROM jsonb_each(""" + SKILLS_OBJECT + """) AS skills
+            WHERE jsonb_typeof(skills.value) = 'array'
+        )
+    )
+FROM jobs
+GROUP BY jobs.job_type
+"""
+
+COUNTS_SQL = """
+WITH jobs AS ({jobs})
+SELECT 'sector', value, COUNT(*) FROM jobs, unnest(jobs.sectors) AS value GROUP BY value
+UNION ALL
+SELECT 'soft', value, COUNT(*) FROM jobs, unnest(jobs.soft_skills) AS value GROUP BY value
+UNION ALL
+SELECT 'format', value, COUNT(*) FROM jobs, unnest(jobs.work_format) AS value GROUP BY value
+UNION ALL
+SELECT 'technical', value, COUNT(*)
+FROM jobs,
+    jsonb_each(""" + SKILLS_OBJECT + """) AS category,
+    jsonb_array_elements_text(
+        CASE WHEN jsonb_typeof(category.value) = 'array' THEN category.value ELSE '[]'::jsonb END
+    ) AS value
+GROUP BY value
+"""
+
+
+def jobs_subquery(queryset):
+    """Compile the filtered jobs down to the columns the statistics read."""
+    query = (
+        queryset.order_by()
+        .values('job_type', 'sectors', 'soft_skills', 'work_format', 'technical_skills')
+        .query
+    )
+    return query.get_compiler(using=queryset.db).as_sql()
+
+
+def top(counts, limit):
+    return sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+
+def calculate_statistics(jobs_queryset):
+    """Calculate statistics for a set of jobs with two aggregate queries."""
+    jobs_sql, params = jobs_subquery(jobs_queryset)
+
+    with connections[jobs_queryset.db].cursor() as cursor:
+        cursor.execute(JOB_TYPE_SQL.format(jobs=jobs_sql), params)
+        job_type_rows = cursor.fetchall()
+
+        total_jobs = sum(count for _, count, _ in job_type_rows)
+        if total_jobs == 0:
+            return None
+
+        cursor.execute(COUNTS_SQL.format(jobs=jobs_sql), params)
+        count_rows = cursor.fetchall()
+
+    counts = {'sector': {}, 'soft': {}, 'format': {}, 'technical': {}}
+    for kind, value, count in count_rows:
+        counts[kind][value] = count
+
+    # SUM over integers comes back as numeric (Decimal)
+    total_skills = sum(float(skills or 0) for _, _, skills in job_type_rows)
+
+    return {
+        'total_jobs': total_jobs,
+        'job_type_stats': {job_type: count for job_type, count, _ in job_type_rows},
+        'top_sectors': top(counts['sector'], 5),
+        'top_technical_skills': top(counts['technical'], 10),
+        'top_soft_skills': top(counts['soft'], 10),
+        'work_format_stats': counts['format'],
+        'avg_skills_per_job': round(total_skills / total_jobs, 1),
+    }
+
+
+def has_technical_skill(value):
+    """Condition for a technical skill in any category; @? can use the GIN index on technical_skills."""
+    path = f"$.*[*] ? (@ == {json.dumps(value)})"
+    return RawSQL('"scraper_joblisting"."technical_skills" @? %s::jsonpath', (path,), output_field=BooleanField())
+
+
+def filter_jobs(queryset, dimension, value):
+    """Apply one index-backed filter: job_type, sector, work_format, state or skill."""
+    from .models import LocationsText
+
+    if dimension == 'job_type':
+        return queryset.filter(job_type=value)
+    if dimension == 'sector':
+        return queryset.filter(sectors__contains=[value])
+    if dimension == 'work_format':
+        return queryset.filter(work_format__contains=[value])
+    if dimension == 'state':
+        state = normalize_state(value)
+        if state:
+            return queryset.filter(states__contains=[state])
+        # Anything else is matched as text through the trigram index
+        return queryset.alias(locations_text=LocationsText('locations')).filter(
+            locations_text__contains=value.lower()
+        )
+    if dimension == 'skill':
+        return queryset.filter(Q(soft_skills__contains=[value]) | Q(has_technical_skill(value)))
+    return queryset
+
+
+def snapshot_targets(rows):
+    """Every (dimension, value) snapshot a set of (job_type, sectors, work_format, states) rows appears in."""
+    targets = {('', '')}
+    for job_type, sectors, work_formats, states in rows:
+        targets.add(('job_type', job_type))
+        targets.update(('sector', sector) for sector in sectors)
+        targets.update(('work_format', work_format) for work_format in work_formats)
+        targets.update(('state', state) for state in states)
+    return targets
+
+
+SNAPSHOT_COLUMNS = ('job_type', 'sectors', 'work_format', 'states')
+
+
+def mark_snapshots_dirty(rows):
+    """Flag the snapshots that (job_type, sectors, work_format, states) rows are about to leave."""
+    from .models import StatisticsSnapshot
+
+    by_dimension = {}
+    for dimension, value in snapshot_targets(rows):
+        by_dimension.setdefault(dimension, set()).add(value)
+
+    condition = Q()
+    for dimension, values in by_dimension.items():
+        condition |= Q(dimension=dimension, value__in=values)
+    return StatisticsSnapshot.objects.filter(condition, dirty=False).update(dirty=True)
+
+
+def store_snapshot(dimension, value, computed_at):
+    from .models import JobListing, StatisticsSnapshot
+
+    stats = calculate_statistics(filter_jobs(JobListing.objects.filter(closed=False), dimension, value))
+    snapshot, _ = StatisticsSnapshot.objects.update_or_create(
+        dimension=dimension,
+        value=value,
+        defaults={'stats': stats, 'computed_at': computed_at},
+    )
+    return snapshot
+
+
+def refresh_statistics_snapshots(full=False):
+    """Recompute the snapshots touched by jobs saved since the last refresh (or every snapshot)."""
+    from .models import JobListing, StatisticsSnapshot
+
+    started = timezone.now()
+    columns = SNAPSHOT_COLUMNS
+    last_refresh = (
+        StatisticsSnapshot.objects.filter(dimension='', value='').values_list('computed_at', flat=True).first()
+    )
+
+    if full or last_refresh is None:
+        targets = snapshot_targets(JobListing.objects.filter(closed=False).values_list(*columns).iterator())
+        # Values no longer used by any open job are dropped
+        stale = set(StatisticsSnapshot.objects.values_list('dimension', 'value')) - targets
+        for dimension, value in stale:
+            StatisticsSnapshot.objects.filter(dimension=dimension, value=value).delete()
+    else:
+        # Closed jobs count as changes too, so their old snapshots are corrected
+        changed = list(JobListing.objects.filter(date_updated__gte=last_refresh).values_list(*columns))
+        # Snapshots a job moved out of (its old sector, job type...) were flagged when it was written
+        dirty = {
+            snapshot_id: (dimension, value)
+            for snapshot_id, dimension, value in
+            StatisticsSnapshot.objects.filter(dirty=True).values_list('id', 'dimension', 'value')
+        }
+        if not changed and not dirty:
+            return 0
+        targets = snapshot_targets(changed) | set(dirty.values())
+        # Cleared before recomputing, so a job moved while this runs flags its snapshot again
+        StatisticsSnapshot.objects.filter(id__in=list(dirty)).update(dirty=False)
+
+    for dimension, value in targets:
+        store_snapshot(dimension, value, started)
+
+    return len(targets)
+
+
+def snapshot_statistics(dimension='', value=''):
+    """Statistics for open jobs filtered on at most one dimension, from its snapshot when the refresh made one."""
+    from .models import JobListing, StatisticsSnapshot
+
+    snapshot = StatisticsSnapshot.objects.filter(dimension=dimension, value=value).first()
+    if snapshot is None:
+        # Only the refresh creates snapshots, so arbitrary query strings never add rows
+        return calculate_statistics(filter_jobs(JobListing.objects.filter(closed=False), dimension, value))
+    return snapshot.stats
+
+
+def snapshot_filter(filters):
+    """Return the (dimension, value) snapshot for a job_list filter dict, or None to aggregate live."""
+    filters = {dimension: value for dimension, value in filters.items() if value}
+    if not filters:
+        return ('', '')
+    if len(filters) > 1:
+        return None
+
+    dimension, value = next(iter(filters.items()))
+    if dimension == 'state':
+        # State names and codes share a snapshot; other text is matched live
+        value = normalize_state(value)
+        if value is None:
+            return None
+    return (dimension, value)
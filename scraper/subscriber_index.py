@@ -0,0 +1,221 @@
+import math
+import threading
+from django.utils import timezone
+from .distance_engine import job_points, nearest_distances
+from .geo import bounding_box, haversine_miles, postal_code_coords
+from .models import EmailSubscriber
+
+
+# Radius preferences wider than this many cells are distance-checked against every job instead
+MAX_CELLS_PER_SUBSCRIBER = 400
+
+_EMPTY = frozenset()
+
+
+class SubscriberProfile:
+    """An active subscriber's preferences, prepared once for fast matching"""
+
+    def __init__(self, subscriber, coords=None):
+        self.id = subscriber.id
+        self.email = subscriber.email
+        self.job_types = set(subscriber.job_types)
+        self.sectors = set(subscriber.sectors)
+        self.max_distance_miles = subscriber.max_distance_miles if subscriber.zip_code else None
+        self.coords = coords
+
+    @property
+    def has_radius(self):
+        # An unknown ZIP never filters a job out
+        return bool(self.max_distance_miles and self.coords)
+
+    def within_radius(self, job, points=None):
+        """True if any of the job's locations is inside the radius (or either side has no location)."""
+        points = job_points(job) if points is None else points
+        if not (self.has_radius and points):
+            return True
+        distance = min(haversine_miles(self.coords[0], self.coords[1], lat, lon) for lat, lon in points)
+        return distance <= self.max_distance_miles
+
+    def matches(self, job):
+        if self.job_types and job.job_type not in self.job_types:
+            return False
+        if self.sectors and self.sectors.isdisjoint(job.sectors):
+            return False
+        return self.within_radius(job)
+
+
+class SubscriberIndex:
+    """Inverted index of active subscribers by job type, sector and map cell"""
+
+    def __init__(self, cell_degrees=1.0):
+        self.cell_degrees = cell_degrees
+        self.profiles = {}
+        self.by_job_type = {}
+        self.by_sector = {}
+        self.by_cell = {}
+        self.any_job_type = set()
+        self.any_sector = set()
+        self.anywhere = set()
+        self.wide_radius = set()
+        self.in_cells = set()
+        self.buckets = {}
+        self.synced_at = None
+        self.lock = threading.RLock()
+
+    @property
+    def loaded(self):
+        return self.synced_at is not None
+
+    def cell(self, lat, lon):
+        return (math.floor(lat / self.cell_degrees), math.floor(lon / self.cell_degrees))
+
+    def cells_for(self, profile):
+        """Return every grid cell the subscriber's radius overlaps, or None if there are too many."""
+        min_lat, max_lat, min_lon, max_lon = bounding_box(*profile.coords, profile.max_distance_miles)
+
+        low_lat, low_lon = self.cell(min_lat, min_lon)
+        high_lat, high_lon = self.cell(max_lat, max_lon)
+        if (high_lat - low_lat + 1) * (high_lon - low_lon + 1) > MAX_CELLS_PER_SUBSCRIBER:
+            return None
+
+        return [
+            (cell_lat, cell_lon)
+            for cell_lat in range(low_lat, high_lat + 1)
+            for cell_lon in range(low_lon, high_lon + 1)
+        ]
+
+    def add(self, profile):
+        """Index a subscriber profile under its job types, sectors and map cells."""
+        buckets = []
+
+        if profile.job_types:
+            buckets.extend(self.by_job_type.setdefault(t, set()) for t in profile.job_types)
+        else:
+            buckets.append(self.any_job_type)
+
+        if profile.sectors:
+            buckets.extend(self.by_sector.setdefault(s, set()) for s in profile.sectors)
+        else:
+            buckets.append(self.any_sector)
+
+        if profile.has_radius:
+            cells = self.cells_for(profile)
+            if cells is None:
+                buckets.append(self.wide_radius)
+            else:
+                buckets.append(self.in_cells)
+                buckets.extend(self.by_cell.setdefault(c, set()) for c in cells)
+        else:
+            buckets.append(self.anywhere)
+
+        with self.lock:
+            self.remove(profile.id)
+            for bucket in buckets:
+                bucket.add(profile.id)
+            self.profiles[profile.id] = profile
+            self.buckets[profile.id] = buckets
+
+    def remove(self, subscriber_id):
+        """Drop a subscriber from the index."""
+        with self.lock:
+            for bucket in self.buckets.pop(subscriber_id, ()):
+                bucket.discard(subscriber_id)
+            self.profiles.pop(subscriber_id, None)
+
+    def update(self, subscriber, coords=None):
+        """Re-index one subscriber after it was created, edited or deactivated."""
+        if not self.loaded:
+            return
+
+        if subscriber.is_active and coords is None and subscriber.zip_code and subscriber.max_distance_miles:
+            try:
+                coords = postal_code_coords([subscriber.zip_code]).get(subscriber.zip_code)
+            except Exception as e:
+                print(f"Could not geocode {subscriber.zip_code}: {e}")
+
+        with self.lock:
+            self.remove(subscriber.id)
+            if subscriber.is_active:
+                self.add(SubscriberProfile(subscriber, coords))
+
+    def refresh(self):
+        """Apply subscriber changes saved since the last refresh, including ones from other processes."""
+        started = timezone.now()
+
+        changed = EmailSubscriber.objects.all()
+        if self.loaded:
+            changed = changed.filter(updated_at__gte=self.synced_at)
+        changed = list(changed)
+
+        try:
+            coords = postal_code_coords(s.zip_code for s in changed if s.is_active and s.max_distance_miles)
+        except Exception as e:
+            print(f"Could not geocode subscriber ZIP codes: {e}")
+            coords = {}
+
+        # Deleted subscribers leave no updated_at behind, so compare ids
+        active_ids = set(EmailSubscriber.objects.filter(is_active=True).values_list('id', flat=True))
+
+        with self.lock:
+            for subscriber in changed:
+                self.remove(subscriber.id)
+                if subscriber.is_active:
+                    self.add(SubscriberProfile(subscriber, coords.get(subscriber.zip_code)))
+            for subscriber_id in set(self.profiles) - active_ids:
+                self.remove(subscriber_id)
+            self.synced_at = started
+
+        return self
+
+    def candidates(self, job):
+        """Subscribers whose job type, sector and map cell fit the job, before the exact radius check."""
+        by_type = self.by_job_type.get(job.job_type, _EMPTY) | self.any_job_type
+
+        by_sector = set(self.any_sector)
+        for sector in job.sectors:
+            by_sector |= self.by_sector.get(sector, _EMPTY)
+
+        by_location = self.anywhere | self.wide_radius
+        points = job_points(job)
+        if points:
+            for lat, lon in points:
+                by_location |= self.by_cell.get(self.cell(lat, lon), _EMPTY)
+        else:
+            # Jobs without coordinates are never filtered by distance
+            by_location |= self.in_cells
+
+        groups = sorted((by_type, by_sector, by_location), key=len)
+        return groups[0].intersection(*groups[1:])
+
+    def match(self, job):
+        """Return the profiles of every subscriber who should hear about `job`."""
+        with self.lock:
+            profiles = [self.profiles[i] for i in self.candidates(job)]
+
+        points = job_points(job)
+        matched = [p for p in profiles if not (p.has_radius and points)]
+        in_radius = [p for p in profiles if p.has_radius and points]
+
+        if in_radius:
+            # Nearest job location for every radius subscriber in one vectorized pass
+            point_lats, point_lons = zip(*points)
+            distances = nearest_distances(
+                [p.coords[0] for p in in_radius], [p.coords[1] for p in in_radius], point_lats, point_lons,
+            )
+            matched.extend(p for p, d in zip(in_radius, distances) if d <= p.max_distance_miles)
+
+        return matched
+
+
+_subscriber_index = None
+_subscriber_index_lock = threading.Lock()
+
+
+def get_subscriber_index():
+    """Return the process-wide subscriber index; it is only loaded once something refreshes it."""
+    global _subscriber_index
+
+    with _subscriber_index_lock:
+        if _subscriber_index is None:
+            _subscriber_index = SubscriberIndex()
+        return _subscriber_index
@@ -3,6 +3,8 @@ from .scraper_engine import UniversalJobScraper
 from datetime import timedelta
 from django.utils import timezone
 from .models import JobListing
+from .notifications import process_job_notifications
+from .statistics import refresh_statistics_snapshots
 
 
 @shared_task
@@ -34,4 +36,22 @@ def cleanup_old_jobs():
         date_updated__lt=cutoff_date
     ).delete()[0]
     
-    return f"Deleted {deleted_count} old jobs"
\ No newline at end of file
+    return f"Deleted {deleted_count} old jobs"
+
+@shared_task
+def send_job_notifications():
+    """Email subscribers about jobs waiting in the notification outbox"""
+    stats = process_job_notifications()
+    
+    message = f"Sent {stats['emails']} emails about {stats['jobs']} jobs"
+    if stats['failed']:
+        message += f", {stats['failed']} jobs left for retry"
+    return message
+
+
+@shared_task
+def refresh_statistics():
+    """Recompute every statistics snapshot, catching edits made outside the scrapers"""
+    refreshed = refresh_statistics_snapshots(full=True)
+    
+    return f"Refreshed {refreshed} statistics snapshots"
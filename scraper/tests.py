@@ -1,5 +1,51 @@
-from django.test import TestCase
-from .models import JobListing, EmailSubscriber
+import io
+import json
+import math
+import random
+import tempfile
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from datetime import timedelta
+from django.core import mail
+from django.core.mail.backends import locmem
+from django.core.management import call_command
+from unittest import skipUnless
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.request import Request
+from .async_fetcher import AsyncFetcher
+from .extraction import REEXTRACT_FIELDS, extract_batches, get_extraction_pool, reextract_jobs
+from .http_cache import CachedResponse, HttpCache
+from .ingest import insert_jobs, upsert_jobs, validate_job_data
+from .distance_engine import DistanceEngine, nearest_distances
+from .geocoder import Gazetteer, geocode_jobs, location_key, location_states, merge_points
+from .geo import bounding_box, filter_within_radius, haversine_miles
+from .http_client import HttpClient
+from .rate_limiter import RateLimiter, TokenBucket, parse_retry_after
+from .models import JobListing, EmailSubscriber, GeocodeCache, JobNotification, StatisticsSnapshot, SyncWatermark
+from .notifications import build_digest, match_jobs, process_job_notifications
+from .pagination import JobCursorPagination, approximate_count
+from .scraper_engine import UniversalJobScraper
+from .search import search_jobs
+from .serializers import JOB_LIST_FIELDS, job_list_fields
+from .skill_matcher import KeywordMatcher
+from .statistics import (
+    COUNTS_SQL,
+    calculate_statistics,
+    filter_jobs,
+    jobs_subquery,
+    refresh_statistics_snapshots,
+    snapshot_filter,
+    snapshot_statistics,
+    snapshot_targets,
+)
+from .subscriber_index import SubscriberIndex, SubscriberProfile
+from . import usajobs_scraper
+from .usajobs_scraper import USAJobsScraper, date_posted_days, extract_postings, iter_search_result
+from .zip_centroids import ZipCentroidTable, read_geonames
 
 class JobListingTestCase(TestCase):
     def setUp(self):
@@ -14,4 +60,1099 @@ class JobListingTestCase(TestCase):
         """Test that a job can be created"""
         job = JobListing.objects.get(title="Software Engineering Intern")
         self.assertEqual(job.job_type, "internship")
-        self.assertEqual(job.organization, "Test Company")
\ No newline at end of file
+        self.assertEqual(job.organization, "Test Company")
+
+
+class UpsertJobsTestCase(TestCase):
+    def job(self, link, **overrides):
+        job_data = {
+            "title": "Policy Analyst",
+            "job_type": "job",
+            "organization": "Department of State",
+            "apply_link": link,
+            "locations": ["Washington, DC"],
+            "work_format": ["onsite"],
+            "sectors": ["Government"],
+            "technical_skills": {},
+            "soft_skills": [],
+            "posting_date": "2025-01-01",
+            "source_domain": "usajobs.gov",
+        }
+        job_data.update(overrides)
+        return job_data
+    
+    def test_counts_created_updated_unchanged(self):
+        """Test that a re-run reports accurate counts and updates changed rows"""
+        first = upsert_jobs([self.job("https://usajobs.gov/1"), self.job("https://usajobs.gov/2")], notify=False)
+        self.assertEqual((first['created'], first['updated'], first['unchanged']), (2, 0, 0))
+        self.assertEqual(len(first['created_ids']), 2)
+        
+        second = upsert_jobs([
+            self.job("https://usajobs.gov/1"),
+            self.job("https://usajobs.gov/2", title="Senior Policy Analyst"),
+            self.job("https://usajobs.gov/3"),
+        ], batch_size=2, notify=False)
+        self.assertEqual((second['created'], second['updated'], second['unchanged']), (1, 1, 1))
+        self.assertEqual(JobListing.objects.get(apply_link="https://usajobs.gov/2").title, "Senior Policy Analyst")
+        self.assertEqual(JobListing.objects.filter(apply_link__startswith="https://usajobs.gov/").count(), 3)
+    
+    def test_concurrent_insert_counts_as_update(self):
+        """Test that a link inserted by another writer after the SELECT is reported as updated, not created"""
+        JobListing.objects.create(title="Analyst", organization="Org", apply_link="https://usajobs.gov/6")
+        rows = insert_jobs(
+            [JobListing(**self.job("https://usajobs.gov/6", title="Renamed")),
+             JobListing(**self.job("https://usajobs.gov/7"))],
+            ['title', 'date_updated'],
+        )
+        self.assertEqual([inserted for _, _, inserted in rows], [False, True])
+        self.assertEqual(JobListing.objects.get(apply_link="https://usajobs.gov/6").title, "Renamed")
+    
+    def test_invalid_jobs_are_skipped(self):
+        """Test that rows failing validation are counted as errors and not saved"""
+        result = upsert_jobs([
+            self.job("https://usajobs.gov/4"),
+            self.job("https://usajobs.gov/5", job_type="contract"),
+            self.job("not a url"),
+        ], notify=False)
+        self.assertEqual((result['created'], result['errors']), (1, 2))
+
+
+class UnchangedDetailScraper(UniversalJobScraper):
+    """Takes card dicts as-is and reports every detail page as unchanged since the last run"""
+    
+    def parse_card(self, card, base_url):
+        return card
+    
+    def fetch_detail_page(self, url, timeout=None):
+        return CachedResponse(url, 200, '<div class="description">Policy research</div>', changed=False)
+
+
+class UnchangedDetailPagesTestCase(TestCase):
+    def test_closed_job_listed_again_is_saved(self):
+        """Test that unchanged detail pages are skipped for open jobs but a relisted closed job is re-opened"""
+        JobListing.objects.create(title="Open", organization="Org", apply_link="https://example.com/d1")
+        JobListing.objects.create(title="Closed", organization="Org", apply_link="https://example.com/d2", closed=True)
+        cards = [
+            {"title": title, "link": link, "card_text": title, "posting_date": ""}
+            for title, link in (("Open", "https://example.com/d1"), ("Closed", "https://example.com/d2"))
+        ]
+        
+        scraper = UnchangedDetailScraper(async_fetch=False, use_cache=False)
+        jobs = list(scraper.iter_job_details(cards, "https://example.com/"))
+        self.assertEqual([job["apply_link"] for job in jobs], ["https://example.com/d2"])
+        
+        scraper.save_jobs(jobs)
+        self.assertFalse(JobListing.objects.get(apply_link="https://example.com/d2").closed)
+
+
+class JobNotificationTestCase(TestCase):
+    def test_outbox_digest(self):
+        """Test that new jobs are queued in the outbox and sent as one digest per subscriber"""
+        EmailSubscriber.objects.create(email="gov@example.com", sectors=["Government"])
+        EmailSubscriber.objects.create(email="interns@example.com", job_types=["internship"])
+        
+        for i in range(2):
+            JobListing.objects.create(
+                title=f"Analyst {i}",
+                organization="Department of State",
+                apply_link=f"https://example.com/outbox/{i}",
+                sectors=["Government"],
+            )
+        self.assertEqual(JobNotification.objects.filter(processed_at__isnull=True).count(), 2)
+        
+        stats = process_job_notifications()
+        self.assertEqual(stats, {'jobs': 2, 'emails': 1, 'failed': 0})
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["gov@example.com"])
+        self.assertEqual(mail.outbox[0].subject, "2 new job alerts")
+        self.assertFalse(JobNotification.objects.filter(processed_at__isnull=True).exists())
+    
+    def test_failed_digest_is_retried(self):
+        """Test that events whose email could not be sent stay pending and go out on a later run"""
+        EmailSubscriber.objects.create(email="gov@example.com", sectors=["Government"])
+        EmailSubscriber.objects.create(email="interns@example.com", job_types=["internship"])
+        JobListing.objects.create(title="Analyst", organization="Department of State",
+                                  apply_link="https://example.com/outbox/gov", sectors=["Government"])
+        JobListing.objects.create(title="Intern", organization="Department of State", job_type="internship",
+                                  apply_link="https://example.com/outbox/intern")
+        
+        with override_settings(EMAIL_BACKEND='scraper.tests.RejectingEmailBackend'):
+            stats = process_job_notifications()
+        self.assertEqual(stats, {'jobs': 1, 'emails': 1, 'failed': 1})
+        pending = JobNotification.objects.get(processed_at__isnull=True)
+        self.assertEqual(pending.job.apply_link, "https://example.com/outbox/gov")
+        self.assertIsNone(pending.claimed_at)
+        
+        stats = process_job_notifications()
+        self.assertEqual(stats, {'jobs': 1, 'emails': 1, 'failed': 0})
+        self.assertEqual(mail.outbox[-1].to, ["gov@example.com"])
+    
+    def test_retry_skips_delivered_subscribers_and_gives_up(self):
+        """Test that a retry only emails the failed subscriber and a bad address is dropped after the cap"""
+        EmailSubscriber.objects.create(email="gov@example.com", sectors=["Government"])
+        EmailSubscriber.objects.create(email="all@example.com")
+        JobListing.objects.create(title="Analyst", organization="Department of State",
+                                  apply_link="https://example.com/outbox/shared", sectors=["Government"])
+        
+        with self.settings(EMAIL_BACKEND='scraper.tests.RejectingEmailBackend', SCRAPER_NOTIFICATION_MAX_ATTEMPTS=2):
+            self.assertEqual(process_job_notifications(), {'jobs': 0, 'emails': 1, 'failed': 1})
+            self.assertEqual(JobNotification.objects.get().delivered_to, ["all@example.com"])
+            
+            self.assertEqual(process_job_notifications(), {'jobs': 0, 'emails': 0, 'failed': 1})
+            self.assertEqual([message.to for message in mail.outbox], [["all@example.com"]])
+            
+            event = JobNotification.objects.get()
+            self.assertEqual(event.attempts, 2)
+            self.assertIsNotNone(event.failed_at)
+            self.assertIn("gov@example.com", event.last_error)
+            self.assertEqual(process_job_notifications(), {'jobs': 0, 'emails': 0, 'failed': 0})
+
+
+class RejectingEmailBackend(locmem.EmailBackend):
+    """Test backend that refuses mail to gov@example.com"""
+    def send_messages(self, messages):
+        if any("gov@example.com" in message.to for message in messages):
+            raise ConnectionRefusedError("mail server unavailable")
+        return super().send_messages(messages)
+
+
+class NotificationMatchingTestCase(SimpleTestCase):
+    def test_match_jobs(self):
+        """Test that matching applies job type, sector and distance preferences"""
+        near = JobListing(title="A", organization="Org", job_type="job", sectors=["Technology"],
+                          latitude=38.9, longitude=-77.0, apply_link="https://example.com/a")
+        far = JobListing(title="B", organization="Org", job_type="job", sectors=["Technology"],
+                         latitude=34.05, longitude=-118.24, apply_link="https://example.com/b")
+        intern = JobListing(title="C", organization="Org", job_type="internship", sectors=[],
+                            apply_link="https://example.com/c")
+        
+        index = SubscriberIndex()
+        index.add(SubscriberProfile(
+            EmailSubscriber(id=1, email="dc@example.com", zip_code="20001", max_distance_miles=50,
+                            sectors=["Technology"]),
+            coords=(38.91, -77.02),
+        ))
+        index.add(SubscriberProfile(EmailSubscriber(id=2, email="intern@example.com", job_types=["internship"])))
+        
+        matches = match_jobs([near, far, intern], index)
+        self.assertEqual(matches, {"dc@example.com": [near], "intern@example.com": [intern]})
+        self.assertEqual(build_digest("dc@example.com", [near])[0], "New Job: Org - A")
+    
+    def test_high_latitude_radius(self):
+        """Test that a job just inside the radius is matched where longitude degrees are short"""
+        job = JobListing(id=1, title="A", organization="Org", job_type="job", sectors=[],
+                         latitude=60.0, longitude=10.0005, apply_link="https://example.com/north")
+        self.assertLess(haversine_miles(60.0, 7.107, 60.0, 10.0005), 100)
+        
+        index = SubscriberIndex()
+        index.add(SubscriberProfile(
+            EmailSubscriber(id=1, email="north@example.com", zip_code="99701", max_distance_miles=100),
+            coords=(60.0, 7.107),
+        ))
+        self.assertEqual([profile.email for profile in index.match(job)], ["north@example.com"])
+    
+    def test_index_matches_linear_scan(self):
+        """Test that the inverted index returns exactly the subscribers a full scan would"""
+        rng = random.Random(7)
+        job_types = ["job", "internship", "fellowship"]
+        sectors = ["Government", "Technology", "Healthcare", "Education"]
+        
+        profiles = []
+        index = SubscriberIndex()
+        for i in range(300):
+            profile = SubscriberProfile(
+                EmailSubscriber(
+                    id=i,
+                    email=f"user{i}@example.com",
+                    job_types=rng.sample(job_types, rng.randint(0, 2)),
+                    sectors=rng.sample(sectors, rng.randint(0, 2)),
+                    zip_code="00000",
+                    max_distance_miles=rng.choice([None, 25, 100, 2000]),
+                ),
+                coords=(rng.uniform(25, 48), rng.uniform(-124, -67)),
+            )
+            profiles.append(profile)
+            index.add(profile)
+        
+        index.remove(0)
+        profiles = profiles[1:]
+        
+        for _ in range(100):
+            located = rng.random() < 0.8
+            job = JobListing(
+                job_type=rng.choice(job_types),
+                sectors=rng.sample(sectors, rng.randint(0, 2)),
+                latitude=rng.uniform(25, 48) if located else None,
+                longitude=rng.uniform(-124, -67) if located else None,
+            )
+            if located and rng.random() < 0.5:
+                job.location_points = [[job.latitude, job.longitude], [rng.uniform(25, 48), rng.uniform(-124, -67)]]
+            expected = {p.id for p in profiles if p.matches(job)}
+            self.assertEqual({p.id for p in index.match(job)}, expected)
+
+
+class LocalSearchTestCase(TestCase):
+    def test_filter_within_radius(self):
+        """Test that local search filters and orders by distance in SQL"""
+        for name, lat, lon in [("Arlington", 38.88, -77.10), ("Baltimore", 39.29, -76.61), ("Denver", 39.74, -104.99)]:
+            JobListing.objects.create(title=name, organization="Org", apply_link=f"https://example.com/{name}",
+                                      latitude=lat, longitude=lon)
+        JobListing.objects.create(title="Unknown", organization="Org", apply_link="https://example.com/unknown")
+        
+        jobs = list(filter_within_radius(JobListing.objects.all(), 38.90, -77.04, 50))
+        self.assertEqual([job.title for job in jobs], ["Arlington", "Baltimore"])
+        self.assertAlmostEqual(jobs[1].distance, haversine_miles(38.90, -77.04, 39.29, -76.61), places=3)
+
+
+class GeoTestCase(SimpleTestCase):
+    def test_bounding_box_contains_radius(self):
+        """Test that points on the search circle fall inside the bounding box"""
+        for lat, lon, miles in [(38.9, -77.0, 50), (64.8, -147.7, 300), (21.3, -157.8, 1000)]:
+            min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, miles)
+            for bearing in range(0, 360, 15):
+                # Walk `miles` along each bearing and check the endpoint is boxed
+                angle = miles / 3958.7613
+                b = math.radians(bearing)
+                lat1 = math.radians(lat)
+                lat2 = math.asin(math.sin(lat1) * math.cos(angle) + math.cos(lat1) * math.sin(angle) * math.cos(b))
+                lon2 = math.radians(lon) + math.atan2(
+                    math.sin(b) * math.sin(angle) * math.cos(lat1),
+                    math.cos(angle) - math.sin(lat1) * math.sin(lat2),
+                )
+                self.assertTrue(min_lat - 1e-9 <= math.degrees(lat2) <= max_lat + 1e-9)
+                self.assertTrue(min_lon - 1e-9 <= math.degrees(lon2) <= max_lon + 1e-9)
+        
+        self.assertEqual(bounding_box(89.5, 0, 100)[2:], (-180.0, 180.0))
+    
+    def test_distance_query_sql(self):
+        """Test that the distance annotation and ordering compile into the query"""
+        sql = str(filter_within_radius(JobListing.objects.all(), 38.9, -77.0, 25).query)
+        self.assertIn('"scraper_joblisting"."latitude" BETWEEN', sql)
+        self.assertIn('AS "distance"', sql)
+        self.assertIn('<= 25.0', sql)
+        self.assertIn('ORDER BY', sql)
+
+
+class ZipCentroidTestCase(SimpleTestCase):
+    def test_table_lookup(self):
+        """Test direct-indexed ZIP lookups, ZIP+4 input and unknown codes"""
+        table = ZipCentroidTable.from_rows([
+            ("20001", 38.91, -77.02),
+            ("00501", 40.81, -73.04),
+            ("00501", 40.83, -73.06),
+            ("bad", 1.0, 1.0),
+        ])
+        
+        self.assertEqual(table.count, 2)
+        self.assertEqual(table.lookup("20001-1234"), (38.91, -77.02))
+        latitude, longitude = table.lookup("00501")
+        self.assertAlmostEqual(latitude, 40.82)
+        self.assertAlmostEqual(longitude, -73.05)
+        self.assertIsNone(table.lookup("99999"))
+        self.assertIsNone(table.lookup("2000"))
+    
+    def test_read_geonames_formats(self):
+        """Test reading both the raw GeoNames dump and pgeocode's CSV copy"""
+        with tempfile.TemporaryDirectory() as tmp:
+            raw = Path(tmp) / "US.txt"
+            raw.write_text("US\t20001\tWashington\tDistrict of Columbia\tDC\t\t\t\t\t38.9122\t-77.0177\t4\n")
+            cached = Path(tmp) / "US.csv"
+            cached.write_text(
+                "country_code,postal_code,place_name,state_name,state_code,county_name,county_code,"
+                "community_name,community_code,latitude,longitude,accuracy\n"
+                "US,20001,Washington,District of Columbia,DC,,,,,38.9122,-77.0177,4\n"
+            )
+            
+            expected = [{'zip_code': '20001', 'latitude': 38.9122, 'longitude': -77.0177,
+                         'city': 'Washington', 'state': 'DC'}]
+            self.assertEqual(list(read_geonames(raw)), expected)
+            self.assertEqual(list(read_geonames(cached)), expected)
+
+
+class GeocoderTestCase(SimpleTestCase):
+    def test_location_key(self):
+        """Test that location strings normalize to shared cache keys"""
+        self.assertEqual(location_key("Washington, District of Columbia"), "washington|DC")
+        self.assertEqual(location_key("Washington,  DC"), "washington|DC")
+        self.assertEqual(location_key("St. Louis, MO"), "saint louis|MO")
+        self.assertEqual(location_key("Arlington, VA 22201"), "zip:22201")
+        self.assertIsNone(location_key("Remote"))
+        self.assertIsNone(location_key("Somewhere, Narnia"))
+        
+        states = location_states(["Nevada City, California", "Reno, NV", "Remote", "Arlington, VA 22201"])
+        self.assertEqual(states, {"CA", "NV", "VA"})
+    
+    def test_merge_points(self):
+        """Test that geocoded centroids near a kept point are treated as the same location"""
+        self.assertEqual(
+            merge_points([[38.89, -77.03]], [[38.9, -77.0], [39.74, -104.99]]),
+            [[38.89, -77.03], [39.74, -104.99]],
+        )
+    
+    def test_gazetteer_averages_zip_centroids(self):
+        """Test that the gazetteer averages every ZIP centroid of a city"""
+        gazetteer = Gazetteer.from_rows([
+            ("Saint Louis", "MO", 38.60, -90.20),
+            ("Saint Louis", "MO", 38.70, -90.30),
+            ("Springfield", "IL", 39.78, -89.65),
+        ])
+        latitude, longitude = gazetteer.lookup(location_key("St Louis, Missouri"))
+        self.assertAlmostEqual(latitude, 38.65)
+        self.assertAlmostEqual(longitude, -90.25)
+        self.assertIsNone(gazetteer.lookup("springfield|MO"))
+    
+    def test_usajobs_coordinates(self):
+        """Test that USAJobs coordinates are kept for every position location"""
+        scraper = USAJobsScraper(api_key="key", user_email="me@example.com")
+        job = scraper.parse_job({"MatchedObjectDescriptor": {
+            "PositionTitle": "Program Analyst",
+            "PositionURI": "https://www.usajobs.gov/job/1",
+            "OrganizationName": "Department of Labor",
+            "PositionLocation": [
+                {"CityName": "Washington, District of Columbia", "CountrySubDivisionCode": "District of Columbia",
+                 "Latitude": 38.89, "Longitude": -77.03},
+                {"CityName": "Denver, Colorado", "CountrySubDivisionCode": "Colorado",
+                 "Latitude": 39.74, "Longitude": -104.99},
+            ],
+        }})
+        self.assertEqual(job["locations"], ["Washington, District of Columbia", "Denver, Colorado"])
+        self.assertEqual(job["location_points"], [[38.89, -77.03], [39.74, -104.99]])
+    
+    def test_usajobs_partial_coordinates(self):
+        """Test that locations without API coordinates are left for the geocoder"""
+        scraper = USAJobsScraper(api_key="key", user_email="me@example.com")
+        job = scraper.parse_job({"MatchedObjectDescriptor": {
+            "PositionTitle": "Program Analyst",
+            "PositionURI": "https://www.usajobs.gov/job/2",
+            "PositionLocation": [
+                {"CityName": "Washington", "CountrySubDivisionCode": "DC", "Latitude": 38.89, "Longitude": -77.03},
+                {"CityName": "Denver", "CountrySubDivisionCode": "Colorado"},
+            ],
+        }})
+        self.assertEqual(job["location_points"], [[38.89, -77.03], None])
+
+
+class GeocodeJobsTestCase(TestCase):
+    def test_missing_points_are_geocoded(self):
+        """Test that given coordinates are kept and only the locations without one are geocoded"""
+        GeocodeCache.objects.create(key=location_key("Denver, Colorado"), latitude=39.74, longitude=-104.99)
+        GeocodeCache.objects.create(key=location_key("Washington, DC"), latitude=38.9, longitude=-77.0)
+        jobs = geocode_jobs([
+            {"locations": ["Washington, DC", "Denver, Colorado"], "location_points": [[38.89, -77.03], None]},
+            {"locations": ["Washington, DC"]},
+        ])
+        self.assertEqual(jobs[0]["location_points"], [[38.89, -77.03], [39.74, -104.99]])
+        self.assertEqual((jobs[0]["latitude"], jobs[0]["longitude"]), (38.89, -77.03))
+        self.assertEqual(jobs[1]["location_points"], [[38.9, -77.0]])
+    
+    def test_geocode_all_keeps_usajobs_points(self):
+        """Test that re-geocoding everything keeps stored API coordinates and adds only the missing locations"""
+        GeocodeCache.objects.create(key=location_key("Denver, Colorado"), latitude=39.74, longitude=-104.99)
+        GeocodeCache.objects.create(key=location_key("Washington, DC"), latitude=38.9, longitude=-77.0)
+        usajobs = JobListing.objects.create(
+            title="Analyst", organization="Org", source_domain="usajobs.gov", apply_link="https://www.usajobs.gov/job/g1",
+            locations=["Denver, Colorado", "Washington, DC"], location_points=[[38.89, -77.03]],
+        )
+        other = JobListing.objects.create(
+            title="Analyst", organization="Org", source_domain="example.com", apply_link="https://example.com/g2",
+            locations=["Denver, Colorado"], location_points=[[0.0, 0.0]],
+        )
+        
+        call_command('geocode_jobs', all=True, stdout=io.StringIO())
+        usajobs.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(usajobs.location_points, [[38.89, -77.03], [39.74, -104.99]])
+        self.assertEqual((usajobs.latitude, usajobs.longitude), (38.89, -77.03))
+        self.assertEqual(other.location_points, [[39.74, -104.99]])
+
+
+class FakeUSAJobs(USAJobsScraper):
+    """Serves canned search pages and counts parses"""
+    
+    def __init__(self, postings):
+        super().__init__(api_key="key", user_email="me@example.com")
+        self.postings = postings
+        self.requested = []
+        self.requested_urls = []
+        self.parsed = []
+    
+    def read_page(self, url):
+        query = parse_qs(urlparse(url).query)
+        keyword, page, per_page = query['Keyword'][0], int(query['Page'][0]), int(query['ResultsPerPage'][0])
+        self.requested.append((keyword, page))
+        self.requested_urls.append(url)
+        ids = self.postings[keyword]
+        yield 'count', len(ids)
+        for i in ids[(page - 1) * per_page:page * per_page]:
+            yield 'item', {'MatchedObjectId': str(i), 'MatchedObjectDescriptor': {
+                'PositionTitle': f"Analyst {i}", 'PositionURI': f"https://www.usajobs.gov/job/{i}",
+            }}
+    
+    def parse_posting(self, job_item):
+        self.parsed.append(job_item['MatchedObjectId'])
+        return super().parse_posting(job_item)
+
+
+class USAJobsSearchTestCase(SimpleTestCase):
+    def test_pages_fetched_concurrently_and_deduplicated(self):
+        """Test that every page is fetched once and overlapping postings are parsed once"""
+        scraper = FakeUSAJobs({"policy analyst": [1, 2, 3], "public policy": [3, 4], "legislative": []})
+        jobs = scraper.search_many(["policy analyst", "public policy", "legislative"], results_per_page=2, max_pages=5)
+        
+        self.assertEqual(sorted(scraper.requested), [
+            ("legislative", 1), ("policy analyst", 1), ("policy analyst", 2), ("public policy", 1),
+        ])
+        self.assertEqual(sorted(scraper.parsed), ["1", "2", "3", "4"])
+        self.assertEqual(len(jobs), 4)
+    
+    def test_date_posted_window(self):
+        """Test that windowed searches ask for the days since the watermark and read every page"""
+        now = timezone.now()
+        self.assertIsNone(date_posted_days(None, now))
+        self.assertEqual(date_posted_days(now - timedelta(hours=3), now), 1)
+        self.assertEqual(date_posted_days(now - timedelta(days=2, hours=1), now), 3)
+        self.assertIsNone(date_posted_days(now - timedelta(days=90), now))
+        
+        scraper = FakeUSAJobs({"internship": [1, 2, 3, 4, 5]})
+        self.assertIn("DatePosted=2", scraper.search_url("internship", 1, 100, date_posted=2))
+        items, failed = scraper.fetch_results(["internship"], results_per_page=2, max_pages=1,
+                                              date_posted={"internship": 2})
+        self.assertEqual(len(items), 5)
+        self.assertEqual(failed, set())
+
+
+class USAJobsStreamingTestCase(SimpleTestCase):
+    @skipUnless(usajobs_scraper.ijson, "ijson is not installed")
+    def test_incremental_json_events(self):
+        """Test that the count and each result item are read from a streamed body"""
+        body = json.dumps({"LanguageCode": "EN", "SearchResult": {
+            "SearchResultCount": 2, "SearchResultCountAll": 7,
+            "SearchResultItems": [
+                {"MatchedObjectId": "1", "MatchedObjectDescriptor": {"PositionLocation": [{"Latitude": 38.9}]}},
+                {"MatchedObjectId": "2", "MatchedObjectDescriptor": {"UserArea": {"Details": {"MajorDuties": ["a"]}}}},
+            ],
+        }}).encode()
+        events = list(iter_search_result(io.BytesIO(body)))
+        self.assertEqual(events[0], ('count', 7))
+        self.assertEqual([value["MatchedObjectId"] for kind, value in events[1:]], ["1", "2"])
+        self.assertEqual(events[1][1]["MatchedObjectDescriptor"]["PositionLocation"][0]["Latitude"], 38.9)
+    
+    def test_jobs_stream_in_chunks(self):
+        """Test that parsed jobs arrive in bounded chunks"""
+        scraper = FakeUSAJobs({"internship": list(range(7)), "fellowship": [5, 6, 7]})
+        failed = set()
+        chunks = list(scraper.stream_jobs(["internship", "fellowship"], failed, batch_size=3,
+                                          results_per_page=2, max_pages=None))
+        self.assertEqual([len(chunk) for chunk in chunks], [3, 3, 2])
+        self.assertEqual(failed, set())
+
+
+class ExtractionStageTestCase(SimpleTestCase):
+    def test_pool_matches_inline(self):
+        """Test that pooled extraction returns the inline results, batch by batch and in order"""
+        tasks = [
+            ("Data Science Internship", "Agency", "Python, SQL and machine learning with strong communication"),
+            ("Program Analyst", "Department of Health", "Budget analysis and stakeholder engagement"),
+            ("Policy Fellow", "NASA", "Research and written communication"),
+        ]
+        batches = [(["a", "b"], tasks[:2]), (["c"], tasks[2:])]
+        expected = [(batch, extract_postings(batch_tasks)) for batch, batch_tasks in batches]
+        
+        with self.settings(SCRAPER_EXTRACTION_WORKERS=2):
+            self.assertEqual(list(extract_batches(extract_postings, iter(batches))), expected)
+        with self.settings(SCRAPER_EXTRACTION_WORKERS=1):
+            self.assertIsNone(get_extraction_pool())
+            self.assertEqual(list(extract_batches(extract_postings, iter(batches))), expected)
+        
+        self.assertEqual(expected[0][1][0]["job_type"], "internship")
+        self.assertEqual(reextract_jobs([("usajobs.gov",) + tasks[2]]), [
+            {field: expected[1][1][0][field] for field in REEXTRACT_FIELDS},
+        ])
+        self.assertIn("Healthcare", expected[0][1][1]["sectors"])
+    
+    def test_finished_batches_yielded_early(self):
+        """Test that a finished batch is handed back without waiting for the pipeline to fill"""
+        tasks = [("Policy Fellow", "NASA", "Research and written communication")]
+        produced = []
+        
+        def batches():
+            for i in range(3):
+                produced.append(i)
+                yield [i], tasks
+                time.sleep(1)
+        
+        with self.settings(SCRAPER_EXTRACTION_WORKERS=2):
+            # Workers already started, so the first batch finishes during the pause
+            get_extraction_pool().submit(extract_postings, tasks).result()
+            results = extract_batches(extract_postings, batches(), max_pending=8)
+            self.assertEqual(next(results)[0], [0])
+            self.assertEqual(produced, [0, 1])
+            self.assertEqual([batch for batch, _ in results], [[1], [2]])
+
+
+class ReextractJobsTestCase(TestCase):
+    def test_reextract_from_stored_descriptions(self):
+        """Test that skills are recomputed from saved descriptions and the checkpoint is honoured"""
+        first = JobListing.objects.create(title="Analyst", organization="Org", source_domain="usajobs.gov",
+                                          apply_link="https://www.usajobs.gov/job/r1", sectors=["Government"],
+                                          description="Python and Tableau dashboards for NASA research")
+        second = JobListing.objects.create(title="Engineer", organization="Org", source_domain="example.com",
+                                           apply_link="https://example.com/r2", description="Docker on AWS")
+        JobListing.objects.create(title="Old", organization="Org", apply_link="https://example.com/r3")
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            checkpoint = Path(tmp) / "checkpoint"
+            checkpoint.write_text(str(first.id))
+            call_command('reextract_jobs', checkpoint=str(checkpoint), batch_size=1, stdout=io.StringIO())
+            self.assertFalse(checkpoint.exists())
+            
+            first.refresh_from_db()
+            second.refresh_from_db()
+            self.assertEqual(first.technical_skills, {})
+            self.assertEqual(second.technical_skills["Cloud & DevOps"], ["Aws", "Docker"])
+            
+            call_command('reextract_jobs', checkpoint=str(checkpoint), stdout=io.StringIO())
+        
+        first.refresh_from_db()
+        self.assertIn("Science", first.sectors)
+        self.assertIn("Python", first.technical_skills["Programming Languages"])
+
+
+class USAJobsSyncTestCase(TestCase):
+    def test_incremental_sync_and_reconciliation(self):
+        """Test that watermarks advance and postings no longer listed are closed"""
+        JobListing.objects.create(title="Gone", organization="Org", source_domain="usajobs.gov",
+                                  apply_link="https://www.usajobs.gov/job/99")
+        scraper = FakeUSAJobs({"internship": [1, 2]})
+        
+        scraper.scrape_multiple_keywords(["internship"], incremental=True)
+        watermark = SyncWatermark.objects.get(source="usajobs.gov", keyword="internship")
+        self.assertIsNotNone(watermark.synced_at)
+        self.assertIsNotNone(watermark.reconciled_at)
+        self.assertTrue(JobListing.objects.get(title="Gone").closed)
+        self.assertEqual(JobListing.objects.filter(closed=False).count(), 2)
+        
+        scraper.scrape_multiple_keywords(["internship"], incremental=True)
+        self.assertIn("DatePosted", scraper.requested_urls[-1])
+    
+    def test_reconciliation_covers_every_synced_keyword(self):
+        """Test that a run with other keywords does not close postings only earlier keywords returned"""
+        scraper = FakeUSAJobs({"internship": [1, 2], "fellowship": [3]})
+        scraper.scrape_multiple_keywords(["internship"], incremental=True)
+        scraper.scrape_multiple_keywords(["fellowship"], incremental=True)
+        self.assertEqual(JobListing.objects.filter(closed=False).count(), 3)
+        
+        scraper.postings["internship"] = [1]
+        with self.settings(SCRAPER_USAJOBS_RECONCILE_HOURS=0):
+            scraper.scrape_multiple_keywords(["fellowship"], incremental=True)
+        self.assertEqual(
+            sorted(JobListing.objects.filter(closed=False).values_list('apply_link', flat=True)),
+            ["https://www.usajobs.gov/job/1", "https://www.usajobs.gov/job/3"],
+        )
+
+
+class DistanceEngineTestCase(SimpleTestCase):
+    def test_nearest_location_per_job(self):
+        """Test that each job is ranked by its nearest location and updates replace old points"""
+        engine = DistanceEngine()
+        # Job 1 has offices in Los Angeles and Baltimore, job 2 only in Richmond
+        engine.load([1, 2, 1], [34.05, 37.54, 39.29], [-118.24, -77.44, -76.61])
+        
+        ids, distances = engine.nearest(38.90, -77.04, max_miles=200)
+        self.assertEqual(ids.tolist(), [1, 2])
+        self.assertAlmostEqual(distances[0], haversine_miles(38.90, -77.04, 39.29, -76.61))
+        
+        engine.replace_jobs([1], [1], [34.05], [-118.24])
+        ids, _ = engine.nearest(38.90, -77.04, max_miles=200)
+        self.assertEqual(ids.tolist(), [2])
+        self.assertEqual(len(engine), 2)
+    
+    def test_nearest_distances(self):
+        """Test the vectorized distance from many origins to a job's nearest location"""
+        distances = nearest_distances([38.90, 34.0], [-77.04, -118.0], [39.29, 34.05], [-76.61, -118.24])
+        self.assertAlmostEqual(distances[0], haversine_miles(38.90, -77.04, 39.29, -76.61))
+        self.assertAlmostEqual(distances[1], haversine_miles(34.0, -118.0, 34.05, -118.24))
+
+
+class StatisticsTestCase(TestCase):
+    def test_calculate_statistics(self):
+        """Test aggregated counts and the per-job skills average"""
+        JobListing.objects.create(
+            title="Data Analyst", organization="Org", apply_link="https://example.com/s1",
+            sectors=["Government", "Technology"], work_format=["remote"], soft_skills=["Communication"],
+            technical_skills={"Programming Languages": ["Python", "SQL"], "Data Science & Analytics": ["Python"]},
+        )
+        JobListing.objects.create(
+            title="Intern", organization="Org", apply_link="https://example.com/s2", job_type="internship",
+            sectors=["Government"], work_format=["onsite"], technical_skills={},
+        )
+        JobListing.objects.create(
+            title="Closed", organization="Org", apply_link="https://example.com/s3", closed=True,
+            sectors=["Healthcare"],
+        )
+        
+        stats = calculate_statistics(JobListing.objects.filter(closed=False).order_by('-date_scraped'))
+        self.assertEqual(stats['total_jobs'], 2)
+        self.assertEqual(stats['job_type_stats'], {'job': 1, 'internship': 1})
+        self.assertEqual(stats['top_sectors'], [("Government", 2), ("Technology", 1)])
+        self.assertEqual(stats['top_technical_skills'], [("Python", 2), ("SQL", 1)])
+        self.assertEqual(stats['top_soft_skills'], [("Communication", 1)])
+        self.assertEqual(stats['work_format_stats'], {"remote": 1, "onsite": 1})
+        self.assertEqual(stats['avg_skills_per_job'], 2.0)
+        self.assertIsNone(calculate_statistics(JobListing.objects.filter(title="Nobody")))
+    
+    def test_snapshots_refresh_incrementally(self):
+        """Test that snapshots are stored per filter and only touched snapshots are recomputed"""
+        JobListing.objects.create(title="Analyst", organization="Org", apply_link="https://example.com/n1",
+                                  sectors=["Government"], locations=["Richmond, VA"])
+        refresh_statistics_snapshots()
+        self.assertEqual(snapshot_statistics()['total_jobs'], 1)
+        self.assertEqual(snapshot_statistics('state', 'VA')['total_jobs'], 1)
+        
+        JobListing.objects.create(title="Nurse", organization="Org", apply_link="https://example.com/n2",
+                                  sectors=["Healthcare"])
+        self.assertEqual(refresh_statistics_snapshots(), 3)
+        self.assertEqual(snapshot_statistics()['total_jobs'], 2)
+        self.assertEqual(snapshot_statistics('sector', 'Government')['total_jobs'], 1)
+        self.assertTrue(StatisticsSnapshot.objects.filter(dimension='sector', value='Healthcare').exists())
+        self.assertEqual(refresh_statistics_snapshots(), 0)
+        
+        # Values the refresh never produced are aggregated live and not stored
+        self.assertIsNone(snapshot_statistics('sector', 'Nonexistent'))
+        self.assertIsNone(snapshot_statistics('work_format', 'remote'))
+        self.assertFalse(StatisticsSnapshot.objects.filter(value__in=['Nonexistent', 'remote']).exists())
+    
+    def test_moved_job_refreshes_old_snapshot(self):
+        """Test that an upsert moving a job to another sector recomputes the sector it left"""
+        job = {"title": "Analyst", "organization": "Org", "apply_link": "https://example.com/m1",
+               "job_type": "job", "sectors": ["Government"], "work_format": ["onsite"], "locations": []}
+        upsert_jobs([job], notify=False)
+        refresh_statistics_snapshots()
+        self.assertEqual(snapshot_statistics('sector', 'Government')['total_jobs'], 1)
+        
+        upsert_jobs([dict(job, sectors=["Healthcare"], job_type="fellowship")], notify=False)
+        self.assertTrue(StatisticsSnapshot.objects.get(dimension='sector', value='Government').dirty)
+        refresh_statistics_snapshots()
+        self.assertIsNone(snapshot_statistics('sector', 'Government'))
+        self.assertIsNone(snapshot_statistics('job_type', 'job'))
+        self.assertEqual(snapshot_statistics('sector', 'Healthcare')['total_jobs'], 1)
+        self.assertFalse(StatisticsSnapshot.objects.filter(dirty=True).exists())
+
+
+class StatisticsQueryTestCase(SimpleTestCase):
+    def test_statistics_sql(self):
+        """Test that filters are kept and aggregation happens in SQL"""
+        sql, params = jobs_subquery(JobListing.objects.filter(closed=False, sectors__contains=["Government"]))
+        self.assertNotIn("ORDER BY", sql)
+        self.assertIn('"scraper_joblisting"."technical_skills"', sql)
+        self.assertIn("@>", sql)
+        self.assertIn("Government", params)
+        
+        sql = COUNTS_SQL.format(jobs=sql)
+        self.assertIn("unnest(jobs.sectors)", sql)
+        self.assertIn("jsonb_array_elements_text", sql)
+    
+    def test_snapshot_keys(self):
+        """Test which job_list filters are served from snapshots"""
+        self.assertEqual(snapshot_filter({'job_type': '', 'sector': ''}), ('', ''))
+        self.assertEqual(snapshot_filter({'job_type': 'internship', 'sector': ''}), ('job_type', 'internship'))
+        self.assertEqual(snapshot_filter({'state': 'va'}), ('state', 'VA'))
+        self.assertEqual(snapshot_filter({'state': 'Virginia'}), ('state', 'VA'))
+        self.assertIsNone(snapshot_filter({'state': 'Arlington'}))
+        self.assertIsNone(snapshot_filter({'job_type': 'job', 'sector': 'Government'}))
+        
+        targets = snapshot_targets([("job", ["Government"], ["onsite"], ["DC"])])
+        self.assertEqual(targets, {
+            ('', ''), ('job_type', 'job'), ('sector', 'Government'), ('work_format', 'onsite'), ('state', 'DC'),
+        })
+
+
+class SearchTestCase(TestCase):
+    def test_search_ranks_title_matches_first(self):
+        """Test that search covers organization and skills and ranks title hits above them"""
+        JobListing.objects.create(title="Office Manager", organization="Python Software Foundation",
+                                  apply_link="https://example.com/f1")
+        JobListing.objects.create(title="Python Developer", organization="Org",
+                                  apply_link="https://example.com/f2")
+        JobListing.objects.create(title="Analyst", organization="Org", apply_link="https://example.com/f3",
+                                  technical_skills={"Programming Languages": ["Python"]})
+        JobListing.objects.create(title="Nurse", organization="Hospital", apply_link="https://example.com/f4")
+        
+        results = list(search_jobs(JobListing.objects.all(), "python"))
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0].title, "Python Developer")
+        self.assertEqual(list(search_jobs(JobListing.objects.all(), "hospital")), [JobListing.objects.get(title="Nurse")])
+
+
+class SearchQueryTestCase(SimpleTestCase):
+    def test_search_sql(self):
+        """Test that search uses the indexed vector and orders by rank"""
+        sql = str(search_jobs(JobListing.objects.filter(closed=False), "data analyst").query)
+        self.assertIn('"scraper_joblisting"."search_vector" @@', sql)
+        self.assertIn("websearch_to_tsquery", sql)
+        self.assertIn("ts_rank", sql)
+
+
+class CursorPaginationTestCase(TestCase):
+    def test_api_pages_by_cursor(self):
+        """Test that the jobs API walks keyset pages and reports a count"""
+        for i in range(3):
+            JobListing.objects.create(title=f"Job {i}", organization="Org", apply_link=f"https://example.com/c{i}")
+        
+        page = self.client.get('/api/jobs/', {'page_size': 2}).json()
+        self.assertEqual(page['count'], 3)
+        self.assertFalse(page['count_is_approximate'])
+        self.assertEqual([job['title'] for job in page['results']], ["Job 2", "Job 1"])
+        
+        page = self.client.get(page['next']).json()
+        self.assertEqual([job['title'] for job in page['results']], ["Job 0"])
+        self.assertIsNone(page['next'])
+    
+    def test_search_pages_by_offset(self):
+        """Test that ranked search results page by number, so equal ranks are neither repeated nor skipped"""
+        for i in range(5):
+            JobListing.objects.create(title="Policy Analyst", organization="Org", apply_link=f"https://example.com/s{i}")
+        
+        links = []
+        page = self.client.get('/api/jobs/', {'search': 'analyst', 'page_size': 2}).json()
+        self.assertEqual(page['count'], 5)
+        while True:
+            links.extend(job['apply_link'] for job in page['results'])
+            if not page['next']:
+                break
+            self.assertIn('page=', page['next'])
+            page = self.client.get(page['next']).json()
+        self.assertEqual(sorted(links), [f"https://example.com/s{i}" for i in range(5)])
+    
+    def test_approximate_count(self):
+        """Test that counts past the limit come from the planner estimate"""
+        for i in range(3):
+            JobListing.objects.create(title=f"Job {i}", organization="Org", apply_link=f"https://example.com/a{i}")
+        
+        self.assertEqual(approximate_count(JobListing.objects.all(), exact_limit=5), (3, False))
+        count, is_approximate = approximate_count(JobListing.objects.all(), exact_limit=2)
+        self.assertTrue(is_approximate)
+        self.assertGreaterEqual(count, 3)
+
+
+class JobListFieldsTestCase(TestCase):
+    def test_sparse_fieldsets(self):
+        """Test the compact default list, ?fields= projection and the full detail view"""
+        job = JobListing.objects.create(title="Analyst", organization="Org", apply_link="https://example.com/l1",
+                                        technical_skills={"Programming Languages": ["Python"]})
+        
+        row = self.client.get('/api/jobs/').json()['results'][0]
+        self.assertEqual(row['title'], "Analyst")
+        self.assertNotIn('technical_skills', row)
+        
+        row = self.client.get('/api/jobs/', {'fields': 'title,technical_skills'}).json()['results'][0]
+        self.assertEqual(row, {'title': "Analyst", 'technical_skills': {"Programming Languages": ["Python"]}})
+        
+        self.assertEqual(self.client.get('/api/jobs/', {'fields': 'title,search_vector'}).status_code, 400)
+        self.assertIn('technical_skills', self.client.get(f'/api/jobs/{job.id}/').json())
+
+
+class JobListFieldsParsingTestCase(SimpleTestCase):
+    def test_job_list_fields(self):
+        """Test parsing of the ?fields= parameter"""
+        self.assertEqual(job_list_fields(None), (JOB_LIST_FIELDS, []))
+        self.assertEqual(job_list_fields("title, organization,title"), (["title", "organization"], []))
+        self.assertEqual(job_list_fields("title,bogus"), (["title", "bogus"], ["bogus"]))
+    
+
+    def test_ordering(self):
+        """Test that the cursor pages by date and search results have a unique tie-break for offset pages"""
+        paginator = JobCursorPagination()
+        request = Request(RequestFactory().get('/api/jobs/'))
+        jobs = JobListing.objects.all()
+        self.assertEqual(paginator.get_ordering(request, jobs, None), ('-date_scraped', '-id'))
+        self.assertEqual(tuple(search_jobs(jobs, "analyst").query.order_by), ('-rank', '-date_scraped', '-id'))
+
+
+class FilterQueryTestCase(SimpleTestCase):
+    def test_filters_use_indexed_operators(self):
+        """Test that each filter compiles to an operator its GIN index supports"""
+        jobs = JobListing.objects.filter(closed=False)
+        
+        sql, params = filter_jobs(jobs, 'state', 'Virginia').query.sql_with_params()
+        self.assertIn('"scraper_joblisting"."states" @>', sql)
+        self.assertIn('VA', params)
+        
+        sql, params = filter_jobs(jobs, 'state', 'Fairfax').query.sql_with_params()
+        self.assertIn('scraper_locations_text("scraper_joblisting"."locations")::text LIKE', sql)
+        self.assertIn('%fairfax%', params)
+        
+        sql, params = filter_jobs(jobs, 'skill', 'C++').query.sql_with_params()
+        self.assertIn('"scraper_joblisting"."soft_skills" @>', sql)
+        self.assertIn('"technical_skills" @? %s::jsonpath', sql)
+        self.assertIn('$.*[*] ? (@ == "C++")', params)
+        
+        sql, params = filter_jobs(jobs, 'sector', 'Government').query.sql_with_params()
+        self.assertIn('"scraper_joblisting"."sectors" @>', sql)
+
+
+class JobValidationTestCase(SimpleTestCase):
+    def test_validate_job_data(self):
+        """Test that validation mirrors the model's choices, lengths and URL fields"""
+        job_data = {
+            "title": "Analyst",
+            "organization": "Example Org",
+            "apply_link": "https://example.com/jobs/1",
+            "job_type": "internship",
+            "work_format": ["remote"],
+        }
+        self.assertEqual(validate_job_data(job_data), [])
+        
+        errors = validate_job_data(dict(
+            job_data, title="x" * 501, job_type="gig", apply_link="example", work_format=["y" * 51],
+        ))
+        self.assertEqual(len(errors), 4)
+        self.assertEqual(validate_job_data({"title": "Analyst"}), ["organization: required", "apply_link: required"])
+
+
+class AsyncFetcherTestCase(SimpleTestCase):
+    def test_per_host_limit(self):
+        """Test that concurrent fetches never exceed the per-host limit"""
+        lock = threading.Lock()
+        active = {}
+        peak = {}
+        
+        def fetch(url):
+            host = url.split('/')[2]
+            with lock:
+                active[host] = active.get(host, 0) + 1
+                peak[host] = max(peak.get(host, 0), active[host])
+            time.sleep(0.02)
+            with lock:
+                active[host] -= 1
+            return url.upper()
+        
+        urls = [f"https://a.gov/{i}" for i in range(8)] + [f"https://b.edu/{i}" for i in range(8)]
+        results = AsyncFetcher(fetch, max_concurrency=6, per_host_concurrency=2).fetch_all(urls)
+        
+        self.assertEqual(len(results), 16)
+        self.assertEqual(results["https://a.gov/3"], "HTTPS://A.GOV/3")
+        self.assertLessEqual(peak["a.gov"], 2)
+        self.assertLessEqual(peak["b.edu"], 2)
+    
+    def test_failed_fetch_returns_none(self):
+        """Test that a failing fetch does not abort the batch"""
+        def fetch(url):
+            if url.endswith('bad'):
+                raise ValueError("boom")
+            return "ok"
+        
+        results = AsyncFetcher(fetch).fetch_all(["https://a.gov/ok", "https://a.gov/bad"])
+        self.assertEqual(results, {"https://a.gov/ok": "ok", "https://a.gov/bad": None})
+
+
+class RateLimiterTestCase(SimpleTestCase):
+    def test_token_bucket_burst_then_rate(self):
+        """Test that the bucket allows a burst and then spaces requests by the rate"""
+        bucket = TokenBucket(rate=10, burst=3)
+        waits = [bucket.reserve() for _ in range(5)]
+        
+        self.assertEqual(waits[:3], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(waits[3], 0.1, places=2)
+        self.assertAlmostEqual(waits[4], 0.2, places=2)
+    
+    def test_pause_delays_next_request(self):
+        """Test that a pause pushes the next token past the pause window"""
+        bucket = TokenBucket(rate=100, burst=5)
+        bucket.pause(5)
+        self.assertGreater(bucket.reserve(), 4.9)
+    
+    def test_domain_limits_match_subdomains(self):
+        """Test that configured limits apply to subdomains"""
+        limiter = RateLimiter(limits={'usajobs.gov': {'rate': 0.5, 'burst': 2}})
+        self.assertEqual(limiter.limits_for('data.usajobs.gov'), (0.5, 2))
+        self.assertEqual(limiter.limits_for('careers.stanford.edu'), (1.0, 5))
+    
+    def test_parse_retry_after(self):
+        """Test parsing of Retry-After seconds and invalid values"""
+        self.assertEqual(parse_retry_after('120'), 120.0)
+        self.assertIsNone(parse_retry_after('soon'))
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0.0)
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Keep-alive handler that answers 503 to the first request for /flaky"""
+    protocol_version = 'HTTP/1.1'
+    failures = {}
+    
+    def do_GET(self):
+        if self.path == '/flaky' and not self.failures.get(self.path):
+            self.failures[self.path] = True
+            status, body = 503, b'busy'
+        else:
+            status, body = 200, b'ok'
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Retry-After', '0')
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, *args):
+        pass
+
+
+class HttpClientTestCase(SimpleTestCase):
+    def setUp(self):
+        FlakyHandler.failures = {}
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), FlakyHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_port}"
+        self.client = HttpClient(rate_limiter=RateLimiter(default_rate=0), backoff_base=0)
+    
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+    
+    def test_connections_are_reused(self):
+        """Test that repeated requests to one host share a single connection"""
+        for _ in range(3):
+            self.assertEqual(self.client.get(f"{self.base}/page").text, 'ok')
+        
+        stats = self.client.stats.as_dict()
+        self.assertEqual(stats['connections_opened'], 1)
+        self.assertEqual(stats['connections_reused'], 2)
+    
+    def test_transient_status_is_retried(self):
+        """Test that a 503 is retried and the retry is counted"""
+        response = self.client.get(f"{self.base}/flaky")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.stats.retries, 1)
+
+
+class FakeResponse:
+    def __init__(self, status_code, text='', headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+
+class FakeClient:
+    """Returns queued responses and records the headers it was called with"""
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.sent_headers = []
+    
+    def get(self, url, headers=None, **kwargs):
+        self.sent_headers.append(headers or {})
+        return self.responses.pop(0)
+
+
+class HttpCacheTestCase(SimpleTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = HttpCache(self.tmp.name, max_bytes=1024 * 1024)
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_conditional_get_and_digest(self):
+        """Test that validators are sent and 304s or identical bodies count as unchanged"""
+        url = "https://example.gov/jobs"
+        client = FakeClient(
+            FakeResponse(200, '<html>v1</html>', {'ETag': '"abc"'}),
+            FakeResponse(304),
+            FakeResponse(200, '<html>v1</html>'),
+            FakeResponse(200, '<html>v2</html>'),
+        )
+        
+        self.assertTrue(self.cache.fetch(client, url).changed)
+        
+        not_modified = self.cache.fetch(client, url)
+        self.assertEqual(client.sent_headers[1]['If-None-Match'], '"abc"')
+        self.assertFalse(not_modified.changed)
+        self.assertEqual(not_modified.text, '<html>v1</html>')
+        
+        self.assertFalse(self.cache.fetch(client, url).changed)
+        self.assertTrue(self.cache.fetch(client, url).changed)
+    
+    def test_deferred_store(self):
+        """Test that a deferred page stays changed until it is committed"""
+        url = "https://example.gov/listing"
+        client = FakeClient(*(FakeResponse(200, '<html>v1</html>') for _ in range(3)))
+        
+        self.assertTrue(self.cache.fetch(client, url, defer=True).changed)
+        page = self.cache.fetch(client, url, defer=True)
+        self.assertTrue(page.changed)
+        page.commit()
+        self.assertFalse(self.cache.fetch(client, url, defer=True).changed)
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first"""
+        body = 'x' * 5000
+        for i in range(3):
+            self.cache.store(f"https://example.gov/{i}", FakeResponse(200, body + str(i)))
+        self.cache.get("https://example.gov/0")
+        
+        self.cache.prune(max_bytes=self.cache.stats()['bytes'] - 1)
+        
+        self.assertIsNotNone(self.cache.get("https://example.gov/0"))
+        self.assertIsNone(self.cache.get("https://example.gov/1"))
+        self.assertEqual(self.cache.stats()['entries'], 2)
+
+
+class ParserBackendTestCase(SimpleTestCase):
+    fixtures_dir = Path(__file__).resolve().parent / 'benchmark_fixtures' / 'html'
+    base_url = 'https://careers.example.gov/'
+    
+    def scrape_fixture(self, backend, name):
+        scraper = UniversalJobScraper(parser=backend, use_cache=False)
+        html = (self.fixtures_dir / name).read_text(encoding='utf-8')
+        doc = scraper.parser.parse(html)
+        cards = scraper.find_job_listings(doc, self.base_url)
+        return [scraper.parse_card(card, self.base_url) for card in cards]
+    
+    def test_backends_agree_on_listings(self):
+        """Test that the lxml and BeautifulSoup backends extract identical cards"""
+        for name in ('usajobs_search.html', 'nonprofit_board.html', 'agency_job_links.html'):
+            lxml_cards = self.scrape_fixture('lxml', name)
+            self.assertEqual(len(lxml_cards), 100)
+            self.assertEqual(lxml_cards, self.scrape_fixture('soup', name))
+    
+    def test_description_ignores_scripts(self):
+        """Test that description text comes from the description block only"""
+        html = (self.fixtures_dir / 'job_detail.html').read_text(encoding='utf-8')
+        for backend in ('lxml', 'soup'):
+            description = UniversalJobScraper(parser=backend, use_cache=False).parse_job_description(html)
+            self.assertTrue(description.startswith('Responsibility 0:'))
+            self.assertNotIn('__STATE__', description)
+
+
+class KeywordMatcherTestCase(SimpleTestCase):
+    def test_whole_word_matches(self):
+        """Test that keywords match whole words only, including multi-word and symbol keywords"""
+        matcher = KeywordMatcher([
+            ('machine learning', 'ml'), ('learning', 'learning'), ('c++', 'cpp'),
+            ('node.js', 'node'), ('go', 'go'), ('it', 'it'), ('ai', 'ai'),
+        ])
+        
+        self.assertEqual(
+            matcher.find("Machine\nlearning with C++ and Node.js"),
+            ['ml', 'learning', 'cpp', 'node'],
+        )
+        self.assertEqual(matcher.find("It is going well, we maintain a fair amount of data"), [])
+        self.assertEqual(matcher.find("IT support, AI research and Go services"), ['go', 'it', 'ai'])
+    
+    def test_usajobs_false_positives(self):
+        """Test that short skills no longer match inside other words"""
+        scraper = USAJobsScraper(api_key='', user_email='')
+        technical, soft = scraper.extract_skills("Maintain ongoing records and edit reports with Python.")
+        
+        self.assertEqual(technical["Programming Languages"], ["Python"])
+        self.assertNotIn("Data Science & Analytics", technical)
+        self.assertEqual(scraper.identify_sectors("Department of Labor", "Submit it by Friday"), ["Government"])
+    
+    def test_universal_extraction(self):
+        """Test that one pass yields skills, sectors, formats and job type"""
+        scraper = UniversalJobScraper(use_cache=False)
+        hits = scraper.analyze_text("Remote internship building Django apps for a healthcare software team")
+        
+        self.assertEqual(hits['technical'], {"Web Development": ["Django"]})
+        self.assertEqual(hits['sector'], ["Technology", "Healthcare"])
+        self.assertEqual(hits['work_format'], ["remote"])
+        self.assertEqual(scraper.pick_job_type(hits['job_type']), "internship")
@@ -1,7 +1,230 @@
-import requests
-from datetime import datetime
-from .models import JobListing, ScrapingLog
-import time
+import math
+import queue
+import threading
+from datetime import datetime, timedelta
+from functools import partial
+from urllib.parse import urlencode
+from django.conf import settings
+from django.utils import timezone
+from .async_fetcher import AsyncFetcher
+from .distance_engine import refresh_distance_engine
+from .extraction import extract_batches
+from .models import JobListing, ScrapingLog, SyncWatermark
+from .http_client import get_http_client
+from .ingest import upsert_jobs
+from .skill_matcher import KeywordMatcher, group_hits
+from .statistics import refresh_statistics_snapshots
+
+try:
+    import ijson
+    from ijson.common import ObjectBuilder
+except ImportError:  # pragma: no cover - ijson is optional
+    ijson = None
+
+
+TECHNICAL_SKILLS = {
+    # EXPANDED Programming Languages
+    "Programming Languages": [
+        "python", "java", "javascript", "typescript", "c++", "c#", "ruby", 
+        "go", "rust", "swift", "kotlin", "php", "r", "matlab", "scala",
+        "sql", "nosql", "html", "css", "perl", "vba", "shell scripting",
+        "bash", "powershell", "sas", "spss", "stata"
+    ],
+    # EXPANDED Data Science & Analytics
+    "Data Science & Analytics": [
+        "machine learning", "deep learning", "ai", "artificial intelligence",
+        "data analysis", "data analytics", "statistics", "statistical analysis",
+        "data visualization", "tableau", "power bi", "excel", "data mining",
+        "predictive modeling", "quantitative analysis", "regression", "modeling",
+        "big data", "hadoop", "spark", "pandas", "numpy", "scikit-learn",
+        "tensorflow", "pytorch", "neural networks", "nlp", "natural language processing",
+        "data warehousing", "etl", "business intelligence", "reporting",
+        "dashboards", "metrics", "kpi", "analytics"
+    ],
+    # EXPANDED Cloud & DevOps
+    "Cloud & DevOps": [
+        "aws", "azure", "gcp", "google cloud", "cloud computing",
+        "docker", "kubernetes", "ci/cd", "jenkins", "devops",
+        "terraform", "ansible", "linux", "unix", "bash",
+        "containerization", "microservices", "serverless",
+        "infrastructure as code", "automation", "monitoring",
+        "grafana", "prometheus", "elastic", "deployment"
+    ],
+    # EXPANDED Security & Compliance
+    "Security & Compliance": [
+        "cybersecurity", "information security", "infosec",
+        "penetration testing", "encryption", "security clearance",
+        "vulnerability", "risk assessment", "compliance", "fisma",
+        "nist", "fedramp", "iso 27001", "hipaa", "gdpr",
+        "security operations", "incident response", "threat analysis",
+        "firewall", "ids", "ips", "siem", "authentication",
+        "authorization", "access control"
+    ],
+    # EXPANDED Office & Productivity
+    "Office & Productivity": [
+        "microsoft office", "excel", "word", "powerpoint", "outlook",
+        "sharepoint", "google workspace", "microsoft teams", "slack",
+        "office 365", "g suite", "onedrive", "google docs",
+        "google sheets", "access", "visio", "project"
+    ],
+    # EXPANDED Research & Analysis
+    "Research & Analysis": [
+        "research", "policy analysis", "program evaluation", 
+        "qualitative analysis", "quantitative research", "survey design",
+        "grant writing", "budget analysis", "cost-benefit analysis",
+        "strategic planning", "feasibility study", "impact assessment",
+        "literature review", "case study", "needs assessment",
+        "data collection", "field research", "archival research"
+    ],
+    # NEW: Design & Creative
+    "Design & Creative": [
+        "graphic design", "ui/ux", "user experience", "user interface",
+        "adobe creative suite", "photoshop", "illustrator", "indesign",
+        "figma", "sketch", "wireframing", "prototyping",
+        "web design", "visual design", "branding", "typography",
+        "video editing", "premiere", "final cut"
+    ],
+    # NEW: Project Management
+    "Project Management": [
+        "project management", "agile", "scrum", "kanban", "waterfall",
+        "pmp", "prince2", "jira", "trello", "asana", "monday.com",
+        "gantt chart", "risk management", "stakeholder management",
+        "change management", "process improvement", "six sigma",
+        "lean", "sprint planning", "backlog management"
+    ],
+    # NEW: Financial & Budget
+    "Financial & Budget": [
+        "budget", "budgeting", "financial analysis", "financial management",
+        "cost analysis", "forecasting", "accounting", "bookkeeping",
+        "financial reporting", "accounts payable", "accounts receivable",
+        "procurement", "contract management", "grants management",
+        "fiscal management", "appropriations", "obligations"
+    ]
+}
+
+# MASSIVELY EXPANDED Soft Skills
+SOFT_SKILLS = [
+    # Communication
+    "communication", "written communication", "verbal communication",
+    "oral communication", "interpersonal communication",
+    "presentation skills", "public speaking", "briefing",
+
+    # Collaboration
+    "teamwork", "collaboration", "team player", "cross-functional",
+    "stakeholder engagement", "relationship building",
+
+    # Leadership
+    "leadership", "management", "supervision", "mentoring",
+    "coaching", "delegation", "team building",
+
+    # Analytical
+    "problem solving", "critical thinking", "analytical thinking",
+    "analytical skills", "decision making", "judgment",
+
+    # Attention to Detail
+    "attention to detail", "detail oriented", "accuracy",
+    "thoroughness", "precision",
+
+    # Organization
+    "time management", "organizational skills", "multitasking",
+    "prioritization", "planning", "scheduling",
+
+    # Interpersonal
+    "interpersonal skills", "customer service", "client relations",
+    "stakeholder relations", "diplomacy", "tact",
+
+    # Adaptability
+    "adaptability", "flexibility", "agility", "resilience",
+    "change management", "problem resolution",
+
+    # Initiative
+    "initiative", "self-motivated", "independent", "proactive",
+    "self-starter", "autonomous",
+
+    # Work Ethic
+    "work ethic", "reliability", "dependability", "commitment",
+    "dedication", "professionalism",
+
+    # Creativity
+    "creativity", "innovation", "creative thinking", "problem solving",
+
+    # Other Important
+    "conflict resolution", "negotiation", "persuasion",
+    "cultural competency", "emotional intelligence"
+]
+
+SECTOR_KEYWORDS = {
+    "Government": ["federal", "government", "agency", "department"],
+    "Technology": ["technology", "it", "software", "digital"],
+    "Healthcare": ["health", "healthcare", "medical", "cdc", "nih"],
+    "Science": ["science", "research", "nasa", "laboratory"],
+    "Defense": ["defense", "military", "homeland", "intelligence"],
+    "Education": ["education", "student", "academic"]
+}
+
+
+USAJOBS_SOURCE = 'usajobs.gov'
+
+# DatePosted counts whole days back from today and accepts at most 60
+MAX_DATE_POSTED_DAYS = 60
+
+
+def date_posted_days(since, now):
+    """DatePosted value covering everything published since `since` (a day of overlap), or None for a full search."""
+    if since is None:
+        return None
+    days = (now - since).days + 1
+    if days > MAX_DATE_POSTED_DAYS:
+        return None
+    return days
+
+
+RESULT_COUNT_PREFIX = 'SearchResult.SearchResultCountAll'
+RESULT_ITEM_PREFIX = 'SearchResult.SearchResultItems.item'
+
+
+def iter_search_result(stream):
+    """Yield ('count', n) and ('item', dict) events while a search response body is still being read."""
+    builder = None
+    for prefix, event, value in ijson.parse(stream, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == RESULT_ITEM_PREFIX and event == 'end_map':
+                yield 'item', builder.value
+                builder = None
+        elif prefix == RESULT_ITEM_PREFIX and event == 'start_map':
+            builder = ObjectBuilder()
+            builder.event(event, value)
+        elif prefix == RESULT_COUNT_PREFIX:
+            yield 'count', int(value)
+
+
+def posting_id(job_item):
+    """USAJobs' id for a search result, so a posting matched by several keywords is parsed once."""
+    return job_item.get('MatchedObjectId') or job_item.get('MatchedObjectDescriptor', {}).get('PositionURI')
+
+
+def skill_display_name(category, skill):
+    """Display casing for a skill, e.g. acronyms upper-cased."""
+    if category == "Programming Languages":
+        return skill.upper() if len(skill) <= 4 else skill.title()
+    if category == "Cloud & DevOps":
+        return skill.upper() if skill in ["aws", "gcp"] else skill.title()
+    if category == "Security & Compliance":
+        return skill.upper() if len(skill) <= 5 else skill.title()
+    if category == "Project Management":
+        return skill.upper() if skill == "pmp" else skill.title()
+    return skill.title()
+
+
+# Every taxonomy keyword in one automaton so a description is scanned once
+TEXT_MATCHER = KeywordMatcher(
+    [(skill, ('technical', category, skill_display_name(category, skill)))
+     for category, skills in TECHNICAL_SKILLS.items() for skill in skills] +
+    [(skill, ('soft', None, skill.title())) for skill in SOFT_SKILLS] +
+    [(keyword, ('sector', sector, None))
+     for sector, keywords in SECTOR_KEYWORDS.items() for keyword in keywords]
+)
 
 
 class USAJobsScraper:
@@ -10,7 +233,7 @@ class USAJobsScraper:
     Get your free API key at: https://developer.usajobs.gov/APIRequest/Index
     """
     
-    def __init__(self, api_key, user_email):
+    def __init__(self, api_key, user_email, batch_size=None):
         self.api_key = api_key
         self.user_email = user_email
         self.base_url = "https://data.usajobs.gov/api/search"
@@ -20,8 +243,15 @@ class USAJobsScraper:
             "User-Agent": user_email,
             "Authorization-Key": api_key
         }
+        
+        self.http = get_http_client()
+        # The per-host limit and the data.usajobs.gov rate limit keep parallel pages within the API quota
+        self.max_concurrency = getattr(settings, 'SCRAPER_MAX_CONCURRENCY', 16)
+        self.per_host_concurrency = getattr(settings, 'SCRAPER_PER_HOST_CONCURRENCY', 4)
+        self.batch_size = batch_size or getattr(settings, 'SCRAPER_INGEST_BATCH_SIZE', 500)
     
-    def determine_job_type(self, title, description):
+    @staticmethod
+    def determine_job_type(title, description):
         """Determine if it's an internship, fellowship, or job - STRICT matching"""
         title_lower = title.lower()
         description_lower = description.lower()
@@ -47,222 +277,46 @@ class USAJobsScraper:
         # DEFAULT: Everything else is a job
         return "job"
     
+    @staticmethod
+    def analyze_text(text):
+        """Find every skill and sector keyword in one pass."""
+        return group_hits(TEXT_MATCHER.find(text))
+    
     def extract_skills(self, text):
-        """Extract technical and soft skills - MASSIVELY EXPANDED"""
-        text_lower = text.lower()
-        
-        technical_skills = {
-            "Programming Languages": [],
-            "Data Science & Analytics": [],
-            "Cloud & DevOps": [],
-            "Security & Compliance": [],
-            "Office & Productivity": [],
-            "Research & Analysis": [],
-            "Design & Creative": [],
-            "Project Management": [],
-            "Financial & Budget": []
-        }
-        
-        soft_skills = []
-        
-        # EXPANDED Programming Languages
-        prog_langs = [
-            "python", "java", "javascript", "typescript", "c++", "c#", "ruby", 
-            "go", "rust", "swift", "kotlin", "php", "r", "matlab", "scala",
-            "sql", "nosql", "html", "css", "perl", "vba", "shell scripting",
-            "bash", "powershell", "sas", "spss", "stata"
-        ]
-        for lang in prog_langs:
-            if lang in text_lower:
-                technical_skills["Programming Languages"].append(lang.upper() if len(lang) <= 4 else lang.title())
-        
-        # EXPANDED Data Science & Analytics
-        data_skills = [
-            "machine learning", "deep learning", "ai", "artificial intelligence",
-            "data analysis", "data analytics", "statistics", "statistical analysis",
-            "data visualization", "tableau", "power bi", "excel", "data mining",
-            "predictive modeling", "quantitative analysis", "regression", "modeling",
-            "big data", "hadoop", "spark", "pandas", "numpy", "scikit-learn",
-            "tensorflow", "pytorch", "neural networks", "nlp", "natural language processing",
-            "data warehousing", "etl", "business intelligence", "reporting",
-            "dashboards", "metrics", "kpi", "analytics"
-        ]
-        for skill in data_skills:
-            if skill in text_lower:
-                technical_skills["Data Science & Analytics"].append(skill.title())
-        
-        # EXPANDED Cloud & DevOps
-        cloud_skills = [
-            "aws", "azure", "gcp", "google cloud", "cloud computing",
-            "docker", "kubernetes", "ci/cd", "jenkins", "devops",
-            "terraform", "ansible", "linux", "unix", "bash",
-            "containerization", "microservices", "serverless",
-            "infrastructure as code", "automation", "monitoring",
-            "grafana", "prometheus", "elastic", "deployment"
-        ]
-        for skill in cloud_skills:
-            if skill in text_lower:
-                technical_skills["Cloud & DevOps"].append(skill.upper() if skill in ["aws", "gcp"] else skill.title())
-        
-        # EXPANDED Security & Compliance
-        security_skills = [
-            "cybersecurity", "information security", "infosec",
-            "penetration testing", "encryption", "security clearance",
-            "vulnerability", "risk assessment", "compliance", "fisma",
-            "nist", "fedramp", "iso 27001", "hipaa", "gdpr",
-            "security operations", "incident response", "threat analysis",
-            "firewall", "ids", "ips", "siem", "authentication",
-            "authorization", "access control"
-        ]
-        for skill in security_skills:
-            if skill in text_lower:
-                technical_skills["Security & Compliance"].append(skill.upper() if len(skill) <= 5 else skill.title())
-        
-        # EXPANDED Office & Productivity
-        office_skills = [
-            "microsoft office", "excel", "word", "powerpoint", "outlook",
-            "sharepoint", "google workspace", "microsoft teams", "slack",
-            "office 365", "g suite", "onedrive", "google docs",
-            "google sheets", "access", "visio", "project"
-        ]
-        for skill in office_skills:
-            if skill in text_lower:
-                technical_skills["Office & Productivity"].append(skill.title())
-        
-        # EXPANDED Research & Analysis
-        research_skills = [
-            "research", "policy analysis", "program evaluation", 
-            "qualitative analysis", "quantitative research", "survey design",
-            "grant writing", "budget analysis", "cost-benefit analysis",
-            "strategic planning", "feasibility study", "impact assessment",
-            "literature review", "case study", "needs assessment",
-            "data collection", "field research", "archival research"
-        ]
-        for skill in research_skills:
-            if skill in text_lower:
-                technical_skills["Research & Analysis"].append(skill.title())
-        
-        # NEW: Design & Creative
-        design_skills = [
-            "graphic design", "ui/ux", "user experience", "user interface",
-            "adobe creative suite", "photoshop", "illustrator", "indesign",
-            "figma", "sketch", "wireframing", "prototyping",
-            "web design", "visual design", "branding", "typography",
-            "video editing", "premiere", "final cut"
-        ]
-        for skill in design_skills:
-            if skill in text_lower:
-                technical_skills["Design & Creative"].append(skill.title())
-        
-        # NEW: Project Management
-        pm_skills = [
-            "project management", "agile", "scrum", "kanban", "waterfall",
-            "pmp", "prince2", "jira", "trello", "asana", "monday.com",
-            "gantt chart", "risk management", "stakeholder management",
-            "change management", "process improvement", "six sigma",
-            "lean", "sprint planning", "backlog management"
-        ]
-        for skill in pm_skills:
-            if skill in text_lower:
-                technical_skills["Project Management"].append(skill.upper() if skill == "pmp" else skill.title())
-        
-        # NEW: Financial & Budget
-        financial_skills = [
-            "budget", "budgeting", "financial analysis", "financial management",
-            "cost analysis", "forecasting", "accounting", "bookkeeping",
-            "financial reporting", "accounts payable", "accounts receivable",
-            "procurement", "contract management", "grants management",
-            "fiscal management", "appropriations", "obligations"
-        ]
-        for skill in financial_skills:
-            if skill in text_lower:
-                technical_skills["Financial & Budget"].append(skill.title())
-        
-        # Remove empty categories and duplicates
-        technical_skills = {k: list(set(v)) for k, v in technical_skills.items() if v}
-        
-        # MASSIVELY EXPANDED Soft Skills
-        soft_skill_keywords = [
-            # Communication
-            "communication", "written communication", "verbal communication",
-            "oral communication", "interpersonal communication",
-            "presentation skills", "public speaking", "briefing",
-            
-            # Collaboration
-            "teamwork", "collaboration", "team player", "cross-functional",
-            "stakeholder engagement", "relationship building",
-            
-            # Leadership
-            "leadership", "management", "supervision", "mentoring",
-            "coaching", "delegation", "team building",
-            
-            # Analytical
-            "problem solving", "critical thinking", "analytical thinking",
-            "analytical skills", "decision making", "judgment",
-            
-            # Attention to Detail
-            "attention to detail", "detail oriented", "accuracy",
-            "thoroughness", "precision",
-            
-            # Organization
-            "time management", "organizational skills", "multitasking",
-            "prioritization", "planning", "scheduling",
-            
-            # Interpersonal
-            "interpersonal skills", "customer service", "client relations",
-            "stakeholder relations", "diplomacy", "tact",
-            
-            # Adaptability
-            "adaptability", "flexibility", "agility", "resilience",
-            "change management", "problem resolution",
-            
-            # Initiative
-            "initiative", "self-motivated", "independent", "proactive",
-            "self-starter", "autonomous",
-            
-            # Work Ethic
-            "work ethic", "reliability", "dependability", "commitment",
-            "dedication", "professionalism",
-            
-            # Creativity
-            "creativity", "innovation", "creative thinking", "problem solving",
-            
-            # Other Important
-            "conflict resolution", "negotiation", "persuasion",
-            "cultural competency", "emotional intelligence"
-        ]
-        
-        for skill in soft_skill_keywords:
-            if skill in text_lower:
-                soft_skills.append(skill.title())
-        
-        # Remove duplicates
-        soft_skills = list(set(soft_skills))
-        
-        return technical_skills, soft_skills
+        """Extract technical and soft skills"""
+        hits = self.analyze_text(text)
+        return hits['technical'], hits['soft']
+    
+    @staticmethod
+    def merge_sectors(*sector_lists):
+        """Combine matched sectors in taxonomy order, defaulting to Government"""
+        found = set()
+        for sectors in sector_lists:
+            found.update(sectors)
+        return [sector for sector in SECTOR_KEYWORDS if sector in found] or ["Government"]
     
     def identify_sectors(self, org_name, description):
         """Identify job sectors"""
-        combined = (org_name + " " + description).lower()
-        sectors = []
-        
-        sector_keywords = {
-            "Government": ["federal", "government", "agency", "department"],
-            "Technology": ["technology", "it", "software", "digital"],
-            "Healthcare": ["health", "medical", "cdc", "nih"],
-            "Science": ["science", "research", "nasa", "laboratory"],
-            "Defense": ["defense", "military", "homeland", "intelligence"],
-            "Education": ["education", "student", "academic"]
-        }
-        
-        for sector, keywords in sector_keywords.items():
-            if any(keyword in combined for keyword in keywords):
-                sectors.append(sector)
-        
-        return sectors if sectors else ["Government"]
+        return self.merge_sectors(
+            self.analyze_text(org_name).get('sector', []),
+            self.analyze_text(description).get('sector', []),
+        )
     
     def parse_job(self, job_item):
         """Parse a single job from USAJobs API response"""
+        posting = self.parse_posting(job_item)
+        if posting is None:
+            return None
+        job, task = posting
+        extracted = extract_postings([task])[0]
+        return {**job, **extracted} if extracted else None
+    
+    def parse_posting(self, job_item):
+        """Read the fields of a search result; returns (job data, (title, organization, description)).
+        
+        The text analysis (job type, skills, sectors) is left to extract_postings, which can run in
+        the extraction process pool.
+        """
         try:
             job = job_item['MatchedObjectDescriptor']
             
@@ -273,6 +327,8 @@ class USAJobsScraper:
             
             # Location - FIXED for encoding issues
             locations = []
+            location_points = []
+            unnamed_points = []
             if 'PositionLocation' in job and job['PositionLocation']:
                 for loc in job['PositionLocation']:
                     city = loc.get('CityName', '')
@@ -280,8 +336,21 @@ class USAJobsScraper:
                     # Clean up city name
                     if city:
                         city = str(city).split(',')[0].strip()
+                    
+                    # Use the API's own coordinates; a None entry is geocoded from its location at ingest
+                    point = [loc.get('Latitude'), loc.get('Longitude')]
+                    if not all(isinstance(c, (int, float)) for c in point):
+                        point = None
+                    
                     if city and state:
                         locations.append(f"{city}, {state}")
+                        location_points.append(point)
+                    elif point:
+                        unnamed_points.append(point)
+            # Kept in step with locations; coordinates without a place name go last
+            location_points += unnamed_points
+            if not any(location_points):
+                location_points = []
             
             # Fallback to PositionLocationDisplay
             if not locations:
@@ -306,160 +375,327 @@ class USAJobsScraper:
                 
             description = str(job_summary) + " " + str(major_duties)
             
-            # Determine job type - STRICT
-            job_type = self.determine_job_type(title, description)
-            
-            # Extract skills - EXPANDED
-            technical_skills, soft_skills = self.extract_skills(description)
-            
-            # Identify sectors
-            sectors = self.identify_sectors(org_name, description)
-            
             # Dates
             posting_date = job.get('PublicationStartDate', '')
             if posting_date:
                 posting_date = posting_date.split('T')[0]
             
-            return {
+            job_data = {
                 "title": title,
-                "job_type": job_type,
                 "organization": org_name,
                 "apply_link": apply_link,
                 "locations": locations,
                 "work_format": work_format,
-                "sectors": sectors,
-                "technical_skills": technical_skills,
-                "soft_skills": soft_skills,
                 "posting_date": posting_date,
-                "source_domain": "usajobs.gov",
+                "source_domain": USAJOBS_SOURCE,
+                "location_points": location_points,
+                "description": description.strip(),
             }
+            return job_data, (title, org_name, description)
             
         except Exception as e:
             print(f"    ⚠️ Error parsing job: {e}")
             return None
     
+    def search_url(self, keyword, page, results_per_page, date_posted=None, full=True):
+        params = {
+            "Keyword": keyword,
+            "ResultsPerPage": results_per_page,
+            "Page": page,
+        }
+        if full:
+            params["Fields"] = "Full"
+        if date_posted is not None:
+            params["DatePosted"] = date_posted
+        return f"{self.base_url}?{urlencode(params)}"
+    
+    def read_page(self, url):
+        """Yield ('count', n) and ('item', dict) events for one search page, streaming the body when ijson is installed"""
+        response = self.http.get(url, headers=self.headers, stream=True)
+        try:
+            response.raise_for_status()
+            if ijson is None:
+                search_result = response.json().get('SearchResult', {})
+                yield 'count', int(search_result.get('SearchResultCountAll', 0) or 0)
+                for job_item in search_result.get('SearchResultItems', []):
+                    yield 'item', job_item
+            else:
+                response.raw.decode_content = True
+                yield from iter_search_result(response.raw)
+        finally:
+            response.close()
+    
+    def stream_page(self, url, on_item):
+        """Hand every result of a page to on_item as it is read; returns SearchResultCountAll"""
+        total_jobs = 0
+        for kind, value in self.read_page(url):
+            if kind == 'count':
+                total_jobs = value
+            else:
+                on_item(value)
+        return total_jobs
+    
+    def stream_results(self, keywords, on_item, results_per_page=100, max_pages=2, date_posted=None, full=True):
+        """Fetch every keyword's result pages concurrently, calling on_item once per unique posting.
+        
+        Returns the keywords that had a failed page. Keywords searched with a DatePosted window
+        (date_posted maps keyword -> days) fetch every page of the window.
+        """
+        date_posted = date_posted or {}
+        seen = set()
+        seen_lock = threading.Lock()
+        
+        def deliver(job_item):
+            key = posting_id(job_item)
+            with seen_lock:
+                if key is None or key in seen:
+                    return
+                seen.add(key)
+            on_item(job_item)
+        
+        fetcher = AsyncFetcher(
+            partial(self.stream_page, on_item=deliver),
+            max_concurrency=self.max_concurrency,
+            per_host_concurrency=self.per_host_concurrency,
+        )
+        first_urls = {
+            keyword: self.search_url(keyword, 1, results_per_page, date_posted.get(keyword), full)
+            for keyword in keywords
+        }
+        totals = fetcher.fetch_all(first_urls.values())
+        
+        # Page 1 tells how many pages each keyword has, so the rest are fetched together
+        page_urls = {}
+        for keyword, url in first_urls.items():
+            total_jobs = totals.get(url) or 0
+            pages = math.ceil(total_jobs / results_per_page)
+            if max_pages and date_posted.get(keyword) is None:
+                pages = min(pages, max_pages)
+            print(f"  '{keyword}': {total_jobs} matching jobs, {max(pages, 1)} page(s)")
+            page_urls[keyword] = [url] + [
+                self.search_url(keyword, page, results_per_page, date_posted.get(keyword), full)
+                for page in range(2, pages + 1)
+            ]
+        
+        totals.update(fetcher.fetch_all(url for urls in page_urls.values() for url in urls[1:]))
+        print(f"  {len(seen)} unique postings")
+        return {keyword for keyword, urls in page_urls.items() if any(totals.get(url) is None for url in urls)}
+    
+    def fetch_results(self, keywords, results_per_page=100, max_pages=2, date_posted=None, full=True):
+        """Collect stream_results into ({posting id: result item}, keywords with a failed page)"""
+        items = {}
+        failed = self.stream_results(
+            keywords, lambda job_item: items.setdefault(posting_id(job_item), job_item),
+            results_per_page, max_pages, date_posted, full,
+        )
+        return items, failed
+    
+    def stream_jobs(self, keywords, failed, batch_size=None, **search):
+        """Yield parsed jobs in chunks while pages are still downloading.
+        
+        A bounded queue sits between the fetch threads and the parser, so memory stays flat however
+        many keywords and pages a run covers. Keywords with a failed page are added to `failed`.
+        Each chunk's text analysis goes to the extraction stage as one batch.
+        """
+        batch_size = batch_size or self.batch_size
+        items = queue.Queue(maxsize=batch_size * 2)
+        stopped = threading.Event()
+        done = object()
+        errors = []
+        
+        def enqueue(job_item):
+            if not stopped.is_set():
+                items.put(job_item)
+        
+        def produce():
+            try:
+                failed.update(self.stream_results(keywords, enqueue, **search))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                items.put(done)
+        
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
+        
+        def batches():
+            jobs, tasks = [], []
+            for job_item in iter(items.get, done):
+                posting = self.parse_posting(job_item)
+                if posting:
+                    jobs.append(posting[0])
+                    tasks.append(posting[1])
+                if len(jobs) >= batch_size:
+                    yield jobs, tasks
+                    jobs, tasks = [], []
+            if jobs:
+                yield jobs, tasks
+        
+        try:
+            # Text analysis runs in worker processes while this thread keeps reading postings
+            for jobs, results in extract_batches(extract_postings, batches()):
+                yield [{**job, **extracted} for job, extracted in zip(jobs, results) if extracted]
+        finally:
+            # Let the fetch threads finish if the consumer stopped early
+            stopped.set()
+            while producer.is_alive():
+                try:
+                    items.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+        
+        if errors:
+            raise errors[0]
+    
+    def search_many(self, keywords, results_per_page=100, max_pages=2, date_posted=None):
+        """Search several keywords concurrently; each unique posting is parsed once"""
+        jobs = []
+        for chunk in self.stream_jobs(keywords, set(), results_per_page=results_per_page,
+                                      max_pages=max_pages, date_posted=date_posted):
+            jobs.extend(chunk)
+        return jobs
+    
     def search_jobs(self, keyword="internship", results_per_page=100, max_pages=2):
         """Search for jobs on USAJobs"""
-        all_jobs = []
-        
-        for page in range(1, max_pages + 1):
-            print(f"\nFetching page {page} for keyword: '{keyword}'")
-            
-            params = {
-                "Keyword": keyword,
-                "ResultsPerPage": results_per_page,
-                "Page": page,
-                "Fields": "Full"
-            }
-            
-            try:
-                response = requests.get(
-                    self.base_url,
-                    headers=self.headers,
-                    params=params,
-                    timeout=15
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                search_result = data.get('SearchResult', {})
-                total_jobs = search_result.get('SearchResultCountAll', 0)
-                jobs_this_page = search_result.get('SearchResultCount', 0)
-                
-                print(f"  Total matching jobs: {total_jobs}")
-                print(f"  Jobs on this page: {jobs_this_page}")
-                
-                if jobs_this_page == 0:
-                    break
-                
-                job_items = search_result.get('SearchResultItems', [])
-                
-                for job_item in job_items:
-                    parsed_job = self.parse_job(job_item)
-                    if parsed_job:
-                        all_jobs.append(parsed_job)
-                
-                if len(all_jobs) >= total_jobs:
-                    break
-                
-                if page < max_pages:
-                    time.sleep(2)
-                
-            except requests.exceptions.RequestException as e:
-                print(f"  API request failed: {e}")
-                break
+        return self.search_many([keyword], results_per_page=results_per_page, max_pages=max_pages)
+    
+    def reconcile(self, keywords):
+        """Close open USAJobs postings that none of `keywords` returns any more; None if the ID sets were incomplete
+        
+        `keywords` must cover every keyword that ingests USAJobs postings, or postings found only
+        through the missing ones would be closed.
+        """
+        live = set()
+        # Only the ID set is needed: standard fields, the largest page size, every page
+        failed = self.stream_results(
+            keywords, lambda job_item: live.add(job_item.get('MatchedObjectDescriptor', {}).get('PositionURI')),
+            results_per_page=500, max_pages=None, full=False,
+        )
+        live.discard(None)
+        if failed or not live:
+            print("  Reconciliation skipped: the full result set could not be fetched")
+            return None
         
-        return all_jobs
+        stale = [
+            job_id
+            for job_id, apply_link in JobListing.objects.filter(closed=False, source_domain=USAJOBS_SOURCE)
+            .values_list('id', 'apply_link').iterator()
+            if apply_link not in live
+        ]
+        closed = 0
+        for start in range(0, len(stale), 1000):
+            closed += JobListing.objects.filter(id__in=stale[start:start + 1000]).update(
+                closed=True, date_updated=timezone.now()
+            )
+        print(f"  Reconciliation closed {closed} postings")
+        return closed
     
     def save_jobs(self, jobs):
-        """Save jobs to database"""
-        stats = {"created": 0, "skipped": 0}
+        """Save jobs to database in batched upserts"""
+        stats = upsert_jobs(jobs)
         
-        for job_data in jobs:
-            try:
-                existing = JobListing.objects.filter(
-                    apply_link=job_data['apply_link']
-                ).first()
-                
-                if existing:
-                    stats['skipped'] += 1
-                else:
-                    JobListing.objects.create(**job_data)
-                    stats['created'] += 1
-                    print(f"  ✅ Created: {job_data['title'][:60]}...")
-                    
-            except Exception as e:
-                print(f"  ❌ Error saving job: {e}")
+        if stats['created']:
+            print(f"  ✅ Created {stats['created']} jobs")
+        if stats['errors']:
+            print(f"  ❌ Failed to save {stats['errors']} jobs")
         
         return stats
     
-    def scrape_multiple_keywords(self, keywords=None):
-        """Scrape jobs for multiple keywords"""
+    def advance_watermarks(self, keywords, watermarks, failed, started):
+        """Move fully fetched keywords' watermarks to this run, reconciling ID sets when one is due"""
+        for keyword in keywords:
+            if keyword not in failed:
+                SyncWatermark.objects.update_or_create(
+                    source=USAJOBS_SOURCE, keyword=keyword, defaults={'synced_at': started}
+                )
+        
+        reconcile_after = timedelta(hours=getattr(settings, 'SCRAPER_USAJOBS_RECONCILE_HOURS', 24))
+        due = any(
+            keyword not in watermarks
+            or watermarks[keyword].reconciled_at is None
+            or started - watermarks[keyword].reconciled_at >= reconcile_after
+            for keyword in keywords
+        )
+        if not due:
+            return
+        
+        # Compare against every keyword ever synced, not just this run's, since any of them may have found a posting
+        tracked = set(keywords) | set(
+            SyncWatermark.objects.filter(source=USAJOBS_SOURCE).values_list('keyword', flat=True)
+        )
+        if self.reconcile(sorted(tracked)) is not None:
+            SyncWatermark.objects.filter(source=USAJOBS_SOURCE, keyword__in=tracked).update(reconciled_at=started)
+    
+    def scrape_multiple_keywords(self, keywords=None, incremental=None):
+        """Scrape jobs for multiple keywords (incrementally: only postings since each keyword's watermark)"""
         if keywords is None:
             keywords = ["internship", "fellowship"]
+        if incremental is None:
+            incremental = getattr(settings, 'SCRAPER_USAJOBS_INCREMENTAL', True)
+        
+        started = timezone.now()
+        watermarks = {}
+        if incremental:
+            watermarks = {
+                watermark.keyword: watermark
+                for watermark in SyncWatermark.objects.filter(source=USAJOBS_SOURCE, keyword__in=keywords)
+            }
+        date_posted = {
+            keyword: date_posted_days(watermarks[keyword].synced_at, started)
+            for keyword in keywords if keyword in watermarks
+        }
         
         log = ScrapingLog.objects.create(
             status='running',
             sites_scraped=[f"USAJobs: {kw}" for kw in keywords]
         )
         
-        all_jobs = []
-        
         try:
-            for keyword in keywords:
-                print(f"\n{'='*60}")
-                print(f"SEARCHING FOR: {keyword.upper()}")
-                print(f"{'='*60}")
-                
-                jobs = self.search_jobs(keyword=keyword, results_per_page=100, max_pages=2)
-                all_jobs.extend(jobs)
-                
-                print(f"\n  Found {len(jobs)} jobs for '{keyword}'")
-                
-                if keyword != keywords[-1]:
-                    time.sleep(3)
-            
-            print(f"\n\nSAVING JOBS TO DATABASE")
+            print(f"\n{'='*60}")
+            print(f"SEARCHING FOR: {', '.join(keywords).upper()}")
+            print(f"{'='*60}")
             
-            stats = self.save_jobs(all_jobs)
+            # Each chunk is saved as soon as it is parsed, while later pages are still downloading
+            failed = set()
+            found = 0
+            stats = {'created': 0, 'updated': 0, 'unchanged': 0, 'errors': 0}
+            for jobs in self.stream_jobs(keywords, failed, results_per_page=100, max_pages=2, date_posted=date_posted):
+                found += len(jobs)
+                chunk_stats = self.save_jobs(jobs)
+                for key in stats:
+                    stats[key] += chunk_stats[key]
             
             log.status = 'completed'
-            log.jobs_found = len(all_jobs)
+            log.jobs_found = found
             log.jobs_added = stats['created']
+            log.jobs_updated = stats['updated']
             log.completed_at = datetime.now()
             log.save()
             
+            if incremental:
+                self.advance_watermarks(keywords, watermarks, failed, started)
+            else:
+                # Registered without a watermark so reconciliation still fetches these keywords' postings
+                for keyword in keywords:
+                    SyncWatermark.objects.get_or_create(source=USAJOBS_SOURCE, keyword=keyword)
+            
+            refresh_distance_engine()
+            refresh_statistics_snapshots()
+            
             print(f"\n{'='*60}")
             print(f"SCRAPING COMPLETE!")
-            print(f"Total Found: {len(all_jobs)}")
+            print(f"Total Found: {found}")
             print(f"Created: {stats['created']}")
-            print(f"Skipped: {stats['skipped']}")
+            print(f"Updated: {stats['updated']}")
+            print(f"Unchanged: {stats['unchanged']}")
+            http_stats = self.http.stats.as_dict()
+            print(f"HTTP connections opened: {http_stats['connections_opened']}, reused: {http_stats['connections_reused']}")
             print(f"{'='*60}\n")
             
             return {
-                'found': len(all_jobs),
+                'found': found,
                 'created': stats['created'],
-                'updated': 0
+                'updated': stats['updated']
             }
             
         except Exception as e:
@@ -467,4 +703,25 @@ class USAJobsScraper:
             log.error_message = str(e)
             log.completed_at = datetime.now()
             log.save()
-            raise
\ No newline at end of file
+            raise
+
+
+def extract_postings(tasks):
+    """Job type, skills and sectors for (title, organization, description) tasks; runs in extraction workers."""
+    results = []
+    for title, org_name, description in tasks:
+        try:
+            hits = USAJobsScraper.analyze_text(description)
+            results.append({
+                "job_type": USAJobsScraper.determine_job_type(title, description),
+                "sectors": USAJobsScraper.merge_sectors(
+                    USAJobsScraper.analyze_text(org_name).get('sector', []),
+                    hits.get('sector', []),
+                ),
+                "technical_skills": hits['technical'],
+                "soft_skills": hits['soft'],
+            })
+        except Exception as e:
+            print(f"    ⚠️ Error parsing job: {e}")
+            results.append(None)
+    return results
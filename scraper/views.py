@@ -4,25 +4,47 @@ from rest_framework.decorators import action
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
 from django.core.paginator import Paginator
-from django.db.models import Q, Count
-from geopy.distance import geodesic
-import pgeocode
-from collections import Counter
+from django.db.models import Q
 from datetime import datetime, timedelta
 from decouple import config
+from django.conf import settings
+from django.utils import timezone
 from .models import JobListing, EmailSubscriber, ScrapingLog
 from .serializers import (
     JobListingSerializer, 
     EmailSubscriberSerializer,
-    ScrapingLogSerializer
+    ScrapingLogSerializer,
+    job_list_fields,
+    serialize_job_rows,
 )
 from .scraper_engine import UniversalJobScraper
+from .search import search_jobs
+from .statistics import (
+    calculate_statistics,
+    filter_jobs,
+    refresh_statistics_snapshots,
+    snapshot_filter,
+    snapshot_statistics,
+)
+from .distance_engine import NearestJobs, filter_nearest
+from .pagination import JobCursorPagination, JobSearchPagination, paginate_by_cursor
+from .geo import filter_within_radius, postal_code_coords
+from .subscriber_index import get_subscriber_index
 
 
 # API ViewSets
 class JobListingViewSet(viewsets.ModelViewSet):
     queryset = JobListing.objects.all()
     serializer_class = JobListingSerializer
+    pagination_class = JobCursorPagination
+    
+    @property
+    def paginator(self):
+        # Ranked search results page by offset, everything else by keyset
+        if not hasattr(self, '_paginator'):
+            search = self.request is not None and self.request.query_params.get('search')
+            self._paginator = JobSearchPagination() if search else self.pagination_class()
+        return self._paginator
     
     def get_queryset(self):
         queryset = JobListing.objects.all()
@@ -39,16 +61,41 @@ class JobListingViewSet(viewsets.ModelViewSet):
         if work_format:
             queryset = queryset.filter(work_format__contains=[work_format])
         
+        for dimension in ('state', 'skill'):
+            value = self.request.query_params.get(dimension, None)
+            if value:
+                queryset = filter_jobs(queryset, dimension, value)
+        
         closed = self.request.query_params.get('closed', None)
         if closed is not None:
             queryset = queryset.filter(closed=closed.lower() == 'true')
         
         search = self.request.query_params.get('search', None)
         if search:
-            queryset = queryset.filter(title__icontains=search)
+            return search_jobs(queryset, search)
         
         return queryset.order_by('-date_scraped')
     
+    def list(self, request, *args, **kwargs):
+        # Read-only lists load only the requested columns with values() and skip per-field serializers
+        fields, unknown = job_list_fields(request.query_params.get('fields'))
+        if unknown:
+            return Response(
+                {"error": f"Unknown fields: {', '.join(unknown)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        queryset = self.filter_queryset(self.get_queryset())
+        
+        # The cursor reads its position from the ordering columns, requested or not
+        ordering = [name.lstrip('-') for name in queryset.query.order_by if isinstance(name, str)]
+        rows = queryset.values(*dict.fromkeys(fields + ['id', 'date_scraped'] + ordering))
+        
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serialize_job_rows(page, fields))
+        return Response(serialize_job_rows(rows, fields))
+    
     @action(detail=False, methods=['post'])
     def trigger_scrape(self, request):
         urls = request.data.get('urls', [])
@@ -79,6 +126,17 @@ class EmailSubscriberViewSet(viewsets.ModelViewSet):
     queryset = EmailSubscriber.objects.all()
     serializer_class = EmailSubscriberSerializer
     lookup_field = 'email'
+    
+    def perform_create(self, serializer):
+        get_subscriber_index().update(serializer.save())
+    
+    def perform_update(self, serializer):
+        get_subscriber_index().update(serializer.save())
+    
+    def perform_destroy(self, instance):
+        subscriber_id = instance.id
+        instance.delete()
+        get_subscriber_index().remove(subscriber_id)
 
 
 class ScrapingLogViewSet(viewsets.ReadOnlyModelViewSet):
@@ -87,63 +145,6 @@ class ScrapingLogViewSet(viewsets.ReadOnlyModelViewSet):
 
 
 # Template Views with Distance Filtering
-def calculate_statistics(jobs_queryset):
-    """Calculate statistics for a set of jobs"""
-    total_jobs = jobs_queryset.count()
-    
-    if total_jobs == 0:
-        return None
-    
-    # Job type distribution
-    job_types = jobs_queryset.values('job_type').annotate(count=Count('id'))
-    job_type_stats = {item['job_type']: item['count'] for item in job_types}
-    
-    # Sector distribution
-    all_sectors = []
-    for job in jobs_queryset:
-        all_sectors.extend(job.sectors)
-    sector_counts = Counter(all_sectors)
-    top_sectors = sector_counts.most_common(5)
-    
-    # Skills statistics
-    all_technical_skills = []
-    all_soft_skills = []
-    for job in jobs_queryset:
-        if job.technical_skills:
-            for category, skills in job.technical_skills.items():
-                all_technical_skills.extend(skills)
-        all_soft_skills.extend(job.soft_skills)
-    
-    technical_skill_counts = Counter(all_technical_skills)
-    top_technical_skills = technical_skill_counts.most_common(10)
-    
-    soft_skill_counts = Counter(all_soft_skills)
-    top_soft_skills = soft_skill_counts.most_common(10)
-    
-    # Work format distribution
-    all_formats = []
-    for job in jobs_queryset:
-        all_formats.extend(job.work_format)
-    format_counts = Counter(all_formats)
-    
-    # Average skills per job
-    skill_counts = []
-    for job in jobs_queryset:
-        total_skills = len(all_technical_skills) + len(job.soft_skills)
-        skill_counts.append(total_skills)
-    avg_skills = sum(skill_counts) / len(skill_counts) if skill_counts else 0
-    
-    return {
-        'total_jobs': total_jobs,
-        'job_type_stats': job_type_stats,
-        'top_sectors': top_sectors,
-        'top_technical_skills': top_technical_skills,
-        'top_soft_skills': top_soft_skills,
-        'work_format_stats': dict(format_counts),
-        'avg_skills_per_job': round(avg_skills, 1),
-    }
-
-
 def home(request):
     """Homepage with dashboard"""
     total_jobs = JobListing.objects.filter(closed=False).count()
@@ -159,6 +160,9 @@ def job_list(request):
     """Browse all jobs with filters and distance"""
     jobs = JobListing.objects.filter(closed=False)
     
+    # Precomputed statistics cover all open jobs or one filter; anything narrower aggregates live
+    snapshot = ('', '')
+    
     # Mode selection
     search_mode = request.GET.get('mode', 'nationwide')
     
@@ -169,25 +173,17 @@ def job_list(request):
         
         if user_zip and max_distance:
             try:
-                nomi = pgeocode.Nominatim('us')
-                user_location = nomi.query_postal_code(user_zip)
+                user_coords = postal_code_coords([user_zip]).get(user_zip)
+                
+                if user_coords is not None:
+                    snapshot = None
                 
-                if user_location is not None and not user_location.isna().all():
-                    user_coords = (user_location.latitude, user_location.longitude)
-                    max_dist_miles = float(max_distance)
-                    
-                    # Filter jobs by distance
-                    nearby_jobs = []
-                    for job in jobs:
-                        if job.latitude and job.longitude:
-                            job_coords = (job.latitude, job.longitude)
-                            distance = geodesic(user_coords, job_coords).miles
-                            if distance <= max_dist_miles:
-                                job.distance = round(distance, 1)
-                                nearby_jobs.append(job)
-                    
-                    jobs = nearby_jobs
-                    jobs.sort(key=lambda x: x.distance)
+                if user_coords is not None and getattr(settings, 'SCRAPER_DISTANCE_ENGINE', True):
+                    # Nearest of every job location, computed over in-memory arrays
+                    jobs = filter_nearest(jobs, user_coords[0], user_coords[1], float(max_distance))
+                elif user_coords is not None:
+                    # Bounding box on the (latitude, longitude) index, exact haversine in SQL
+                    jobs = filter_within_radius(jobs, user_coords[0], user_coords[1], float(max_distance))
                 else:
                     messages.warning(request, f"Could not find location for zip code: {user_zip}")
             except Exception as e:
@@ -196,42 +192,48 @@ def job_list(request):
     # NATIONWIDE MODE: Standard filtering
     else:
         search = request.GET.get('search', '')
-        if search:
-            jobs = jobs.filter(title__icontains=search)
         
-        job_type = request.GET.get('job_type', '')
-        if job_type:
-            jobs = jobs.filter(job_type=job_type)
+        filters = {
+            dimension: request.GET.get(dimension, '')
+            for dimension in ('job_type', 'work_format', 'sector', 'state')
+        }
+        for dimension, value in filters.items():
+            if value:
+                jobs = filter_jobs(jobs, dimension, value)
         
-        work_format = request.GET.get('work_format', '')
-        if work_format:
-            jobs = jobs.filter(work_format__contains=[work_format])
+        snapshot = None if search else snapshot_filter(filters)
         
-        sector = request.GET.get('sector', '')
-        if sector:
-            jobs = jobs.filter(sectors__contains=[sector])
-        
-        state = request.GET.get('state', '')
-        if state:
-            jobs = jobs.filter(locations__icontains=state)
-        
-        jobs = jobs.order_by('-date_scraped')
+        if search:
+            jobs = search_jobs(jobs, search)
+        else:
+            jobs = jobs.order_by('-date_scraped')
     
     # Calculate statistics
-    if isinstance(jobs, list):
-        stats = calculate_statistics(JobListing.objects.filter(id__in=[j.id for j in jobs]))
-        paginator = Paginator(jobs, 20)
+    if snapshot is not None:
+        stats = snapshot_statistics(*snapshot)
     else:
-        stats = calculate_statistics(jobs)
-        paginator = Paginator(jobs, 20)
+        stats = calculate_statistics(jobs.queryset if isinstance(jobs, NearestJobs) else jobs)
     
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Opt-in keyset pages (?pager=cursor); distance results are already in memory and ranked search
+    # results have no exact keyset position, so both keep page numbers
+    cursor_pager = None
+    if request.GET.get('pager') == 'cursor' and not search and not isinstance(jobs, NearestJobs):
+        page_obj, cursor_pager = paginate_by_cursor(jobs, request, 20)
+        job_count, count_is_approximate = cursor_pager.count, cursor_pager.count_is_approximate
+    else:
+        paginator = Paginator(jobs, 20)
+        
+        page_number = request.GET.get('page')
+        page_obj = paginator.get_page(page_number)
+        job_count, count_is_approximate = paginator.count, False
     
     return render(request, 'job_list.html', {
         'jobs': page_obj,
         'stats': stats,
         'search_mode': search_mode,
+        'cursor_pager': cursor_pager,
+        'job_count': job_count,
+        'count_is_approximate': count_is_approximate,
     })
 
 
@@ -265,6 +267,7 @@ def subscribe(request):
             )
             
             if created:
+                get_subscriber_index().update(subscriber)
                 messages.success(request, f'🎉 Successfully subscribed! You will receive alerts at {email}')
             else:
                 subscriber.job_types = job_types
@@ -273,6 +276,7 @@ def subscribe(request):
                 subscriber.zip_code = zip_code
                 subscriber.max_distance_miles = int(max_distance) if max_distance else None
                 subscriber.save()
+                get_subscriber_index().update(subscriber)
                 messages.success(request, f'✅ Subscription updated for {email}')
                 
         except Exception as e:
@@ -288,7 +292,7 @@ def cleanup_old_jobs():
         closed=False,
         date_scraped__lt=cutoff_date
     )
-    count = old_jobs.update(closed=True)
+    count = old_jobs.update(closed=True, date_updated=timezone.now())
     return count
 
 
@@ -321,6 +325,7 @@ def trigger_scrape(request):
             
             # Auto-cleanup old jobs after scraping
             closed_count = cleanup_old_jobs()
+            refresh_statistics_snapshots()
             
             messages.success(
                 request, 
@@ -0,0 +1,138 @@
+import csv
+import math
+import os
+import threading
+from array import array
+from django.db import DatabaseError
+
+
+# Every five-digit ZIP code gets a slot, so a lookup is a single array index
+ZIP_SPACE = 100000
+
+# Column layout of the GeoNames postal code dump that pgeocode downloads
+GEONAMES_FIELDS = [
+    'country_code', 'postal_code', 'place_name', 'state_name', 'state_code',
+    'county_name', 'county_code', 'community_name', 'community_code',
+    'latitude', 'longitude', 'accuracy',
+]
+
+
+def zip_slot(zip_code):
+    """Return the array slot for a ZIP (or ZIP+4) code, or None if it is not one."""
+    zip_code = str(zip_code or '').strip()[:5]
+    if len(zip_code) != 5 or not zip_code.isdigit():
+        return None
+    return int(zip_code)
+
+
+def read_geonames(path):
+    """Yield rows from a GeoNames dump: the raw tab-separated file or pgeocode's CSV copy."""
+    with open(path, newline='', encoding='utf-8') as f:
+        first_line = f.readline()
+        f.seek(0)
+
+        if first_line.startswith('country_code,'):
+            reader = csv.DictReader(f)
+        else:
+            reader = csv.DictReader(f, fieldnames=GEONAMES_FIELDS, delimiter='\t')
+
+        for row in reader:
+            try:
+                latitude = float(row['latitude'])
+                longitude = float(row['longitude'])
+            except (TypeError, ValueError):
+                continue
+            yield {
+                'zip_code': row['postal_code'],
+                'latitude': latitude,
+                'longitude': longitude,
+                'city': row.get('place_name') or '',
+                'state': row.get('state_code') or '',
+            }
+
+
+def pgeocode_data_path():
+    """Return pgeocode's copy of the US dataset, downloading it on first use."""
+    import pgeocode
+
+    path = os.path.join(pgeocode.STORAGE_DIR, 'US.txt')
+    if not os.path.exists(path):
+        pgeocode.Nominatim('us')
+    return path
+
+
+class ZipCentroidTable:
+    """Direct-indexed ZIP -> (lat, lon) table held in two flat float arrays"""
+
+    def __init__(self):
+        self.latitudes = array('d', [math.nan]) * ZIP_SPACE
+        self.longitudes = array('d', [math.nan]) * ZIP_SPACE
+        self.count = 0
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build a table from (zip_code, latitude, longitude) rows, averaging repeated ZIPs."""
+        table = cls()
+        sums = {}
+        for zip_code, latitude, longitude in rows:
+            slot = zip_slot(zip_code)
+            if slot is None:
+                continue
+            total = sums.setdefault(slot, [0.0, 0.0, 0])
+            total[0] += latitude
+            total[1] += longitude
+            total[2] += 1
+
+        for slot, (latitude, longitude, n) in sums.items():
+            table.latitudes[slot] = latitude / n
+            table.longitudes[slot] = longitude / n
+        table.count = len(sums)
+        return table
+
+    @classmethod
+    def from_database(cls):
+        from .models import ZipCentroid
+        return cls.from_rows(ZipCentroid.objects.values_list('zip_code', 'latitude', 'longitude').iterator())
+
+    @classmethod
+    def from_geonames(cls, path):
+        return cls.from_rows(
+            (row['zip_code'], row['latitude'], row['longitude']) for row in read_geonames(path)
+        )
+
+    def lookup(self, zip_code):
+        """Return (lat, lon) for a ZIP code, or None if it is unknown."""
+        slot = zip_slot(zip_code)
+        if slot is None:
+            return None
+        latitude = self.latitudes[slot]
+        if math.isnan(latitude):
+            return None
+        return (latitude, self.longitudes[slot])
+
+
+def load_zip_centroid_table():
+    """Load the ZipCentroid table if it has been filled, otherwise pgeocode's dataset."""
+    try:
+        table = ZipCentroidTable.from_database()
+    except DatabaseError as e:
+        print(f"Could not read ZIP centroids from the database: {e}")
+        table = ZipCentroidTable()
+
+    if not table.count:
+        table = ZipCentroidTable.from_geonames(pgeocode_data_path())
+    return table
+
+
+_zip_centroids = None
+_zip_centroids_lock = threading.Lock()
+
+
+def get_zip_centroids():
+    """Return the process-wide ZIP centroid table, loading it on first use."""
+    global _zip_centroids
+
+    with _zip_centroids_lock:
+        if _zip_centroids is None:
+            _zip_centroids = load_zip_centroid_table()
+        return _zip_centroids